@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+
+class AnalyticsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'analytics'
+
+    def ready(self):
+        from django.db.models.signals import post_save
+        from gamification.signals import achievement_unlocked, lesson_completed, streak_updated, xp_changed
+        from users.models import User
+        from .dashboard import invalidate_dashboard
+        lesson_completed.connect(invalidate_dashboard)
+        xp_changed.connect(invalidate_dashboard)
+        streak_updated.connect(invalidate_dashboard)
+        achievement_unlocked.connect(invalidate_dashboard)
+        post_save.connect(invalidate_dashboard, sender=User)
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""One response for the home screen instead of the client's per-widget fan-out.
+
+The body is spliced from JSON fragments that are already cached elsewhere:
+the path list per catalog version and the daily-challenge feed. Only the
+per-user parts are queried: the PathProgress counters, the first page of
+achievements and the streak. The whole body can also be cached per user for
+``DASHBOARD_CACHE_TTL`` seconds. That cache is dropped when the user completes
+a lesson, gains XP (challenges and achievements included), checks in, or
+saves their profile.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from core.renderers import ORJSONRenderer
+from gamification.feed import render_feed
+from gamification.models import Streak, UserAchievement
+from gamification.serializers import StreakSerializer, UserAchievementValuesSerializer
+from learning.catalog import catalog_key, get_cache, get_catalog_version
+from learning.models import LearningPath
+from learning.progress import user_path_progress
+from learning.serializers import LearningPathValuesSerializer
+from users.serializers import UserSerializer
+
+def _key(user_id):
+    return f'dashboard:{user_id}'
+
+def invalidate_dashboard(sender, instance=None, user_id=None, **kwargs):
+    """Receiver for ``lesson_completed``, ``xp_changed``, ``streak_updated``, ``achievement_unlocked`` and User saves."""
+    cache.delete(_key(instance.pk if instance is not None else user_id))
+
+def path_list(version):
+    """Every path without its modules, rendered once per catalog version."""
+    catalog = get_cache()
+    key = catalog_key(version, 'dashboard_paths')
+    body = catalog.get(key)
+    if body is None:
+        body = ORJSONRenderer().render(LearningPathValuesSerializer(
+            LearningPath.objects.order_by('id'), omit={'modules': {}}
+        ).data)
+        catalog.set(key, body, timeout=None)
+    return body
+
+def build_dashboard(request, version):
+    user = request.user
+    streak = Streak.objects.filter(user_id=user.pk).first()
+    achievements = UserAchievementValuesSerializer(
+        UserAchievement.objects.filter(user_id=user.pk).order_by('id')[:settings.API_PAGE_SIZE]
+    ).data
+    challenges, _ = render_feed(user.pk)
+    head = ORJSONRenderer().render({
+        'user': UserSerializer(user, context={'request': request}).data,
+        'streak': StreakSerializer(streak).data if streak is not None else None,
+        'achievements': achievements,
+        'progress': user_path_progress(user),
+    })
+    return b''.join((head[:-1], b',"paths":', path_list(version), b',"challenges":', challenges, b'}'))
+
+def render_dashboard(request):
+    """JSON bytes of the dashboard, from the per-user cache when it is fresh."""
+    version = get_catalog_version()
+    ttl = settings.DASHBOARD_CACHE_TTL
+    if ttl:
+        cached = cache.get(_key(request.user.pk))
+        if cached is not None and cached[0] == version:
+            return cached[1]
+    body = build_dashboard(request, version)
+    if ttl:
+        cache.set(_key(request.user.pk), (version, body), timeout=ttl)
+    return body
\ No newline at end of file
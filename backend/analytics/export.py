@@ -0,0 +1,166 @@
+"""Streaming dumps of the per-user tables for analytics.
+
+Rows are read with ``.values_list().iterator(chunk_size=...)``, which uses a
+server-side cursor on PostgreSQL and chunked ``fetchmany`` on SQLite. They are
+encoded as NDJSON or CSV into buffers of about ``BUFFER_SIZE`` bytes and can be
+gzipped as they go. Only one chunk of rows and one buffer are in memory at a
+time, however big the table is.
+
+``since``/``until`` select rows by each dataset's timestamp, ``since <= t < until``,
+so exports chained on ``until`` neither miss nor repeat rows. Without either,
+the whole table is exported, including rows whose timestamp is NULL (e.g.
+progress never completed), which no windowed export returns. Streaks only have
+a date, so their window is by whole days and boundary days repeat; key them on
+``user_id``.
+"""
+import csv
+import io
+import zlib
+
+import orjson
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from gamification.models import Streak, UserAchievement, XPEvent
+from learning.models import QuizAttempt, UserProgress
+
+BUFFER_SIZE = 64 * 1024
+
+# Same datetime format as the API ('Z', milliseconds)
+_default = JSONEncoder().default
+
+def _csv_value(value):
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value).decode()
+    return _default(value)
+
+class Dataset:
+    def __init__(self, model, columns, timestamp, date_only=False):
+        self.model = model
+        self.columns = columns
+        self.timestamp = timestamp
+        self.date_only = date_only
+
+    def queryset(self, since=None, until=None):
+        queryset = self.model.objects.all()
+        if since is None and until is None:
+            return queryset.order_by('pk')
+        if self.date_only:
+            since, until = since and since.date(), until and until.date()
+        if since is not None:
+            queryset = queryset.filter(**{f'{self.timestamp}__gte': since})
+        if until is not None:
+            lookup = 'lte' if self.date_only else 'lt'
+            queryset = queryset.filter(**{f'{self.timestamp}__{lookup}': until})
+        return queryset.order_by(self.timestamp, 'pk')
+
+DATASETS = {
+    'user_progress': Dataset(
+        UserProgress,
+        ('id', 'user_id', 'lesson_id', 'completed', 'score', 'time_spent', 'completed_at'),
+        'completed_at',
+    ),
+    'user_achievements': Dataset(
+        UserAchievement, ('id', 'user_id', 'achievement_id', 'unlocked_at'), 'unlocked_at',
+    ),
+    'streaks': Dataset(
+        Streak,
+        ('id', 'user_id', 'current', 'longest', 'last_activity_date', 'protection_available'),
+        'last_activity_date', date_only=True,
+    ),
+    'xp_events': Dataset(
+        XPEvent, ('id', 'user_id', 'amount', 'source', 'idempotency_key', 'created_at'), 'created_at',
+    ),
+    'quiz_attempts': Dataset(
+        QuizAttempt,
+        ('id', 'user_id', 'lesson_id', 'score', 'correct', 'answered', 'results', 'submitted_at'),
+        'submitted_at',
+    ),
+}
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return b''.join(self.encode(None, data if isinstance(data, list) else [data]))
+
+    def encode(self, columns, rows):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_APPEND_NEWLINE
+        for row in rows:
+            yield orjson.dumps(row if columns is None else dict(zip(columns, row)), default=_default, option=option)
+
+class CSVRenderer(BaseRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        columns = tuple(rows[0]) if rows else ()
+        return b''.join(self.encode(columns, [[row.get(column) for column in columns] for row in rows]))
+
+    def encode(self, columns, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([_csv_value(value) for value in row])
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+RENDERERS = {renderer.format: renderer for renderer in (NDJSONRenderer, CSVRenderer)}
+
+class Export:
+    """Iterate over this for the bytes of a dataset export; ``rows`` counts what was sent."""
+
+    def __init__(self, name, format='ndjson', since=None, until=None, compress=False, chunk_size=None):
+        self.dataset = DATASETS[name]
+        self.renderer = RENDERERS[format]()
+        self.since = since
+        self.until = until
+        self.compress = compress
+        self.chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+        self.rows = 0
+
+    def __iter__(self):
+        columns = self.dataset.columns
+        rows = self.dataset.queryset(self.since, self.until).values_list(*columns).iterator(chunk_size=self.chunk_size)
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if self.compress else None
+        parts, size = [], 0
+        for part in self.renderer.encode(columns, self.counted(rows)):
+            parts.append(part)
+            size += len(part)
+            if size >= BUFFER_SIZE:
+                chunk = b''.join(parts)
+                parts, size = [], 0
+                if compressor is not None:
+                    chunk = compressor.compress(chunk)
+                if chunk:
+                    yield chunk
+        chunk = b''.join(parts)
+        if compressor is not None:
+            chunk = compressor.compress(chunk) + compressor.flush()
+        if chunk:
+            yield chunk
+
+    def counted(self, rows):
+        for row in rows:
+            self.rows += 1
+            yield row
+
+    async def __aiter__(self):
+        # Django's ASGI handler would list() a sync iterator, so hand it one buffer at a time.
+        # thread_sensitive keeps every step on the thread that owns the cursor.
+        chunks = iter(self)
+        next_chunk = sync_to_async(lambda: next(chunks, None), thread_sensitive=True)
+        while (chunk := await next_chunk()) is not None:
+            yield chunk
\ No newline at end of file
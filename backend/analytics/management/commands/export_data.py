@@ -0,0 +1,47 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from analytics.export import DATASETS, Export, RENDERERS
+from analytics.views import parse_bound
+
+class Command(BaseCommand):
+    help = (
+        'Stream a dataset as NDJSON or CSV to a file or stdout in constant memory. '
+        'Pass the printed "until" as --since next time for an incremental export.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=list(DATASETS))
+        parser.add_argument('--format', choices=list(RENDERERS), default='ndjson')
+        parser.add_argument('--since', help='ISO date or datetime; only rows from then on.')
+        parser.add_argument('--until', help='ISO date or datetime; only rows before then (default: now with --since).')
+        parser.add_argument('--gzip', action='store_true', help='Gzip the output.')
+        parser.add_argument('--output', '-o', help='File to write (default: stdout).')
+        parser.add_argument('--chunk-size', type=int, help='Rows per database fetch.')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        try:
+            since = options['since'] and parse_bound(options['since'])
+            until = parse_bound(options['until']) if options['until'] else now if since else None
+        except ValueError:
+            raise CommandError('--since and --until must be ISO dates or datetimes.')
+
+        export = Export(
+            options['dataset'], options['format'], since, until,
+            compress=options['gzip'], chunk_size=options['chunk_size'],
+        )
+        output = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        try:
+            for chunk in export:
+                output.write(chunk)
+        finally:
+            if options['output']:
+                output.close()
+            else:
+                output.flush()
+        self.stderr.write(self.style.SUCCESS(
+            f"Exported {export.rows} {options['dataset']} rows until {(until or now).isoformat()}"
+        ))
\ No newline at end of file
@@ -0,0 +1,33 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics.seed import DEFAULT_PASSWORD, SCALES, seed
+from users.models import User
+
+class Command(BaseCommand):
+    help = (
+        'Fill the database with realistic students, paths, lessons, progress, streaks, achievements '
+        'and challenges for benchmarking. The same --seed always produces the same data.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=list(SCALES), default='small')
+        for name in SCALES['small']:
+            parser.add_argument(f'--{name}', type=int, help=f'Override the number of {name} of the scale.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--prefix', default='student', help='Username prefix of the seeded students.')
+        parser.add_argument('--password', default=DEFAULT_PASSWORD, help='Password of every seeded student.')
+
+    def handle(self, *args, **options):
+        sizes = {name: options[name] if options[name] is not None else value
+                 for name, value in SCALES[options['scale']].items()}
+        if User.objects.filter(username__startswith=options['prefix']).exists():
+            raise CommandError(
+                f"Users named {options['prefix']}* already exist; use another --prefix or a fresh database."
+            )
+        totals = seed(
+            **sizes, random_seed=options['seed'], prefix=options['prefix'],
+            password=options['password'], stdout=self.stdout,
+        )
+        self.stdout.write(json.dumps(totals, indent=2))
\ No newline at end of file
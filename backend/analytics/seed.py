@@ -0,0 +1,212 @@
+"""Deterministic, realistic data at a configurable scale for benchmarks and load tests.
+
+Students are ``<prefix><n>`` and all share one password, hashed once. Each is
+enrolled in a few paths and has finished a prefix of their lessons in order,
+with matching progress rows, path counters, XP events, ``users.xp``/``level``,
+study-time rollups, a streak and some achievements, so every endpoint has real work to do. The
+same ``seed`` value always produces the same data.
+"""
+import random
+from datetime import timedelta
+
+SCALES = {
+    'small': {'users': 100, 'paths': 5, 'modules': 4, 'lessons': 6, 'achievements': 20, 'challenges': 10},
+    'medium': {'users': 2000, 'paths': 20, 'modules': 6, 'lessons': 8, 'achievements': 100, 'challenges': 30},
+    'large': {'users': 20000, 'paths': 40, 'modules': 8, 'lessons': 10, 'achievements': 300, 'challenges': 60},
+}
+
+DEFAULT_PASSWORD = 'benchmark-password'
+USER_CHUNK = 1000
+BATCH_SIZE = 2000
+
+ACHIEVEMENT_METRICS = (
+    ('lessons_completed', (1, 5, 10, 25, 50, 100)),
+    ('xp', (50, 100, 500, 1000, 5000)),
+    ('level', (2, 5, 10, 20)),
+    ('streak_current', (3, 7, 14, 30)),
+    ('streak_longest', (7, 30, 100)),
+)
+
+def lesson_content(rng, lesson_type):
+    if lesson_type == 'quiz':
+        return {'questions': [
+            {'id': i, 'prompt': f'Question {i}', 'options': ['a', 'b', 'c', 'd'], 'answer': rng.randrange(4)}
+            for i in range(rng.randint(3, 8))
+        ]}
+    if lesson_type == 'video':
+        return {'url': f'https://videos.example.com/{rng.getrandbits(32):08x}.mp4', 'transcript': 'Lorem ipsum ' * 40}
+    return {'steps': [{'id': i, 'text': f'Step {i}', 'starter': 'print("hi")'} for i in range(rng.randint(2, 6))]}
+
+def seed_catalog(rng, paths, modules, lessons):
+    """Paths, modules and lessons; returns ``{path_id: [(lesson_id, xp_reward, duration), ...]}`` in order."""
+    from learning.models import LearningPath, Lesson, Module
+
+    levels = ('beginner', 'intermediate', 'advanced')
+    created = LearningPath.objects.bulk_create(
+        LearningPath(
+            title=f'Path {p}', description=f'Learn topic {p} step by step.', icon='code',
+            level=levels[p % 3], age_range=('6-8', '8-12', '12-16')[p % 3],
+        )
+        for p in range(paths)
+    )
+    created_modules = Module.objects.bulk_create(
+        Module(learning_path=path, title=f'Module {m}', description='', icon='book', order=m)
+        for path in created for m in range(modules)
+    )
+    types = ('video', 'interactive', 'quiz', 'project')
+    pending = []
+    for module in created_modules:
+        for order in range(lessons):
+            lesson_type = rng.choice(types)
+            pending.append(Lesson(
+                module=module, title=f'Lesson {order}', description='', type=lesson_type,
+                content=lesson_content(rng, lesson_type), duration=rng.choice((5, 10, 15, 20)),
+                xp_reward=rng.choice((10, 20, 30, 50)), difficulty=round(rng.uniform(0.5, 3.0), 2),
+                order=order,
+            ))
+    Lesson.objects.bulk_create(pending, batch_size=BATCH_SIZE)
+    catalog = {path.pk: [] for path in created}
+    for lesson in pending:
+        catalog[lesson.module.learning_path_id].append((lesson.pk, lesson.xp_reward, lesson.duration))
+    return catalog
+
+def seed_gamification(rng, achievements, challenges, now):
+    from gamification.models import Achievement, DailyChallenge
+
+    created = Achievement.objects.bulk_create(
+        Achievement(
+            title=f'{metric} {target}', description=f'Reach {target} {metric}.', icon='star',
+            criteria={'metric': metric, 'gte': target}, xp_reward=rng.choice((5, 10, 25)),
+        )
+        for metric, target in (
+            (metric, rng.choice(targets)) for metric, targets in
+            (rng.choice(ACHIEVEMENT_METRICS) for _ in range(achievements))
+        )
+    )
+    DailyChallenge.objects.bulk_create(
+        DailyChallenge(
+            title=f'Challenge {c}', description='Solve it today.', difficulty=rng.choice(('easy', 'medium', 'hard')),
+            type=rng.choice(('quiz', 'code', 'reading', 'practice')), content={'task': f'Task {c}'},
+            xp_reward=rng.choice((10, 20, 40)),
+            available_until=now + timedelta(hours=rng.randint(1, 72)),
+        )
+        for c in range(challenges)
+    )
+    return [achievement.pk for achievement in created]
+
+def seed_students(rng, start, count, prefix, password_hash, catalog, achievement_ids, now):
+    from django.conf import settings
+    from gamification.models import Streak, UserAchievement, XPEvent
+    from gamification.ledger import xp_per_level
+    from learning.models import ActivityEvent, ActivityRollup, PathProgress, UserProgress
+    from users.models import User
+
+    users = User.objects.bulk_create(
+        User(
+            username=f'{prefix}{n}', email=f'{prefix}{n}@example.com', password=password_hash,
+            learning_speed=rng.choice(('slow', 'medium', 'fast')),
+            preferred_learning_style=rng.choice(('visual', 'practical', 'theoretical')),
+            daily_goal=rng.choice((15, 30, 45, 60)),
+        )
+        for n in range(start, start + count)
+    )
+    path_ids = list(catalog)
+    progress, counters, events, streaks, unlocked = [], [], [], [], []
+    activity, days = [], {}
+    event_cutoff = now - timedelta(days=settings.ACTIVITY_RETENTION['EVENTS'])
+    for user in users:
+        xp = 0
+        for path_id in rng.sample(path_ids, min(len(path_ids), rng.randint(1, 3))):
+            lessons = catalog[path_id]
+            done = int(len(lessons) * rng.betavariate(1.2, 2.5))
+            last = None
+            for lesson_id, xp_reward, duration in lessons[:done]:
+                completed_at = now - timedelta(days=rng.uniform(0, 90))
+                last = max(last or completed_at, completed_at)
+                progress.append(UserProgress(
+                    user_id=user.pk, lesson_id=lesson_id, completed=True,
+                    score=round(rng.uniform(40, 100), 1), time_spent=duration * 60 + rng.randint(-120, 300),
+                    completed_at=completed_at,
+                ))
+                events.append(XPEvent(
+                    user_id=user.pk, amount=xp_reward, source='lesson',
+                    idempotency_key=f'lesson:{lesson_id}:user:{user.pk}',
+                ))
+                xp += xp_reward
+                seconds = progress[-1].time_spent
+                if completed_at >= event_cutoff:
+                    activity.append(ActivityEvent(
+                        user_id=user.pk, lesson_id=lesson_id, seconds=seconds, xp=xp_reward,
+                        occurred_at=completed_at,
+                    ))
+                key = (user.pk, completed_at.date())
+                total_seconds, lessons_done, total_xp = days.get(key, (0, 0, 0))
+                days[key] = (total_seconds + seconds, lessons_done + 1, total_xp + xp_reward)
+            if done < len(lessons) and rng.random() < 0.3:
+                progress.append(UserProgress(
+                    user_id=user.pk, lesson_id=lessons[done][0], time_spent=rng.randint(30, 600),
+                ))
+            if done:
+                counters.append(PathProgress(
+                    user_id=user.pk, learning_path_id=path_id, completed_count=done,
+                    total_xp=sum(reward for _, reward, _ in lessons[:done]), last_activity=last,
+                ))
+        user.xp = xp
+        user.level = xp // xp_per_level() + 1
+        if rng.random() < 0.8:
+            current = rng.randint(0, 40)
+            streaks.append(Streak(
+                user_id=user.pk, current=current, longest=current + rng.randint(0, 20),
+                last_activity_date=(now - timedelta(days=rng.choice((0, 0, 1, 3)))).date(),
+                protection_available=rng.random() < 0.2,
+            ))
+        for achievement_id in rng.sample(achievement_ids, min(len(achievement_ids), rng.randint(0, 6))):
+            unlocked.append(UserAchievement(user_id=user.pk, achievement_id=achievement_id))
+
+    User.objects.bulk_update(users, ['xp', 'level'], batch_size=BATCH_SIZE)
+    UserProgress.objects.bulk_create(progress, batch_size=BATCH_SIZE)
+    PathProgress.objects.bulk_create(counters, batch_size=BATCH_SIZE)
+    XPEvent.objects.bulk_create(events, batch_size=BATCH_SIZE)
+    Streak.objects.bulk_create(streaks, batch_size=BATCH_SIZE)
+    UserAchievement.objects.bulk_create(unlocked, batch_size=BATCH_SIZE)
+    ActivityEvent.objects.bulk_create(activity, batch_size=BATCH_SIZE)
+    ActivityRollup.objects.bulk_create((
+        ActivityRollup(user_id=user_id, period=ActivityRollup.DAY, start=day, seconds=seconds, lessons=lessons, xp=xp)
+        for (user_id, day), (seconds, lessons, xp) in days.items()
+    ), batch_size=BATCH_SIZE)
+    return {
+        'progress': len(progress), 'xp_events': len(events), 'streaks': len(streaks),
+        'achievements_unlocked': len(unlocked), 'activity_days': len(days),
+    }
+
+def seed(users, paths, modules, lessons, achievements, challenges, random_seed=0,
+         prefix='student', password=DEFAULT_PASSWORD, stdout=None):
+    """Write one data set and return row counts. Bulk inserts skip signals, so caches are bumped at the end."""
+    from django.contrib.auth.hashers import make_password
+    from django.db import transaction
+    from django.utils import timezone
+    from gamification.achievements import invalidate_rules
+    from gamification.feed import invalidate_feed
+    from learning.catalog import bump_catalog_version
+
+    rng = random.Random(random_seed)
+    now = timezone.now()
+    password_hash = make_password(password)
+    totals = {'users': users}
+    with transaction.atomic():
+        catalog = seed_catalog(rng, paths, modules, lessons)
+        achievement_ids = seed_gamification(rng, achievements, challenges, now)
+    totals['lessons'] = sum(len(rows) for rows in catalog.values())
+    for start in range(0, users, USER_CHUNK):
+        with transaction.atomic():
+            counts = seed_students(
+                rng, start, min(USER_CHUNK, users - start), prefix, password_hash, catalog, achievement_ids, now
+            )
+        for name, value in counts.items():
+            totals[name] = totals.get(name, 0) + value
+        if stdout is not None:
+            stdout.write(f'  {min(start + USER_CHUNK, users)}/{users} users')
+    bump_catalog_version()
+    invalidate_rules()
+    invalidate_feed()
+    return totals
\ No newline at end of file
@@ -0,0 +1,112 @@
+import io
+import json
+import tempfile
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from gamification.ledger import award_xp
+from learning.models import LearningPath, Lesson, Module, UserProgress
+from users.models import User
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', 'staff@example.com', 'password', is_staff=True)
+        path = LearningPath.objects.create(title='P', description='', icon='', level='beginner', age_range='8-12')
+        module = Module.objects.create(learning_path=path, title='M', description='', icon='', order=0)
+        lessons = [
+            Lesson.objects.create(module=module, title=f'L{i}', description='', type='video', content={},
+                                  duration=5, xp_reward=10, order=i)
+            for i in range(3)
+        ]
+        # Legacy rows from before completed_at was always set, and one in progress
+        UserProgress.objects.create(user=cls.staff, lesson=lessons[0], completed=True, completed_at=timezone.now())
+        UserProgress.objects.create(user=cls.staff, lesson=lessons[1], completed=True)
+        UserProgress.objects.create(user=cls.staff, lesson=lessons[2])
+
+    def export(self, query=''):
+        token = RefreshToken.for_user(self.staff).access_token
+        response = self.client.get(f'/api/analytics/export/user_progress/{query}', HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('X-Export-Until', response)
+        return [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+    def test_full_export_keeps_rows_without_timestamp(self):
+        rows = self.export()
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(sum(row['completed_at'] is None for row in rows), 2)
+
+    def test_windowed_export_filters_on_timestamp(self):
+        rows = self.export('?since=2000-01-01')
+        self.assertEqual(len(rows), 1)
+        self.assertIsNotNone(rows[0]['completed_at'])
+
+    def test_command_full_export(self):
+        with tempfile.NamedTemporaryFile(suffix='.ndjson') as output:
+            call_command('export_data', 'user_progress', '-o', output.name, stderr=io.StringIO())
+            self.assertEqual(len(output.read().splitlines()), 3)
+
+@override_settings(DASHBOARD_CACHE_TTL=300)
+class DashboardCacheTests(TestCase):
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.user = User.objects.create_user('home', 'home@example.com', 'password')
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {RefreshToken.for_user(self.user).access_token}'
+
+    def dashboard(self):
+        response = self.client.get('/api/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cached_until_the_user_changes(self):
+        self.assertEqual(self.dashboard()['user']['xp'], 0)
+        # A write that sends no signal is not seen until the cache entry goes
+        User.objects.filter(pk=self.user.pk).update(daily_goal=45)
+        self.assertEqual(self.dashboard()['user']['daily_goal'], self.user.daily_goal)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            award_xp(self.user, 30, 'challenge', 'challenge:1')
+        data = self.dashboard()
+        self.assertEqual((data['user']['xp'], data['user']['daily_goal']), (30, 45))
+
+        self.user.refresh_from_db()
+        self.user.daily_goal = 60
+        self.user.save(update_fields=['daily_goal'])
+        self.assertEqual(self.dashboard()['user']['daily_goal'], 60)
+
+    def test_catalog_changes_are_seen_at_once(self):
+        self.assertEqual(self.dashboard()['paths'], [])
+        with self.captureOnCommitCallbacks(execute=True):
+            LearningPath.objects.create(title='New', description='', icon='', level='beginner', age_range='8-12')
+        self.assertEqual([path['title'] for path in self.dashboard()['paths']], ['New'])
+
+@override_settings(INSTRUMENTATION=dict(settings.INSTRUMENTATION, ENABLED=True, SAMPLE_RATE=1.0, SERVER_TIMING=True))
+class InstrumentationTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user('timed', 'timed@example.com', 'password')
+        self.token = f'Bearer {RefreshToken.for_user(user).access_token}'
+        self.headers = {'HTTP_AUTHORIZATION': self.token}
+        LearningPath.objects.create(title='P', description='', icon='', level='beginner', age_range='8-12')
+
+    def queries(self, response):
+        self.assertEqual(response.status_code, 200)
+        return int(response['Server-Timing'].split('desc="')[1].split(' ')[0])
+
+    def test_queries_counted_only_during_the_request(self):
+        self.assertGreater(self.queries(self.client.get('/api/learning/paths/', **self.headers)), 0)
+        self.assertEqual(connection.execute_wrappers, [])
+
+    async def test_queries_counted_in_async_requests(self):
+        response = await self.async_client.get('/api/learning/paths/', headers={'Authorization': self.token})
+        self.assertGreater(self.queries(response), 0)
+
+    @override_settings(INSTRUMENTATION=dict(settings.INSTRUMENTATION, SERVER_TIMING=False))
+    def test_no_server_timing_by_default(self):
+        self.assertNotIn('Server-Timing', self.client.get('/api/learning/paths/', **self.headers))
\ No newline at end of file
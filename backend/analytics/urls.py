@@ -0,0 +1,13 @@
+from django.urls import path
+from .views import ExportViewSet, MetricsViewSet
+
+urlpatterns = [
+    path('export/<str:dataset>/',
+        ExportViewSet.as_view({'get': 'export'}),
+        name='analytics_export'
+    ),
+    path('metrics/',
+        MetricsViewSet.as_view({'get': 'routes'}),
+        name='analytics_metrics'
+    ),
+]
\ No newline at end of file
@@ -0,0 +1,77 @@
+from datetime import datetime, time, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from core.instrumentation import registry
+
+from .dashboard import render_dashboard
+from .export import CSVRenderer, DATASETS, Export, NDJSONRenderer
+
+def parse_bound(value):
+    """An ISO datetime or date (midnight) as an aware datetime; naive values are UTC."""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = moment.replace(tzinfo=dt_timezone.utc)
+    return moment
+
+class ExportViewSet(viewsets.ViewSet):
+    permission_classes = [permissions.IsAdminUser]
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+
+    @action(detail=False, methods=['get'])
+    def export(self, request, dataset=None):
+        if dataset not in DATASETS:
+            return Response({'detail': f'Unknown dataset. Choose from {", ".join(DATASETS)}.'},
+                            status=status.HTTP_404_NOT_FOUND)
+        now = timezone.now()
+        try:
+            since = request.query_params.get('since')
+            since = since and parse_bound(since)
+            until = request.query_params.get('until')
+            # Incremental exports end at now; a full one is unfiltered so rows with no timestamp are kept
+            until = parse_bound(until) if until else now if since else None
+        except ValueError:
+            return Response({'detail': 'since and until must be ISO dates or datetimes.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        compress = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+        export = Export(dataset, request.accepted_renderer.format, since, until, compress)
+        content = export.__aiter__() if isinstance(request._request, ASGIRequest) else iter(export)
+        response = StreamingHttpResponse(content, content_type=request.accepted_media_type)
+        response['Content-Disposition'] = f'attachment; filename="{dataset}.{export.renderer.format}"'
+        response['X-Export-Until'] = (until or now).isoformat()
+        if compress:
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
+
+class DashboardViewSet(viewsets.ViewSet):
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        return HttpResponse(render_dashboard(request), content_type='application/json')
+
+class MetricsViewSet(viewsets.ViewSet):
+    permission_classes = [permissions.IsAdminUser]
+
+    @action(detail=False, methods=['get'])
+    def routes(self, request):
+        if request.query_params.get('reset') == 'true':
+            registry.reset()
+            return Response({'routes': {}})
+        return Response({
+            'sample_rate': settings.INSTRUMENTATION['SAMPLE_RATE'],
+            'routes': registry.snapshot(),
+        })
\ No newline at end of file
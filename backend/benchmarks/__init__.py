@@ -0,0 +1,43 @@
+"""Standalone benchmarks, run from ``backend/`` as ``python -m benchmarks.<name>``.
+
+Each benchmark builds a throwaway test database, so the dev database is never touched.
+"""
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+def setup():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+    import django
+    django.setup()
+
+@contextmanager
+def benchmark_database(name=None):
+    """Create and drop a test database; pass a file ``name`` when threads must share it."""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+    if name:
+        connection.settings_dict['TEST']['NAME'] = name
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+def measure(func, repeat=200):
+    """Call ``func`` ``repeat`` times and return latency stats in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'runs': repeat,
+        'mean_ms': round(statistics.fmean(samples), 4),
+        'p50_ms': round(samples[len(samples) // 2], 4),
+        'p95_ms': round(samples[int(len(samples) * 0.95) - 1], 4),
+    }
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""Study-time history from the daily rollups vs aggregating ``user_progress``.
+
+    python -m benchmarks.activity --scale medium --repeat 200
+
+Two questions: one student's minutes per day over the last 30 days, and
+how many students met their daily goal on one day. Both are answered from
+the rollups and from ``user_progress``, and the results must agree.
+"""
+import argparse
+import json
+import random
+import sys
+from datetime import timedelta
+
+from benchmarks import benchmark_database, measure, setup
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scale', default='medium')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+    from django.db.models import F, Sum
+    from django.db.models.functions import TruncDate
+    from django.utils import timezone
+    from analytics.seed import SCALES, seed
+    from learning.activity import history_buckets
+    from learning.models import ActivityRollup, UserProgress
+    from users.models import User
+
+    with benchmark_database():
+        totals = seed(**SCALES[args.scale])
+        users = list(User.objects.filter(username__startswith='student'))
+        rng = random.Random(0)
+        now = timezone.now()
+        window = now.date() - timedelta(days=29)
+        day = now.date() - timedelta(days=3)
+
+        def rollup_history():
+            return [(row['start'], row['seconds']) for row in history_buckets(rng.choice(users), 'day', 30, now)]
+
+        def progress_history():
+            user = rng.choice(users)
+            seconds = dict(
+                UserProgress.objects.filter(user=user, completed=True, completed_at__date__gte=window)
+                .annotate(day=TruncDate('completed_at')).values('day')
+                .annotate(seconds=Sum('time_spent')).order_by().values_list('day', 'seconds')
+            )
+            return [(window + timedelta(days=i), seconds.get(window + timedelta(days=i), 0)) for i in range(30)]
+
+        def rollup_goal_met():
+            return ActivityRollup.objects.filter(
+                period=ActivityRollup.DAY, start=day, seconds__gte=F('user__daily_goal') * 60
+            ).count()
+
+        def progress_goal_met():
+            return (
+                UserProgress.objects.filter(completed=True, completed_at__date=day)
+                .values('user_id').annotate(seconds=Sum('time_spent'))
+                .filter(seconds__gte=F('user__daily_goal') * 60).count()
+            )
+
+        rng.seed(1)
+        expected = [progress_history() for _ in range(20)]
+        rng.seed(1)
+        agree = expected == [rollup_history() for _ in range(20)] and rollup_goal_met() == progress_goal_met()
+        result = {
+            'rows': totals,
+            'agree': agree,
+            'history_30_days': {
+                'rollups': measure(rollup_history, args.repeat),
+                'user_progress': measure(progress_history, args.repeat),
+            },
+            'goal_met_on_a_day': {
+                'rollups': measure(rollup_goal_met, args.repeat),
+                'user_progress': measure(progress_goal_met, args.repeat),
+            },
+        }
+        print(json.dumps(result, indent=2))
+        sys.exit(0 if agree else 1)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
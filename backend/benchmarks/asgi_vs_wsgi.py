@@ -0,0 +1,129 @@
+"""Hot read endpoints under concurrency: native async views vs the sync DRF viewsets.
+
+    python -m benchmarks.asgi_vs_wsgi --requests 1000 --threads 32
+
+The ASGI runs issue every request at once on one event loop through
+``AsyncClient``, first against the async views and then against the sync
+viewsets (which Django runs on its single sync thread). The WSGI run pushes the
+same requests through a thread pool the size of a typical worker pool. Everything
+runs in-process, so the numbers compare request handling, not network overhead.
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+from benchmarks import benchmark_database, setup
+
+def use_async_views(enabled):
+    from django.conf import settings
+    from django.urls import clear_url_caches
+    settings.ASYNC_VIEWS = enabled
+    for name in ('learning.urls', 'gamification.urls', 'users.urls', 'core.urls'):
+        importlib.reload(importlib.import_module(name))
+    clear_url_caches()
+
+def summarize(samples, elapsed):
+    samples.sort()
+    return {
+        'requests': len(samples),
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(len(samples) / elapsed, 1),
+        'mean_ms': round(statistics.fmean(samples), 3),
+        'p50_ms': round(samples[len(samples) // 2], 3),
+        'p95_ms': round(samples[int(len(samples) * 0.95) - 1], 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=1000, help='Requests per run.')
+    parser.add_argument('--threads', type=int, default=32, help='Sync worker threads.')
+    parser.add_argument('--users', type=int, default=50)
+    args = parser.parse_args()
+
+    setup()
+    from django.test import AsyncClient, Client
+    from django.utils import timezone
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from gamification.models import DailyChallenge
+    from learning.models import LearningPath, Lesson, Module
+    from users.models import User
+
+    db_file = str(Path(tempfile.mkdtemp()) / 'asgi_vs_wsgi.sqlite3')
+    with benchmark_database(db_file):
+        for p in range(5):
+            path = LearningPath.objects.create(
+                title=f'Path {p}', description='', icon='', level='beginner', age_range='8-12'
+            )
+            for m in range(4):
+                module = Module.objects.create(
+                    learning_path=path, title=f'M{m}', description='', icon='', order=m
+                )
+                Lesson.objects.bulk_create(
+                    Lesson(module=module, title=f'L{i}', description='', type='quiz', content={},
+                           duration=5, xp_reward=10, order=i)
+                    for i in range(5)
+                )
+        DailyChallenge.objects.bulk_create(
+            DailyChallenge(title=f'C{i}', description='', difficulty='easy', type='quiz', content={},
+                           xp_reward=5, available_until=timezone.now() + timedelta(hours=i + 1))
+            for i in range(3)
+        )
+        tokens = [
+            str(RefreshToken.for_user(User.objects.create_user(f'bench{i}', f'bench{i}@example.com')).access_token)
+            for i in range(args.users)
+        ]
+        urls = [
+            '/api/users/me/',
+            '/api/learning/paths/',
+            f'/api/learning/paths/{path.pk}/progress/',
+            '/api/gamification/challenges/',
+            '/api/gamification/achievements/user/',
+        ]
+        plan = [(urls[i % len(urls)], tokens[i % len(tokens)]) for i in range(args.requests)]
+
+        async def run_async():
+            client = AsyncClient()
+
+            async def get(url, token):
+                start = time.perf_counter()
+                response = await client.get(url, headers={'Authorization': f'Bearer {token}'})
+                assert response.status_code == 200, (url, response.status_code)
+                return (time.perf_counter() - start) * 1000
+
+            await get(*plan[0])
+            start = time.perf_counter()
+            samples = await asyncio.gather(*(get(url, token) for url, token in plan))
+            return summarize(list(samples), time.perf_counter() - start)
+
+        def run_sync():
+            client = Client()
+
+            def get(request):
+                url, token = request
+                start = time.perf_counter()
+                response = client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}')
+                assert response.status_code == 200, (url, response.status_code)
+                return (time.perf_counter() - start) * 1000
+
+            get(plan[0])
+            start = time.perf_counter()
+            with ThreadPoolExecutor(args.threads) as pool:
+                samples = list(pool.map(get, plan))
+            return summarize(samples, time.perf_counter() - start)
+
+        use_async_views(True)
+        results = {'asgi_async_views': asyncio.run(run_async())}
+        use_async_views(False)
+        results['asgi_sync_views'] = asyncio.run(run_async())
+        results['wsgi'] = run_sync()
+        print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
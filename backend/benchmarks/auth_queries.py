@@ -0,0 +1,74 @@
+"""Per-request SQL query counts and latency with stock vs cached JWT authentication.
+
+    python -m benchmarks.auth_queries --repeat 200
+
+Counts come from the ``X-Query-Count`` header that ``InstrumentationMiddleware`` adds.
+"""
+import argparse
+import json
+from datetime import timedelta
+
+from benchmarks import benchmark_database, measure, setup
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+    from django.conf import settings
+    from django.test import Client
+    from django.utils import timezone
+    from rest_framework.views import APIView
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from core.authentication import CachedJWTAuthentication, get_user_cache
+    from gamification.models import DailyChallenge
+    from learning.models import LearningPath, Lesson, Module
+    from users.models import User
+
+    settings.QUERY_COUNT_HEADER = True
+    with benchmark_database():
+        user = User.objects.create_user('bench', 'bench@example.com')
+        path = LearningPath.objects.create(
+            title='Path', description='', icon='', level='beginner', age_range='8-12'
+        )
+        module = Module.objects.create(learning_path=path, title='M', description='', icon='', order=0)
+        Lesson.objects.create(
+            module=module, title='L', description='', type='quiz', content={},
+            duration=5, xp_reward=10, order=0,
+        )
+        DailyChallenge.objects.create(
+            title='C', description='', difficulty='easy', type='quiz', content={},
+            xp_reward=5, available_until=timezone.now() + timedelta(days=1),
+        )
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        urls = [
+            '/api/users/me/',
+            f'/api/learning/paths/{path.pk}/progress/',
+            '/api/learning/paths/progress/',
+            '/api/gamification/achievements/user/',
+            '/api/gamification/challenges/',
+            '/api/gamification/leaderboard/me/',
+        ]
+
+        def queries(url):
+            response = client.get(url)
+            assert response.status_code == 200, (url, response.status_code)
+            return int(response['X-Query-Count'])
+
+        results = {}
+        for name, authentication in (('stock', JWTAuthentication), ('cached', CachedJWTAuthentication)):
+            APIView.authentication_classes = [authentication]
+            for url in urls:
+                get_user_cache().clear()
+                cold = queries(url)
+                results.setdefault(url, {})[name] = {
+                    'queries_cold': cold,
+                    'queries_warm': queries(url),
+                    **measure(lambda: client.get(url), args.repeat),
+                }
+        print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""Import a generated curriculum per object (serializer + save, one transaction each) vs in bulk.
+
+    python -m benchmarks.curriculum_import --paths 5 --modules 20 --lessons 50
+
+The per-object run is what the admin and the ModelViewSet endpoints do today.
+The bulk runs go through learning.curriculum.import_curriculum: a fresh import,
+a re-import with no changes, and one that edits every tenth lesson.
+"""
+import argparse
+import copy
+import json
+import time
+
+from benchmarks import benchmark_database, setup
+
+def build_tree(paths, modules, lessons):
+    return {'paths': [
+        {
+            'title': f'Path {p}', 'description': 'Learn things.', 'icon': 'book', 'level': 'beginner',
+            'age_range': '8-12',
+            'modules': [
+                {
+                    'title': f'Module {m}', 'description': 'A module.', 'icon': 'box', 'order': m + 1,
+                    'lessons': [
+                        {'title': f'Lesson {l}', 'description': 'A lesson.', 'type': 'quiz',
+                         'content': {'questions': [{'prompt': f'Q{l}', 'options': ['a', 'b'], 'answer': 0}]},
+                         'duration': 5, 'xp_reward': 10, 'order': l + 1}
+                        for l in range(lessons)
+                    ],
+                }
+                for m in range(modules)
+            ],
+        }
+        for p in range(paths)
+    ]}
+
+def import_per_object(tree):
+    from django.db import transaction
+    from learning.serializers import LearningPathSerializer, LessonSerializer, ModuleSerializer
+
+    def save(serializer_class, data):
+        with transaction.atomic():
+            serializer = serializer_class(data=data)
+            serializer.is_valid(raise_exception=True)
+            return serializer.save()
+
+    for path in tree['paths']:
+        path_row = save(LearningPathSerializer, {k: v for k, v in path.items() if k != 'modules'})
+        for module in path['modules']:
+            module_row = save(ModuleSerializer, dict(
+                {k: v for k, v in module.items() if k != 'lessons'}, learning_path=path_row.pk
+            ))
+            for lesson in module['lessons']:
+                save(LessonSerializer, dict(lesson, module=module_row.pk))
+
+def timed(func, *args, **kwargs):
+    from django.db import connection
+    from learning.catalog import get_catalog_version
+    version = get_catalog_version()
+    queries = [0]
+
+    def count(execute, sql, params, many, context):
+        queries[0] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        seconds = time.perf_counter() - start
+    return {
+        'seconds': round(seconds, 3),
+        'queries': queries[0],
+        'catalog_bumps': get_catalog_version() - version,
+    }, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--paths', type=int, default=5)
+    parser.add_argument('--modules', type=int, default=20)
+    parser.add_argument('--lessons', type=int, default=50)
+    args = parser.parse_args()
+
+    setup()
+    from learning.curriculum import import_curriculum
+    from learning.models import LearningPath
+
+    tree = build_tree(args.paths, args.modules, args.lessons)
+    edited = copy.deepcopy(tree)
+    for path in edited['paths']:
+        for module in path['modules']:
+            for lesson in module['lessons'][::10]:
+                lesson['xp_reward'] += 5
+
+    results = {'lessons': args.paths * args.modules * args.lessons}
+    with benchmark_database():
+        results['per_object'], _ = timed(import_per_object, tree)
+        LearningPath.objects.all().delete()
+        results['bulk_create'], _ = timed(import_curriculum, tree)
+        results['bulk_unchanged'], _ = timed(import_curriculum, tree)
+        results['bulk_update_10pct'], report = timed(import_curriculum, edited)
+        results['bulk_update_10pct']['lessons_updated'] = report['lessons']['updated']
+    results['speedup'] = round(results['per_object']['seconds'] / results['bulk_create']['seconds'], 1)
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
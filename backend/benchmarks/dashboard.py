@@ -0,0 +1,99 @@
+"""Home-screen page load: the client's request fan-out vs one GET /api/dashboard/.
+
+    python -m benchmarks.dashboard --paths 10 --repeat 100
+
+The fan-out is what the frontend sends today: /users/me/, /learning/paths/,
+/learning/paths/<pk>/progress/ for each path, /gamification/achievements/user/,
+/gamification/challenges/ and the streak check-in. Query counts come from
+``InstrumentationMiddleware``; times are per page load through the test client,
+so they exclude network round trips, which is where the fan-out costs most.
+"""
+import argparse
+import json
+from datetime import timedelta
+
+from benchmarks import benchmark_database, measure, setup
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--paths', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=100)
+    args = parser.parse_args()
+
+    setup()
+    from django.conf import settings
+    from django.core.cache import cache
+    from django.test import Client
+    from django.utils import timezone
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from gamification.models import Achievement, DailyChallenge, UserAchievement
+    from learning.models import LearningPath, Lesson, Module
+    from users.models import User
+
+    settings.QUERY_COUNT_HEADER = True
+    with benchmark_database():
+        user = User.objects.create_user('bench', 'bench@example.com')
+        paths = []
+        for p in range(args.paths):
+            path = LearningPath.objects.create(
+                title=f'Path {p}', description='', icon='', level='beginner', age_range='8-12'
+            )
+            paths.append(path)
+            for m in range(5):
+                module = Module.objects.create(learning_path=path, title=f'M{m}', description='', icon='', order=m)
+                Lesson.objects.bulk_create(
+                    Lesson(module=module, title=f'L{l}', description='', type='quiz', content={},
+                           duration=5, xp_reward=10, order=l)
+                    for l in range(10)
+                )
+        achievements = Achievement.objects.bulk_create(
+            Achievement(title=f'A{i}', description='', icon='', criteria={'metric': 'xp', 'gte': 10 ** 9},
+                        xp_reward=0)
+            for i in range(30)
+        )
+        UserAchievement.objects.bulk_create(UserAchievement(user=user, achievement=a) for a in achievements[:10])
+        DailyChallenge.objects.bulk_create(
+            DailyChallenge(title=f'C{i}', description='', difficulty='easy', type='quiz', content={},
+                           xp_reward=5, available_until=timezone.now() + timedelta(days=1))
+            for i in range(5)
+        )
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+
+        fan_out = (
+            [('get', '/api/users/me/'), ('get', '/api/learning/paths/')]
+            + [('get', f'/api/learning/paths/{path.pk}/progress/') for path in paths]
+            + [('get', '/api/gamification/achievements/user/'), ('get', '/api/gamification/challenges/'),
+               ('post', '/api/gamification/streak/check-in/')]
+        )
+
+        def load(requests):
+            queries = 0
+            for method, url in requests:
+                response = getattr(client, method)(url)
+                assert response.status_code == 200, (url, response.status_code)
+                queries += int(response['X-Query-Count'])
+            return queries
+
+        dashboard = [('get', '/api/dashboard/')]
+        results = {}
+        load(fan_out)
+        results['fan_out'] = {'requests': len(fan_out), 'queries': load(fan_out), **measure(lambda: load(fan_out), args.repeat)}
+
+        settings.DASHBOARD_CACHE_TTL = 0
+        load(dashboard)
+        results['dashboard_uncached'] = {'requests': 1, 'queries': load(dashboard), **measure(lambda: load(dashboard), args.repeat)}
+
+        settings.DASHBOARD_CACHE_TTL = 30
+        load(dashboard)
+        results['dashboard_cached'] = {'requests': 1, 'queries': load(dashboard), **measure(lambda: load(dashboard), args.repeat)}
+
+        # Cache dropped on every load, as after a completion or check-in
+        def invalidated():
+            cache.delete(f'dashboard:{user.pk}')
+            return load(dashboard)
+        results['dashboard_after_event'] = {'requests': 1, 'queries': invalidated(), **measure(invalidated, args.repeat)}
+
+        print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
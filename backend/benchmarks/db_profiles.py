@@ -0,0 +1,120 @@
+"""Mixed read/write load against each database profile.
+
+    python -m benchmarks.db_profiles                      # sqlite-default and sqlite-tuned
+    python -m benchmarks.db_profiles --profiles postgres  # needs DB_HOST/DB_USER/... set
+
+Each profile runs in its own process so settings are read fresh from the
+environment. Threads replay progress reads and lesson completes through the
+Django test client against a throwaway database.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+PROFILES = {
+    'sqlite-default': {'DB_ENGINE': 'sqlite', 'SQLITE_TUNING': 'False'},
+    'sqlite-tuned': {'DB_ENGINE': 'sqlite', 'SQLITE_TUNING': 'True'},
+    'postgres': {'DB_ENGINE': 'postgres'},
+}
+
+def run_profile(args):
+    from benchmarks import benchmark_database, setup
+    setup()
+    from django.db import OperationalError, connections
+    from rest_framework.test import APIClient
+    from learning.models import LearningPath, Lesson, Module
+    from users.models import User
+
+    test_name = None
+    if connections['default'].vendor == 'sqlite':
+        test_name = str(Path(tempfile.mkdtemp()) / 'db_profiles.sqlite3')
+    with benchmark_database(test_name):
+        path = LearningPath.objects.create(
+            title='Load', description='', icon='', level='beginner', age_range='8-12'
+        )
+        module = Module.objects.create(learning_path=path, title='M', description='', icon='', order=0)
+        lessons = Lesson.objects.bulk_create(
+            Lesson(module=module, title=f'L{i}', description='', type='quiz', content={},
+                   duration=5, xp_reward=10, order=i)
+            for i in range(200)
+        )
+        users = User.objects.bulk_create(
+            User(username=f'load{i}', password='!') for i in range(args.users)
+        )
+        rng = random.Random(3)
+        plan = [
+            ('write' if rng.random() < args.write_ratio else 'read', rng.choice(users), rng.choice(lessons))
+            for _ in range(args.requests)
+        ]
+
+        def request(step):
+            kind, user, lesson = step
+            client = APIClient()
+            client.force_authenticate(user)
+            start = time.perf_counter()
+            try:
+                if kind == 'write':
+                    status = client.post(f'/api/learning/lessons/{lesson.pk}/complete/').status_code
+                else:
+                    status = client.get('/api/learning/paths/progress/').status_code
+            except OperationalError:
+                status = 'locked'
+            finally:
+                connections.close_all()
+            return kind, status, (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as pool:
+            results = list(pool.map(request, plan))
+        elapsed = time.perf_counter() - start
+
+    report = {'vendor': connections['default'].vendor, 'seconds': round(elapsed, 3),
+              'throughput_rps': round(len(results) / elapsed, 1)}
+    for kind in ('read', 'write'):
+        latencies = sorted(ms for k, _, ms in results if k == kind)
+        if latencies:
+            report[kind] = {
+                'requests': len(latencies),
+                'errors': sum(1 for k, status, _ in results if k == kind and status != 200),
+                'p50_ms': round(latencies[len(latencies) // 2], 2),
+                'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1], 2),
+            }
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profiles', nargs='+', default=['sqlite-default', 'sqlite-tuned'], choices=PROFILES)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--write-ratio', type=float, default=0.3)
+    parser.add_argument('--run-profile', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_profile:
+        print(json.dumps(run_profile(args)))
+        return
+
+    reports = {}
+    for profile in args.profiles:
+        argv = [sys.executable, '-m', 'benchmarks.db_profiles', '--run-profile', profile,
+                '--threads', str(args.threads), '--requests', str(args.requests),
+                '--users', str(args.users), '--write-ratio', str(args.write_ratio)]
+        result = subprocess.run(
+            argv, env={**os.environ, **PROFILES[profile]}, capture_output=True, text=True
+        )
+        if result.returncode:
+            reports[profile] = {'error': result.stderr.strip().splitlines()[-1:]}
+        else:
+            reports[profile] = json.loads(result.stdout.strip().splitlines()[-1])
+    print(json.dumps(reports, indent=2))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
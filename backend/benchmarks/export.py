@@ -0,0 +1,86 @@
+"""Export user_progress at two table sizes and check memory stays flat.
+
+    python -m benchmarks.export --rows 200000
+
+Streams every format/gzip combination to a byte counter at ``--rows // 10`` and
+``--rows`` rows. Fails if the bigger table needs noticeably more memory.
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+
+from benchmarks import benchmark_database, setup
+
+CASES = [('ndjson', False), ('ndjson', True), ('csv', False), ('csv', True)]
+
+def run(Export, format, compress):
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    export = Export('user_progress', format, compress=compress)
+    size = sum(len(chunk) for chunk in export)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return {'rows': export.rows, 'mb': round(size / 2**20, 2), 'rows_per_s': round(export.rows / seconds),
+            'peak_kb': round(peak / 1024, 1)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--users', type=int, default=500)
+    args = parser.parse_args()
+
+    setup()
+    from django.utils import timezone
+    from analytics.export import Export
+    from learning.models import LearningPath, Lesson, Module, UserProgress
+    from users.models import User
+
+    with benchmark_database():
+        path = LearningPath.objects.create(title='Path', description='', icon='', level='beginner', age_range='8-12')
+        module = Module.objects.create(learning_path=path, title='Module', description='', icon='', order=1)
+        lessons_per_user = -(-args.rows // args.users)
+        lessons = Lesson.objects.bulk_create(
+            Lesson(module=module, title=f'Lesson {i}', description='', type='quiz', content={},
+                   duration=5, xp_reward=10, order=i)
+            for i in range(lessons_per_user)
+        )
+        users = User.objects.bulk_create(
+            User(username=f'user{i}', email=f'user{i}@example.com') for i in range(args.users)
+        )
+        now = timezone.now()
+
+        def seed(start, stop):
+            UserProgress.objects.bulk_create(
+                (UserProgress(user=users[i // lessons_per_user], lesson=lessons[i % lessons_per_user],
+                              completed=True, score=0.8, time_spent=60,
+                              completed_at=now - timedelta(seconds=i))
+                 for i in range(start, stop)),
+                batch_size=5000,
+            )
+
+        results = {}
+        small = args.rows // 10
+        seed(0, small)
+        results['small'] = {f'{format}{".gz" if compress else ""}': run(Export, format, compress)
+                            for format, compress in CASES}
+        seed(small, args.rows)
+        results['large'] = {f'{format}{".gz" if compress else ""}': run(Export, format, compress)
+                            for format, compress in CASES}
+        print(json.dumps(results, indent=2))
+
+        ok = all(
+            results['large'][case]['rows'] == args.rows
+            and results['large'][case]['peak_kb'] <= results['small'][case]['peak_kb'] * 1.5 + 256
+            for case in results['large']
+        )
+        sys.exit(0 if ok else 1)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""Grading throughput on large quizzes: compiled answer keys vs parsing ``content`` per submission.
+
+    python -m benchmarks.grading --questions 500 --submissions 2000
+
+Builds one quiz mixing every question kind and grades random submissions two
+ways: the naive path that loads the lesson's JSON and walks it for each
+submission, and ``get_answer_key`` with its per-process compiled key. Both
+must give the same scores and per-question results. Then times the whole
+``complete`` request, which grades and records a ``QuizAttempt``.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+from benchmarks import benchmark_database, measure, setup
+
+def quiz_content(rng, questions):
+    items = []
+    for i in range(questions):
+        kind = i % 5
+        question = {'id': f'q{i}', 'prompt': f'Question {i} ' + 'lorem ipsum ' * 10}
+        if kind == 0:
+            question.update(options=[f'Option {o}' for o in range(4)], answer=rng.randrange(4))
+        elif kind == 1:
+            question.update(options=[f'Option {o}' for o in range(5)], answer=rng.sample(range(5), 2))
+        elif kind == 2:
+            question.update(answer=round(rng.uniform(0, 100), 2), tolerance=0.05)
+        elif kind == 3:
+            question.update(answer=f'Answer {i}', accept=[f'answer no {i}'], points=2)
+        else:
+            question.update(answer=rng.random() < 0.5)
+        items.append(question)
+    return {'questions': items, 'intro': 'Read carefully. ' * 50}
+
+def submission(rng, content):
+    answers = {}
+    for question in content['questions']:
+        answer = question['answer']
+        if rng.random() < 0.1:
+            continue
+        if rng.random() < 0.3:
+            answer = 'wrong' if isinstance(answer, str) else [] if isinstance(answer, list) else -1
+        elif isinstance(answer, str):
+            answer = f'  {answer.upper()} '
+        answers[question['id']] = answer
+    return answers
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--questions', type=int, default=500)
+    parser.add_argument('--submissions', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+    from django.test import Client
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from learning.grading import AnswerKey, get_answer_key
+    from learning.models import LearningPath, Lesson, Module, QuizAttempt
+    from users.models import User
+
+    with benchmark_database():
+        rng = random.Random(0)
+        content = quiz_content(rng, args.questions)
+        path = LearningPath.objects.create(title='P', description='', icon='', level='beginner', age_range='8-12')
+        module = Module.objects.create(learning_path=path, title='M', description='', icon='', order=0)
+        lesson = Lesson.objects.create(module=module, title='Quiz', description='', type='quiz', content=content,
+                                       duration=30, xp_reward=50, order=0)
+        submissions = [submission(rng, content) for _ in range(args.submissions)]
+        raw = json.dumps(content)
+
+        def naive(answers):
+            # What grading costs when every submission loads and walks the lesson's JSON
+            return AnswerKey.compile(json.loads(raw)).grade(answers)
+
+        def compiled(answers):
+            return get_answer_key(lesson.pk).grade(answers)
+
+        agree = [naive(answers) for answers in submissions] == [compiled(answers) for answers in submissions]
+
+        def throughput(grade):
+            start = time.perf_counter()
+            for answers in submissions:
+                grade(answers)
+            seconds = time.perf_counter() - start
+            return {
+                'submissions_per_s': round(len(submissions) / seconds),
+                'questions_per_s': round(len(submissions) * args.questions / seconds),
+                'us_per_submission': round(seconds / len(submissions) * 1e6, 1),
+            }
+
+        user = User.objects.create_user('grader', 'grader@example.com')
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        url = f'/api/learning/lessons/{lesson.pk}/complete/'
+        bodies = iter([json.dumps({'answers': answers, 'time_spent': 600}) for answers in submissions] * 2)
+
+        def complete():
+            response = client.post(url, next(bodies), content_type='application/json')
+            assert response.status_code == 200, response.content
+
+        result = {
+            'questions': args.questions,
+            'content_kb': round(len(raw) / 1024, 1),
+            'agree': agree,
+            'parse_per_submission': throughput(naive),
+            'compiled_key': throughput(compiled),
+            'complete_request': measure(complete, min(args.requests, len(submissions))),
+            'attempts_recorded': QuizAttempt.objects.filter(lesson=lesson).count(),
+        }
+        print(json.dumps(result, indent=2))
+        sys.exit(0 if agree else 1)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""Request latency with instrumentation off, sampled at 10% and on for every request.
+
+    python -m benchmarks.instrumentation --repeat 500
+
+Each mode gets a fresh test client, so the middleware is rebuilt from settings.
+"""
+import argparse
+import json
+from datetime import timedelta
+
+from benchmarks import benchmark_database, measure, setup
+
+MODES = {
+    'off': {'ENABLED': False, 'SAMPLE_RATE': 0.0},
+    'sampled_10pct': {'ENABLED': True, 'SAMPLE_RATE': 0.1},
+    'every_request': {'ENABLED': True, 'SAMPLE_RATE': 1.0},
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    setup()
+    from django.conf import settings
+    from django.test import Client
+    from django.utils import timezone
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from core.instrumentation import registry
+    from gamification.models import DailyChallenge
+    from learning.models import LearningPath, Lesson, Module
+    from users.models import User
+
+    settings.QUERY_COUNT_HEADER = False
+    with benchmark_database():
+        user = User.objects.create_user('bench', 'bench@example.com')
+        for p in range(5):
+            path = LearningPath.objects.create(
+                title=f'Path {p}', description='', icon='', level='beginner', age_range='8-12'
+            )
+            module = Module.objects.create(learning_path=path, title='M', description='', icon='', order=0)
+            Lesson.objects.bulk_create(
+                Lesson(module=module, title=f'L{l}', description='', type='quiz', content={},
+                       duration=5, xp_reward=10, order=l)
+                for l in range(10)
+            )
+        DailyChallenge.objects.create(
+            title='C', description='', difficulty='easy', type='quiz', content={},
+            xp_reward=5, available_until=timezone.now() + timedelta(days=1),
+        )
+        token = f'Bearer {RefreshToken.for_user(user).access_token}'
+        urls = ['/api/users/me/', '/api/learning/paths/progress/', '/api/dashboard/']
+
+        results = {}
+        for mode, config in MODES.items():
+            settings.INSTRUMENTATION = dict(settings.INSTRUMENTATION, **config)
+            client = Client(HTTP_AUTHORIZATION=token)
+            for url in urls:
+                client.get(url)
+                results.setdefault(url, {})[mode] = measure(lambda: client.get(url), args.repeat)
+        for url, modes in results.items():
+            off = modes['off']['mean_ms']
+            for mode in ('sampled_10pct', 'every_request'):
+                modes[mode]['overhead_pct'] = round((modes[mode]['mean_ms'] - off) / off * 100, 1)
+        results['metrics'] = registry.snapshot()
+        print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
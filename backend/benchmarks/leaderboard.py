@@ -0,0 +1,49 @@
+"""Leaderboard index latency at scale (no database needed).
+
+    python -m benchmarks.leaderboard --users 1000000
+"""
+import argparse
+import json
+import random
+import time
+
+from benchmarks import measure
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=10000)
+    args = parser.parse_args()
+
+    from gamification.ranking import RankIndex
+
+    rng = random.Random(7)
+    index = RankIndex()
+    start = time.perf_counter()
+    index.load_scores((user_id, rng.randrange(100000)) for user_id in range(1, args.users + 1))
+    build_seconds = time.perf_counter() - start
+
+    def random_user():
+        return rng.randrange(1, args.users + 1)
+
+    def update():
+        user_id = random_user()
+        index.set(user_id, index.score(user_id) + rng.randrange(1, 50))
+
+    def neighbours():
+        rank = index.rank(random_user())
+        index.slice(rank - 6, rank + 5)
+
+    report = {
+        'users': args.users,
+        'build_seconds': round(build_seconds, 3),
+        'top_10': measure(lambda: index.slice(0, 10), args.repeat),
+        'top_100': measure(lambda: index.slice(0, 100), args.repeat),
+        'rank': measure(lambda: index.rank(random_user()), args.repeat),
+        'rank_plus_minus_5': measure(neighbours, args.repeat),
+        'xp_update': measure(update, args.repeat),
+    }
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
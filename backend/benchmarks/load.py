@@ -0,0 +1,290 @@
+"""Replay a mix of student sessions against a running server and report latency as JSON.
+
+    python manage.py seed_data --scale medium
+    python manage.py runserver --noreload        # or gunicorn / uvicorn core.asgi:application
+    python -m benchmarks.load --url http://127.0.0.1:8000 --concurrency 20 --duration 60 -o run.json
+    python -m benchmarks.load ... --compare baseline.json --threshold 15
+
+Needs no Django: each virtual student logs in as one of the seeded
+``<prefix><n>`` users over a keep-alive connection, opens the dashboard,
+checks in, then performs weighted actions (browse paths, fetch next
+lessons, complete one, challenges, leaderboard, achievements). The
+report has overall throughput and p50/p90/p95/p99 per endpoint plus the
+git commit, so runs of different commits can be diffed with ``--compare``,
+which exits 1 when a p95 or the throughput regresses by more than
+``--threshold`` percent.
+"""
+import argparse
+import http.client
+import json
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+# action -> weight among the actions that follow a session's dashboard and check-in
+ACTIONS = {
+    'paths': 8,
+    'path_progress': 12,
+    'next_lessons': 15,
+    'complete_lesson': 15,
+    'challenges': 10,
+    'complete_challenge': 3,
+    'leaderboard': 5,
+    'leaderboard_me': 8,
+    'user_achievements': 10,
+    'me': 5,
+}
+
+# Endpoints with fewer requests than this in either run are too noisy to compare
+MIN_COMPARE_REQUESTS = 20
+
+def percentile(samples, fraction):
+    return samples[min(int(len(samples) * fraction), len(samples) - 1)]
+
+def summarize(samples, errors, seconds):
+    samples = sorted(samples)
+    if not samples:
+        return {'requests': 0, 'errors': errors}
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'rps': round(len(samples) / seconds, 2),
+        'mean_ms': round(sum(samples) / len(samples), 3),
+        'p50_ms': round(percentile(samples, 0.5), 3),
+        'p90_ms': round(percentile(samples, 0.9), 3),
+        'p95_ms': round(percentile(samples, 0.95), 3),
+        'p99_ms': round(percentile(samples, 0.99), 3),
+        'max_ms': round(samples[-1], 3),
+    }
+
+class Student:
+    """One virtual student with its own connection; records ``(endpoint, ms, ok)`` into ``results``."""
+
+    def __init__(self, url, username, password, rng, results, recording):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.username, self.password = username, password
+        self.rng = rng
+        self.results = results
+        self.recording = recording
+        self.connection = None
+        self.token = None
+        self.path_ids, self.lesson_ids, self.challenge_ids = [], [], []
+
+    def request(self, name, method, path, body=None):
+        headers = {'Content-Type': 'application/json', 'Accept-Encoding': 'identity'}
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        payload = json.dumps(body).encode() if body is not None else None
+        for attempt in (0, 1):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+            start = time.perf_counter()
+            try:
+                self.connection.request(method, path, payload, headers)
+                response = self.connection.getresponse()
+                data = response.read()
+                break
+            except (http.client.HTTPException, OSError):
+                # The server closed the keep-alive connection; retry once on a fresh one
+                self.connection.close()
+                self.connection = None
+                if attempt:
+                    self.record(name, time.perf_counter() - start, False)
+                    return None
+        self.record(name, time.perf_counter() - start, response.status < 400)
+        if response.getheader('Connection', '').lower() == 'close':
+            self.connection.close()
+            self.connection = None
+        if response.status >= 400 or not data:
+            return None
+        return json.loads(data)
+
+    def record(self, name, seconds, ok):
+        if self.recording.is_set():
+            self.results.append((name, seconds * 1000, ok))
+
+    def login(self):
+        self.token = None
+        data = self.request('login', 'POST', '/api/users/token/',
+                            {'username': self.username, 'password': self.password})
+        self.token = data and data['access']
+        return self.token is not None
+
+    def session(self, actions):
+        if self.token is None and not self.login():
+            time.sleep(1)
+            return
+        dashboard = self.request('dashboard', 'GET', '/api/dashboard/')
+        if dashboard:
+            self.path_ids = [row['id'] for row in dashboard.get('paths', [])] or self.path_ids
+            self.challenge_ids = [row['id'] for row in dashboard.get('challenges', [])]
+        self.request('check_in', 'POST', '/api/gamification/streak/check-in/', {})
+        names, weights = zip(*ACTIONS.items())
+        for name in self.rng.choices(names, weights, k=actions):
+            getattr(self, name)()
+
+    def paths(self):
+        data = self.request('paths', 'GET', '/api/learning/paths/')
+        if data:
+            self.path_ids = [row['id'] for row in data]
+
+    def path_progress(self):
+        if self.path_ids:
+            self.request('path_progress', 'GET', f'/api/learning/paths/{self.rng.choice(self.path_ids)}/progress/')
+
+    def next_lessons(self):
+        data = self.request('next_lessons', 'GET', '/api/learning/lessons/next/?limit=5')
+        if data:
+            self.lesson_ids = [row['id'] for row in data]
+
+    def complete_lesson(self):
+        if not self.lesson_ids:
+            return self.next_lessons()
+        lesson_id = self.lesson_ids.pop(0)
+        self.request('complete_lesson', 'POST', f'/api/learning/lessons/{lesson_id}/complete/', {
+            'answers': {str(i): self.rng.randrange(4) for i in range(8)},
+            'score': round(self.rng.uniform(50, 100), 1), 'time_spent': self.rng.randint(60, 900),
+        })
+
+    def challenges(self):
+        data = self.request('challenges', 'GET', '/api/gamification/challenges/')
+        if data:
+            self.challenge_ids = [row['id'] for row in data]
+
+    def complete_challenge(self):
+        if self.challenge_ids:
+            self.request('complete_challenge', 'POST',
+                         f'/api/gamification/challenges/{self.rng.choice(self.challenge_ids)}/complete/', {})
+
+    def leaderboard(self):
+        self.request('leaderboard', 'GET', '/api/gamification/leaderboard/?limit=10')
+
+    def leaderboard_me(self):
+        self.request('leaderboard_me', 'GET', '/api/gamification/leaderboard/me/')
+
+    def user_achievements(self):
+        self.request('user_achievements', 'GET', '/api/gamification/achievements/user/')
+
+    def me(self):
+        self.request('me', 'GET', '/api/users/me/')
+
+def run(args):
+    results = []
+    recording = threading.Event()
+    stop = threading.Event()
+
+    def worker(index):
+        rng = random.Random(args.seed * 100003 + index)
+        student = Student(args.url, f'{args.prefix}{index % args.users}', args.password, rng, results, recording)
+        while not stop.is_set():
+            if rng.random() < args.relogin:
+                student.token = None
+            student.session(args.actions)
+            if args.think_ms:
+                time.sleep(rng.expovariate(1000 / args.think_ms))
+
+    threads = [threading.Thread(target=worker, args=(index,), daemon=True) for index in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.warmup)
+    recording.set()
+    started = time.perf_counter()
+    time.sleep(args.duration)
+    recording.clear()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=30)
+    return results, elapsed
+
+def report(results, elapsed, args):
+    by_endpoint = defaultdict(list)
+    errors = defaultdict(int)
+    for name, ms, ok in results:
+        by_endpoint[name].append(ms)
+        errors[name] += not ok
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'meta': {
+            'url': args.url,
+            'commit': commit,
+            'started_at': datetime.now(timezone.utc).isoformat(),
+            'concurrency': args.concurrency,
+            'duration_s': round(elapsed, 2),
+            'users': args.users,
+            'actions_per_session': args.actions,
+            'think_ms': args.think_ms,
+            'seed': args.seed,
+        },
+        'total': summarize([ms for _, ms, _ in results], sum(errors.values()), elapsed),
+        'endpoints': {
+            name: summarize(samples, errors[name], elapsed) for name, samples in sorted(by_endpoint.items())
+        },
+    }
+
+def compare(current, baseline, threshold):
+    """Lines describing the change from ``baseline``, and whether anything regressed past ``threshold`` %."""
+    lines, regressed = [], False
+
+    def change(name, metric, new, old, higher_is_worse=True):
+        nonlocal regressed
+        if not old or new is None:
+            return
+        delta = (new - old) / old * 100
+        worse = delta > threshold if higher_is_worse else delta < -threshold
+        regressed |= worse
+        lines.append(f"{name:20} {metric:8} {old:>10} -> {new:>10} ({delta:+.1f}%){'  REGRESSION' if worse else ''}")
+
+    change('total', 'rps', current['total'].get('rps'), baseline['total'].get('rps'), higher_is_worse=False)
+    change('total', 'p95_ms', current['total'].get('p95_ms'), baseline['total'].get('p95_ms'))
+    for name, stats in current['endpoints'].items():
+        old = baseline['endpoints'].get(name, {})
+        if min(stats['requests'], old.get('requests', 0)) < MIN_COMPARE_REQUESTS:
+            continue
+        change(name, 'p95_ms', stats.get('p95_ms'), old.get('p95_ms'))
+    return lines, regressed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--concurrency', type=int, default=10, help='Virtual students running at once.')
+    parser.add_argument('--duration', type=float, default=30, help='Measured seconds.')
+    parser.add_argument('--warmup', type=float, default=5, help='Unmeasured seconds before measuring.')
+    parser.add_argument('--users', type=int, default=100, help='Seeded students to log in as.')
+    parser.add_argument('--prefix', default='student')
+    parser.add_argument('--password', default='benchmark-password')
+    parser.add_argument('--actions', type=int, default=8, help='Actions per session after the dashboard.')
+    parser.add_argument('--think-ms', type=float, default=0, help='Mean pause between sessions.')
+    parser.add_argument('--relogin', type=float, default=0.05, help='Share of sessions that log in again.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', '-o', help='Write the JSON report here as well as to stdout.')
+    parser.add_argument('--compare', help='Previous JSON report to compare against.')
+    parser.add_argument('--threshold', type=float, default=20, help='Regression threshold in percent.')
+    args = parser.parse_args()
+
+    results, elapsed = run(args)
+    result = report(results, elapsed, args)
+    body = json.dumps(result, indent=2)
+    print(body)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(body)
+    if args.compare:
+        with open(args.compare) as file:
+            lines, regressed = compare(result, json.load(file), args.threshold)
+        print('\n'.join(lines), file=sys.stderr)
+        sys.exit(1 if regressed else 0)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""pytest-benchmark micro-benchmarks for the serializers, renderers and hot views.
+
+    pip install -r requirements-dev.txt
+    python -m pytest benchmarks/micro.py --benchmark-json=micro.json
+    python -m pytest benchmarks/micro.py --benchmark-compare --benchmark-autosave
+
+Runs against one throwaway database seeded at the ``small`` scale of
+``analytics.seed``. Views go through the full middleware stack via the test
+client. Pass ``--benchmark-autosave`` on each commit and ``--benchmark-compare``
+to diff against the last saved run.
+"""
+import pytest
+
+from benchmarks import benchmark_database, setup
+
+setup()
+
+from django.test import Client
+from django.test.utils import override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from analytics.seed import SCALES, seed
+from core.renderers import ORJSONRenderer
+from gamification.models import Achievement, UserAchievement
+from gamification.serializers import AchievementSerializer, UserAchievementValuesSerializer
+from learning.models import LearningPath
+from learning.serializers import LearningPathSerializer, LearningPathValuesSerializer
+from users.models import User
+
+VIEWS = [
+    '/api/users/me/',
+    '/api/learning/paths/',
+    '/api/learning/paths/progress/',
+    '/api/learning/lessons/next/',
+    '/api/gamification/achievements/',
+    '/api/gamification/achievements/user/',
+    '/api/gamification/challenges/',
+    '/api/gamification/leaderboard/me/',
+    '/api/dashboard/',
+]
+
+@pytest.fixture(scope='session')
+def database():
+    with benchmark_database():
+        seed(**SCALES['small'])
+        yield
+
+@pytest.fixture(scope='session')
+def student(database):
+    return User.objects.filter(username__startswith='student').order_by('-xp').first()
+
+@pytest.fixture
+def client(student):
+    return Client(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(student).access_token}')
+
+def test_path_tree_model_serializer(benchmark, database):
+    benchmark(lambda: LearningPathSerializer(
+        LearningPath.objects.prefetch_related('modules__lessons'), many=True
+    ).data)
+
+def test_path_tree_values_serializer(benchmark, database):
+    benchmark(lambda: LearningPathValuesSerializer(LearningPath.objects.all()).data)
+
+def test_achievements_model_serializer(benchmark, database):
+    benchmark(lambda: AchievementSerializer(Achievement.objects.all(), many=True).data)
+
+def test_user_achievements_values_serializer(benchmark, student):
+    benchmark(lambda: UserAchievementValuesSerializer(UserAchievement.objects.filter(user=student)).data)
+
+@pytest.mark.parametrize('renderer', [JSONRenderer, ORJSONRenderer], ids=['drf', 'orjson'])
+def test_render_path_tree(benchmark, database, renderer):
+    data = LearningPathValuesSerializer(LearningPath.objects.all()).data
+    benchmark(renderer().render, data)
+
+@pytest.mark.parametrize('url', VIEWS)
+def test_view(benchmark, client, url):
+    client.get(url)
+
+    def get():
+        response = client.get(url)
+        assert response.status_code == 200, response.content
+    with override_settings(DASHBOARD_CACHE_TTL=0):
+        benchmark(get)
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""Walk 100k achievements page by page and check memory and latency stay flat.
+
+    python -m benchmarks.pagination --rows 100000 --page-size 100
+
+Fails if any page allocates more than ``--max-peak-kb`` or the last pages are
+much slower than the first, i.e. if a page ever loads the whole table.
+"""
+import argparse
+import gc
+import json
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks import benchmark_database, setup
+
+NEXT = re.compile(r'<([^>]+)>; rel="next"')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--max-peak-kb', type=int, default=2048)
+    args = parser.parse_args()
+
+    setup()
+    from django.test import Client
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from gamification.models import Achievement
+    from users.models import User
+
+    with benchmark_database():
+        Achievement.objects.bulk_create(
+            (Achievement(title=f'Achievement {i}', description='Earn it.', icon='star',
+                         criteria={'metric': 'xp', 'gte': i}, xp_reward=5)
+             for i in range(args.rows)),
+            batch_size=5000,
+        )
+        user = User.objects.create_user('bench', 'bench@example.com')
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        client.get('/api/gamification/achievements/?page_size=1')
+
+        url = f'/api/gamification/achievements/?page_size={args.page_size}'
+        seen, peaks, latencies = 0, [], []
+        tracemalloc.start()
+        while url:
+            # Drop earlier requests' reference cycles so the peak is this page's alone
+            gc.collect()
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            response = client.get(url)
+            latencies.append((time.perf_counter() - start) * 1000)
+            peaks.append((tracemalloc.get_traced_memory()[1] - baseline) / 1024)
+            assert response.status_code == 200, response.content
+            seen += len(response.json())
+            match = NEXT.match(response.get('Link', ''))
+            url = match and match.group(1)
+        tracemalloc.stop()
+
+        tenth = max(len(latencies) // 10, 1)
+        result = {
+            'rows': seen,
+            'pages': len(latencies),
+            'peak_kb_max': round(max(peaks), 1),
+            'first_pages_ms': round(statistics.fmean(latencies[:tenth]), 3),
+            'last_pages_ms': round(statistics.fmean(latencies[-tenth:]), 3),
+        }
+        print(json.dumps(result, indent=2))
+        ok = (
+            seen == args.rows
+            and result['peak_kb_max'] <= args.max_peak_kb
+            and result['last_pages_ms'] <= result['first_pages_ms'] * 2
+        )
+        sys.exit(0 if ok else 1)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
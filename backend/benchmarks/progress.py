@@ -0,0 +1,81 @@
+"""Compare the old count()-based ``user_progress`` with the single aggregate.
+
+    python -m benchmarks.progress --users 100000 --lessons 500 --completion 0.1
+"""
+import argparse
+import json
+import random
+
+from benchmarks import benchmark_database, measure, setup
+
+def seed(users, lessons, completion, batch_size=5000):
+    from django.utils import timezone
+    from learning.models import LearningPath, Lesson, Module, UserProgress
+    from users.models import User
+
+    path = LearningPath.objects.create(
+        title='Benchmark', description='', icon='', level='beginner', age_range='8-12'
+    )
+    modules = Module.objects.bulk_create(
+        Module(learning_path=path, title=f'Module {i}', description='', icon='', order=i)
+        for i in range(max(lessons // 10, 1))
+    )
+    lesson_objs = Lesson.objects.bulk_create(
+        Lesson(
+            module=modules[i % len(modules)], title=f'Lesson {i}', description='', type='quiz',
+            content={}, duration=5, xp_reward=10, order=i,
+        )
+        for i in range(lessons)
+    )
+    for start in range(0, users, batch_size):
+        User.objects.bulk_create(
+            User(username=f'bench{i}', email=f'bench{i}@example.com', password='!')
+            for i in range(start, min(start + batch_size, users))
+        )
+    rng = random.Random(42)
+    now = timezone.now()
+    per_user = int(lessons * completion)
+    batch = []
+    for user_id in User.objects.values_list('id', flat=True).iterator():
+        for lesson in rng.sample(lesson_objs, per_user):
+            batch.append(UserProgress(user_id=user_id, lesson=lesson, completed=True, completed_at=now))
+        if len(batch) >= batch_size:
+            UserProgress.objects.bulk_create(batch)
+            batch = []
+    UserProgress.objects.bulk_create(batch)
+    return path
+
+def legacy_progress(user, path):
+    from learning.models import Lesson, UserProgress
+    lessons = Lesson.objects.filter(module__learning_path=path)
+    progress = UserProgress.objects.filter(user=user, lesson__in=lessons)
+    return lessons.count(), progress.filter(completed=True).count()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--lessons', type=int, default=500)
+    parser.add_argument('--completion', type=float, default=0.1)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+    from learning.progress import path_progress, user_path_progress
+    from users.models import User
+
+    with benchmark_database():
+        path = seed(args.users, args.lessons, args.completion)
+        users = list(User.objects.order_by('?')[:args.repeat])
+        picks = iter(users * 2)
+        report = {
+            'scale': vars(args),
+            'legacy_three_queries': measure(lambda: legacy_progress(next(picks), path), args.repeat),
+        }
+        picks = iter(users * 2)
+        report['single_aggregate'] = measure(lambda: path_progress(next(picks), path), args.repeat)
+        picks = iter(users * 2)
+        report['batch_all_paths'] = measure(lambda: user_path_progress(next(picks)), args.repeat)
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
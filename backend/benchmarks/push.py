@@ -0,0 +1,98 @@
+"""Cost of idle event streams and coalescing of bursts in ``core.push``.
+
+    python -m benchmarks.push --connections 5000 --burst 50
+
+Opens ``--connections`` streams on one event loop, as the ASGI server would,
+and measures the memory they hold while idle. It then publishes ``--burst``
+XP events per user from another thread, as sync views do, and counts the
+writes and delivery latency. Runs without a database or an HTTP server.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+
+from benchmarks import setup
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--connections', type=int, default=5000)
+    parser.add_argument('--burst', type=int, default=50)
+    parser.add_argument('--coalesce', type=float, default=0.25)
+    args = parser.parse_args()
+
+    setup()
+    from django.conf import settings
+    from core.push import MemoryBroker, stream
+
+    settings.PUSH = dict(settings.PUSH, COALESCE_SECONDS=args.coalesce, HEARTBEAT_SECONDS=60)
+    broker = MemoryBroker()
+    writes = {}
+    gained = {}
+    received = {}
+
+    async def client(user_id):
+        async for chunk in stream(broker, user_id, time.time() + 3600):
+            if chunk.startswith(b'event:'):
+                writes[user_id] = writes.get(user_id, 0) + 1
+                gained[user_id] = gained.get(user_id, 0) + json.loads(chunk.split(b'data: ')[1])['gained']
+                received[user_id] = time.perf_counter()
+
+    async def run():
+        gc.collect()
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        tasks = [asyncio.create_task(client(user_id)) for user_id in range(args.connections)]
+        while broker.connections() < args.connections:
+            await asyncio.sleep(0.01)
+        idle_bytes = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+
+        def publish():
+            for n in range(args.burst):
+                for user_id in range(args.connections):
+                    broker.publish(user_id, 'xp', {'xp': (n + 1) * 10, 'level': 1, 'gained': 10, 'source': 'lesson'})
+
+        started = time.perf_counter()
+        publisher = threading.Thread(target=publish)
+        publisher.start()
+        while publisher.is_alive():
+            await asyncio.sleep(0.01)
+        published = time.perf_counter()
+        expected = args.burst * 10
+        deadline = time.perf_counter() + 60
+        while time.perf_counter() < deadline and (
+            len(gained) < args.connections or min(gained.values()) < expected
+        ):
+            await asyncio.sleep(args.coalesce)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return idle_bytes, started, published
+
+    idle_bytes, started, published = asyncio.run(run())
+    latencies = sorted((at - started) * 1000 for at in received.values())
+    final = len(gained) == args.connections and set(gained.values()) == {args.burst * 10}
+    result = {
+        'connections': args.connections,
+        'idle_kb_per_connection': round(idle_bytes / args.connections / 1024, 2),
+        'events_published': args.connections * args.burst,
+        'publish_s': round(published - started, 3),
+        'writes_per_connection': round(statistics.fmean(writes.values()), 2),
+        'all_events_merged': final,
+        'last_delivery_ms': {
+            'p50': round(latencies[len(latencies) // 2], 1),
+            'p99': round(latencies[int(len(latencies) * 0.99) - 1], 1),
+        },
+        'open_after_close': broker.connections(),
+    }
+    print(json.dumps(result, indent=2))
+    sys.exit(0 if final and result['open_after_close'] == 0 else 1)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""Next-lesson scoring for 1k users over a 10k-lesson catalog.
+
+    python -m benchmarks.recommendations --lessons 10000 --users 1000
+
+Reports the one-off feature build, the NumPy scoring per user, end-to-end
+``recommend()`` (including the progress query) per user, and the same model
+written as a per-lesson Python loop for comparison.
+"""
+import argparse
+import itertools
+import json
+import math
+import random
+import time
+from datetime import timedelta
+
+from benchmarks import benchmark_database, measure, setup
+
+def python_scores(features, profile, rec):
+    """The model of learning.recommendations, one lesson at a time."""
+    ids = features.ids.tolist()
+    difficulty = features.difficulty.tolist()
+    duration = features.duration.tolist()
+    types = features.type_names
+    path_index = features.path_index.tolist()
+    position = features.position.tolist()
+    completed = set(profile['completed'].tolist())
+    affinity = rec.STYLE_AFFINITY[profile['style']]
+    frontier, started = {}, {}
+    for row in range(len(ids)):
+        path = path_index[row]
+        if row in completed:
+            started[path] = True
+        else:
+            frontier[path] = min(frontier.get(path, math.inf), position[row])
+    scores = []
+    for row in range(len(ids)):
+        if row in completed:
+            scores.append(-math.inf)
+            continue
+        path = path_index[row]
+        behind = max(position[row] - frontier.get(path, math.inf), 0)
+        sequence = math.exp(-behind / rec.SEQUENCE_DECAY) * (1 if started.get(path) else rec.UNSTARTED_PATH)
+        scores.append(
+            rec.WEIGHTS['difficulty'] * math.exp(-((difficulty[row] - profile['target']) / rec.DIFFICULTY_WIDTH) ** 2)
+            + rec.WEIGHTS['style'] * affinity.get(types[row], rec.FALLBACK_AFFINITY)
+            + rec.WEIGHTS['time'] * min(profile['remaining'] / duration[row], 1)
+            + rec.WEIGHTS['sequence'] * sequence
+        )
+    return scores
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--lessons', type=int, default=10000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--completed', type=int, default=60, help='Completed lessons per user.')
+    parser.add_argument('--python-users', type=int, default=20, help='Users to time the Python loop on.')
+    args = parser.parse_args()
+
+    setup()
+    from django.utils import timezone
+    from learning import recommendations as rec
+    from learning.models import LearningPath, Lesson, Module, UserProgress
+    from users.models import User
+
+    rng = random.Random(7)
+    with benchmark_database():
+        lessons_per_module, modules_per_path = 20, 25
+        modules = []
+        for p in range(-(-args.lessons // (lessons_per_module * modules_per_path))):
+            path = LearningPath.objects.create(
+                title=f'Path {p}', description='', icon='', level='beginner', age_range='8-12'
+            )
+            modules += Module.objects.bulk_create(
+                Module(learning_path=path, title=f'Module {m}', description='', icon='', order=m)
+                for m in range(modules_per_path)
+            )
+        lessons = Lesson.objects.bulk_create(
+            (Lesson(module=modules[i // lessons_per_module], title=f'Lesson {i}', description='',
+                    type=rng.choice(rec.TYPES), content={}, duration=rng.choice((5, 10, 15, 20, 30, 45)),
+                    xp_reward=10, difficulty=round(rng.uniform(0.5, 3.0), 2), order=i % lessons_per_module)
+             for i in range(args.lessons)),
+            batch_size=2000,
+        )
+        users = User.objects.bulk_create(
+            User(username=f'user{i}', email=f'user{i}@example.com',
+                 learning_speed=rng.choice(('slow', 'medium', 'fast')),
+                 preferred_learning_style=rng.choice(tuple(rec.STYLE_AFFINITY)),
+                 daily_goal=rng.choice((15, 30, 45)))
+            for i in range(args.users)
+        )
+        now = timezone.now()
+        UserProgress.objects.bulk_create(
+            (UserProgress(user=user, lesson=lesson, completed=True, score=rng.uniform(0.3, 1.0),
+                          time_spent=rng.randint(60, 1800), completed_at=now - timedelta(hours=rng.uniform(0, 72)))
+             for user in users for lesson in rng.sample(lessons, args.completed)),
+            batch_size=5000,
+        )
+
+        start = time.perf_counter()
+        features = rec.get_lesson_features()
+        build_ms = (time.perf_counter() - start) * 1000
+
+        progress = {}
+        for row in UserProgress.objects.filter(completed=True).order_by('-completed_at').values_list(
+            'user_id', 'lesson_id', 'score', 'time_spent', 'completed_at'
+        ):
+            progress.setdefault(row[0], []).append(row[1:])
+        profiles = [rec.build_profile(user, features, progress.get(user.pk, [])) for user in users]
+
+        numpy_profiles = itertools.cycle(profiles)
+        numpy_stats = measure(
+            lambda: features.top(features.score(next(numpy_profiles)), 10), repeat=args.users
+        )
+        recommend_users = itertools.cycle(users)
+        recommend_stats = measure(lambda: rec.recommend(next(recommend_users)), repeat=args.users)
+
+        python_profiles = itertools.cycle(profiles)
+        def python_score():
+            scores = python_scores(features, next(python_profiles), rec)
+            sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[:10]
+        python_stats = measure(python_score, repeat=args.python_users)
+
+        # Both implementations must agree
+        for profile in profiles[:args.python_users]:
+            expected = python_scores(features, profile, rec)
+            actual = features.score(profile)
+            assert all(
+                (a == b) or abs(a - b) < 1e-9 for a, b in zip(actual.tolist(), expected)
+            ), 'NumPy and Python scores differ'
+
+    print(json.dumps({
+        'lessons': len(features),
+        'users': args.users,
+        'feature_build_ms': round(build_ms, 1),
+        'numpy_score_top10': numpy_stats,
+        'recommend_end_to_end': recommend_stats,
+        'python_loop_score_top10': python_stats,
+        'speedup': round(python_stats['mean_ms'] / numpy_stats['mean_ms'], 1),
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""Throughput of ``register/`` and ``token/`` per password hasher.
+
+    python -m benchmarks.registration --threads 8 --requests 64
+
+Each hasher gets a fresh batch of sign-ups followed by a login for each of them.
+"""
+import argparse
+import importlib.util
+import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks import benchmark_database, setup
+
+HASHERS = {
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=64, help='Sign-ups (and logins) per hasher.')
+    parser.add_argument('--hashers', default='pbkdf2,scrypt,argon2')
+    args = parser.parse_args()
+
+    setup()
+    from django.conf import settings
+    from django.db import connections
+    from django.test import Client, override_settings
+
+    def timed(post, bodies):
+        def call(body):
+            try:
+                start = time.perf_counter()
+                status = post(body)
+                return status, time.perf_counter() - start
+            finally:
+                connections.close_all()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as pool:
+            results = list(pool.map(call, bodies))
+        elapsed = time.perf_counter() - start
+        latencies = sorted(latency * 1000 for _, latency in results)
+        return {
+            'ok': sum(status in (200, 201) for status, _ in results),
+            'throughput_rps': round(len(results) / elapsed, 1),
+            'p50_ms': round(latencies[len(latencies) // 2], 1),
+            'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1], 1),
+        }
+
+    results = {}
+    db_file = str(Path(tempfile.mkdtemp()) / 'registration.sqlite3')
+    with benchmark_database(db_file):
+        for name in args.hashers.split(','):
+            hasher = HASHERS[name]
+            if name == 'argon2' and importlib.util.find_spec('argon2') is None:
+                results[name] = 'skipped: argon2-cffi is not installed'
+                continue
+            with override_settings(PASSWORD_HASHERS=[hasher] + settings.PASSWORD_HASHERS):
+                users = [
+                    {'username': f'{name}{i}', 'email': f'{name}{i}@example.com', 'password': 'bench-pass-123'}
+                    for i in range(args.requests)
+                ]
+
+                def register(body):
+                    return Client().post('/api/users/register/', body, content_type='application/json').status_code
+
+                def login(body):
+                    return Client().post('/api/users/token/', {
+                        'username': body['username'], 'password': body['password'],
+                    }, content_type='application/json').status_code
+
+                results[name] = {'register': timed(register, users), 'token': timed(login, users)}
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""DRF ModelSerializer + JSONRenderer vs ValuesSerializer + ORJSONRenderer, and the parsers.
+
+    python -m benchmarks.serializers --paths 20 --modules 6 --lessons 8 --content-kb 2
+
+Each case serializes straight from the database, so query time is included.
+"""
+import argparse
+import io
+import json
+from datetime import timedelta
+
+from benchmarks import benchmark_database, measure, setup
+
+def lesson_content(size_kb):
+    # Quiz-shaped blob: questions with options, roughly size_kb kilobytes of JSON
+    question = {
+        'prompt': 'Which block repeats the code inside it?',
+        'options': ['repeat', 'if', 'when clicked', 'say'],
+        'answer': 0,
+        'hint': 'Look at the control category.',
+    }
+    return {'questions': [dict(question, id=i) for i in range(max(size_kb * 1024 // 160, 1))]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--paths', type=int, default=20)
+    parser.add_argument('--modules', type=int, default=6)
+    parser.add_argument('--lessons', type=int, default=8)
+    parser.add_argument('--content-kb', type=int, default=2)
+    parser.add_argument('--achievements', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+    from django.utils import timezone
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from core.parsers import ORJSONParser
+    from core.renderers import ORJSONRenderer
+    from gamification.models import Achievement, DailyChallenge, UserAchievement
+    from gamification.serializers import (
+        AchievementSerializer, AchievementValuesSerializer, DailyChallengeSerializer,
+        DailyChallengeValuesSerializer, UserAchievementSerializer, UserAchievementValuesSerializer,
+    )
+    from learning.models import LearningPath, Lesson, Module
+    from learning.serializers import LearningPathSerializer, LearningPathValuesSerializer
+    from users.models import User
+
+    with benchmark_database():
+        content = lesson_content(args.content_kb)
+        paths = LearningPath.objects.bulk_create(
+            LearningPath(title=f'Path {p}', description='About this path. ' * 10, icon='code',
+                         level='beginner', age_range='8-12')
+            for p in range(args.paths)
+        )
+        modules = Module.objects.bulk_create(
+            Module(learning_path=path, title=f'Module {m}', description='', icon='', order=m)
+            for path in paths for m in range(args.modules)
+        )
+        Lesson.objects.bulk_create(
+            Lesson(module=module, title=f'Lesson {i}', description='Learn loops.', type='quiz',
+                   content=content, duration=10, xp_reward=10, order=i)
+            for module in modules for i in range(args.lessons)
+        )
+        user = User.objects.create_user('bench', 'bench@example.com')
+        achievements = Achievement.objects.bulk_create(
+            Achievement(title=f'Achievement {i}', description='Earn it.', icon='star',
+                        criteria={'metric': 'xp', 'gte': i * 10}, xp_reward=5)
+            for i in range(args.achievements)
+        )
+        UserAchievement.objects.bulk_create(
+            UserAchievement(user=user, achievement=achievement) for achievement in achievements
+        )
+        DailyChallenge.objects.bulk_create(
+            DailyChallenge(title=f'Challenge {i}', description='', difficulty='easy', type='quiz',
+                           content=content, xp_reward=5,
+                           available_until=timezone.now() + timedelta(hours=i + 1))
+            for i in range(10)
+        )
+
+        drf, fast = JSONRenderer(), ORJSONRenderer()
+        cases = {
+            'catalog': (
+                lambda: LearningPathSerializer(LearningPath.objects.with_curriculum(), many=True).data,
+                lambda: LearningPathValuesSerializer(LearningPath.objects.all()).data,
+            ),
+            'achievements': (
+                lambda: AchievementSerializer(Achievement.objects.all(), many=True).data,
+                lambda: AchievementValuesSerializer(Achievement.objects.all()).data,
+            ),
+            'user_achievements': (
+                lambda: UserAchievementSerializer(
+                    UserAchievement.objects.filter(user=user).select_related('achievement'), many=True
+                ).data,
+                lambda: UserAchievementValuesSerializer(UserAchievement.objects.filter(user=user)).data,
+            ),
+            'challenges': (
+                lambda: DailyChallengeSerializer(DailyChallenge.objects.all(), many=True).data,
+                lambda: DailyChallengeValuesSerializer(DailyChallenge.objects.all()).data,
+            ),
+        }
+        results = {}
+        for name, (slow_build, fast_build) in cases.items():
+            body = drf.render(slow_build())
+            assert body == drf.render(fast_build()), name
+            results[name] = {
+                'bytes': len(body),
+                'drf': measure(lambda: drf.render(slow_build()), args.repeat),
+                'values_orjson': measure(lambda: fast.render(fast_build()), args.repeat),
+            }
+
+        body = drf.render(LearningPathValuesSerializer(LearningPath.objects.all()).data)
+        results['parse_catalog'] = {
+            'bytes': len(body),
+            'drf': measure(lambda: JSONParser().parse(io.BytesIO(body)), args.repeat),
+            'orjson': measure(lambda: ORJSONParser().parse(io.BytesIO(body)), args.repeat),
+        }
+        print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""Time the set-based streak rollover over a large streaks table.
+
+    python -m benchmarks.streak_rollover --streaks 1000000
+"""
+import argparse
+import json
+import random
+import time
+from datetime import timedelta
+
+from benchmarks import benchmark_database, setup
+
+TIMEZONES = ['UTC', 'Europe/London', 'Africa/Accra', 'America/New_York', 'Asia/Tokyo']
+
+def seed(count, batch_size=20000):
+    from django.utils import timezone
+    from gamification.models import Streak
+    from users.models import User
+
+    rng = random.Random(9)
+    today = timezone.now().date()
+    for start in range(0, count, batch_size):
+        users = User.objects.bulk_create(
+            User(username=f'streak{i}', password='!', timezone=rng.choice(TIMEZONES))
+            for i in range(start, min(start + batch_size, count))
+        )
+        Streak.objects.bulk_create(
+            Streak(
+                user=user, current=rng.randrange(1, 30), longest=30,
+                last_activity_date=today - timedelta(days=rng.choice([0, 1, 1, 2, 3, 10])),
+                protection_available=rng.random() < 0.3,
+            )
+            for user in users
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--streaks', type=int, default=1000000)
+    args = parser.parse_args()
+
+    setup()
+    from gamification.streaks import rollover
+
+    with benchmark_database():
+        start = time.perf_counter()
+        seed(args.streaks)
+        seed_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        first = rollover()
+        first_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        second = rollover()
+        second_seconds = time.perf_counter() - start
+
+    print(json.dumps({
+        'streaks': args.streaks,
+        'seed_seconds': round(seed_seconds, 2),
+        'rollover_seconds': round(first_seconds, 3),
+        'rollover_totals': first['totals'],
+        'rerun_seconds': round(second_seconds, 3),
+        'rerun_totals': second['totals'],
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""Fire parallel lesson and challenge completes and assert the exact final XP.
+
+    python -m benchmarks.xp_concurrency --threads 16 --lessons 50 --retries 3
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+from benchmarks import benchmark_database, setup
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--lessons', type=int, default=50)
+    parser.add_argument('--retries', type=int, default=3, help='Duplicate posts per lesson.')
+    args = parser.parse_args()
+
+    setup()
+    from django.db import OperationalError, connections
+    from django.utils import timezone
+    from rest_framework.test import APIClient
+    from gamification.models import DailyChallenge, XPEvent
+    from learning.models import LearningPath, Lesson, Module
+    from users.models import User
+
+    db_file = str(Path(tempfile.mkdtemp()) / 'xp_concurrency.sqlite3')
+    with benchmark_database(db_file):
+        user = User.objects.create_user('stress', 'stress@example.com', 'stress-pass')
+        path = LearningPath.objects.create(
+            title='Stress', description='', icon='', level='beginner', age_range='8-12'
+        )
+        module = Module.objects.create(learning_path=path, title='M', description='', icon='', order=0)
+        lessons = Lesson.objects.bulk_create(
+            Lesson(module=module, title=f'L{i}', description='', type='quiz', content={},
+                   duration=5, xp_reward=7, order=i)
+            for i in range(args.lessons)
+        )
+        challenge = DailyChallenge.objects.create(
+            title='C', description='', difficulty='easy', type='quiz', content={},
+            xp_reward=11, available_until=timezone.now() + timedelta(days=1),
+        )
+        urls = [f'/api/learning/lessons/{lesson.pk}/complete/' for lesson in lessons]
+        urls += [f'/api/gamification/challenges/{challenge.pk}/complete/']
+        urls *= args.retries
+
+        lock_retries = []
+
+        def post(url):
+            # Retry lock errors the way a real client retries a 5xx; idempotency keeps XP exact
+            client = APIClient()
+            try:
+                while True:
+                    try:
+                        client.force_authenticate(User.objects.get(pk=user.pk))
+                        return client.post(url, {'score': 1}, format='json').status_code
+                    except OperationalError:
+                        lock_retries.append(url)
+                        time.sleep(0.01)
+            finally:
+                connections.close_all()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as pool:
+            statuses = list(pool.map(post, urls))
+        elapsed = time.perf_counter() - start
+
+        user.refresh_from_db()
+        expected = sum(lesson.xp_reward for lesson in lessons) + challenge.xp_reward
+        report = {
+            'requests': len(urls),
+            'threads': args.threads,
+            'seconds': round(elapsed, 3),
+            'statuses': {str(code): statuses.count(code) for code in set(statuses)},
+            'lock_retries': len(lock_retries),
+            'expected_xp': expected,
+            'final_xp': user.xp,
+            'ledger_events': XPEvent.objects.filter(user=user).count(),
+            'level': user.level,
+        }
+    print(json.dumps(report, indent=2))
+    if report['final_xp'] != expected:
+        sys.exit('XP mismatch: lost or duplicated increments')
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""Native async read endpoints alongside the DRF viewsets.
+
+DRF 3.14 views are sync-only, so under ASGI every request occupies a thread.
+Views wrapped with ``async_api_view`` authenticate the JWT and load the user
+with the async ORM, then render with the API's ``ORJSONRenderer``, so
+responses match the sync endpoints byte for byte.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .authentication import CachedJWTAuthentication, get_user_cache
+from .renderers import ORJSONRenderer
+
+def json_response(data, status=status.HTTP_200_OK, **kwargs):
+    return HttpResponse(ORJSONRenderer().render(data), status=status, content_type='application/json', **kwargs)
+
+class AsyncJWTAuthentication(CachedJWTAuthentication):
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        cache = get_user_cache()
+        user = cache.get(str(user_id), validated_token.get('iat'))
+        if user is not None:
+            return user
+
+        try:
+            user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+        cache.set(str(user_id), validated_token.get('iat'), user)
+        cache.set_active(str(user_id), True)
+        return user
+
+def async_api_view(view=None, *, fallback=None):
+    """Wrap an authenticated, GET-only ``async def view(request, **kwargs)``.
+
+    Other methods go to the sync ``fallback`` view when one is given. Like
+    DRF's ``APIView.as_view``, the wrapper is CSRF exempt: requests are
+    authenticated by the JWT header, never by a session cookie.
+    """
+    if view is None:
+        return functools.partial(async_api_view, fallback=fallback)
+    authenticator = AsyncJWTAuthentication()
+    if fallback is not None:
+        fallback = sync_to_async(fallback)
+
+    @csrf_exempt
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            if fallback is not None:
+                return await fallback(request, *args, **kwargs)
+            return json_response(
+                {'detail': f'Method "{request.method}" not allowed.'},
+                status=status.HTTP_405_METHOD_NOT_ALLOWED,
+            )
+        try:
+            result = await authenticator.aauthenticate(request)
+            if result is None:
+                raise NotAuthenticated()
+            request.user, request.auth = result
+            return await view(request, *args, **kwargs)
+        except Http404:
+            return json_response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+        except APIException as exc:
+            headers = {}
+            if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+                headers['WWW-Authenticate'] = authenticator.authenticate_header(request)
+            detail = exc.detail if isinstance(exc.detail, dict) else {'detail': exc.detail}
+            return json_response(detail, status=exc.status_code, headers=headers)
+    return wrapper
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""JWT authentication without a ``users`` SELECT on every request.
+
+``CachedJWTAuthentication`` keeps hydrated users in a small per-process LRU keyed
+by ``(user_id, token iat)``, expired after ``AUTH_USER_CACHE['TTL']`` seconds and
+dropped whenever the User row is saved or deleted or the user's XP changes.
+Each request gets its own copy, so views may mutate ``request.user`` freely.
+
+Viewset actions listed in ``lazy_user_actions`` only need the id from the
+token, so they get a ``LazyUser`` that loads the row (through the same cache)
+only if something reads a field other than ``pk``/``id``. Their ``is_active`` is
+still checked, against a per-user bit cached and dropped like the full users, so a
+deactivated or deleted account loses access to lazy endpoints too.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+class UserCache:
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.keys_by_user = {}
+        self.active = {}
+        self.lock = threading.Lock()
+
+    def get(self, user_id, issued_at):
+        key = (user_id, issued_at)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._remove(key)
+                return None
+            self.entries.move_to_end(key)
+        return copy.copy(entry[1])
+
+    def set(self, user_id, issued_at, user):
+        key = (user_id, issued_at)
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, copy.copy(user))
+            self.entries.move_to_end(key)
+            self.keys_by_user.setdefault(user_id, set()).add(key)
+            while len(self.entries) > self.max_size:
+                self._remove(next(iter(self.entries)))
+
+    def get_active(self, user_id):
+        """The cached ``is_active`` of the user, ``False`` if it does not exist, or ``None``."""
+        with self.lock:
+            entry = self.active.get(user_id)
+            if entry is None or entry[0] < time.monotonic():
+                return None
+            return entry[1]
+
+    def set_active(self, user_id, is_active):
+        with self.lock:
+            self.active.pop(user_id, None)
+            self.active[user_id] = (time.monotonic() + self.ttl, is_active)
+            while len(self.active) > self.max_size:
+                del self.active[next(iter(self.active))]
+
+    def invalidate(self, user_id):
+        with self.lock:
+            for key in self.keys_by_user.pop(user_id, ()):
+                self.entries.pop(key, None)
+            self.active.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.keys_by_user.clear()
+            self.active.clear()
+
+    def _remove(self, key):
+        self.entries.pop(key, None)
+        keys = self.keys_by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.keys_by_user[key[0]]
+
+_user_cache = None
+
+def get_user_cache():
+    global _user_cache
+    if _user_cache is None:
+        config = settings.AUTH_USER_CACHE
+        _user_cache = UserCache(config['MAX_SIZE'], config['TTL'])
+    return _user_cache
+
+def invalidate_user(sender, instance=None, user_id=None, **kwargs):
+    """Receiver for User post_save/post_delete and ``xp_changed``."""
+    get_user_cache().invalidate(str(instance.pk if instance is not None else user_id))
+
+class LazyUser(SimpleLazyObject):
+    """An authenticated user that knows its id and loads the row on first other access."""
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, user_id, load):
+        self.__dict__['_user_id'] = user_id
+        super().__init__(load)
+
+    @property
+    def pk(self):
+        return self.__dict__['_user_id']
+
+    id = pk
+
+    def __bool__(self):
+        return True
+
+def wants_lazy_user(request):
+    view = (getattr(request, 'parser_context', None) or {}).get('view')
+    return getattr(view, 'action', None) in getattr(view, 'lazy_user_actions', ())
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if wants_lazy_user(request):
+            user_field = self.user_model._meta.get_field(api_settings.USER_ID_FIELD)
+            user_id = user_field.to_python(self.get_user_id(validated_token))
+            self.check_active(user_id)
+            return LazyUser(user_id, lambda: self.get_user(validated_token)), validated_token
+        return self.get_user(validated_token), validated_token
+
+    def get_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+    def check_active(self, user_id):
+        cache = get_user_cache()
+        is_active = cache.get_active(str(user_id))
+        if is_active is None:
+            is_active = bool(self.user_model.objects.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).values_list('is_active', flat=True).first())
+            cache.set_active(str(user_id), is_active)
+        if not is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+    def get_user(self, validated_token):
+        cache = get_user_cache()
+        user_id = str(self.get_user_id(validated_token))
+        user = cache.get(user_id, validated_token.get('iat'))
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(user_id, validated_token.get('iat'), user)
+            cache.set_active(user_id, user.is_active)
+        return user
\ No newline at end of file
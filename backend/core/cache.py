@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+def shared_cache():
+    """The cache all worker processes see; the default cache is per process."""
+    return caches[getattr(settings, 'SHARED_CACHE_ALIAS', 'default')]
+
+def check_shared_cache(app_configs=None, **kwargs):
+    """Reject a per-process shared cache when more than one worker process runs."""
+    if getattr(settings, 'WEB_CONCURRENCY', 1) > 1 and isinstance(shared_cache(), LocMemCache):
+        return [checks.Error(
+            'The shared cache is local memory, so the worker processes would not see '
+            "each other's challenge completions and achievement changes.",
+            hint='Use a DatabaseCache (the default) or set SHARED_CACHE_URL.',
+            id='core.E001',
+        )]
+    return []
\ No newline at end of file
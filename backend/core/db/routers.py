@@ -0,0 +1,63 @@
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+# Set once the current request has written, so its later reads see that write
+_pinned = ContextVar('pinned_to_primary', default=False)
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith('replica')]
+
+class PrimaryReplicaRouter:
+    """Send reads to a random ``replica*`` database and writes to ``default``.
+
+    Once a request writes, it stays on the primary until
+    ``ReplicaPinMiddleware`` resets the pin at the end of the request.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == 'django_cache':
+            # DatabaseCache entries: replicas would serve invalidated values
+            return 'default'
+        replicas = replica_aliases()
+        if not replicas or _pinned.get():
+            return 'default'
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label != 'django_cache':
+            _pinned.set(True)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+class ReplicaPinMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _pinned.set(False)
+        try:
+            return self.get_response(request)
+        finally:
+            _pinned.reset(token)
+
+    async def __acall__(self, request):
+        token = _pinned.set(False)
+        try:
+            return await self.get_response(request)
+        finally:
+            _pinned.reset(token)
\ No newline at end of file
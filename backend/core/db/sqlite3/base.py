@@ -0,0 +1,33 @@
+"""SQLite backend that applies tuning pragmas when each connection opens.
+
+Extra ``OPTIONS`` understood on top of Django's sqlite3 backend:
+
+* ``pragmas``: ``{name: value}`` executed as ``PRAGMA name = value``.
+* ``transaction_mode``: ``'IMMEDIATE'`` starts transactions with
+  ``BEGIN IMMEDIATE`` so a writer takes the lock up front, and waits on
+  ``busy_timeout`` instead of failing with "database is locked" when two
+  deferred transactions both try to upgrade.
+"""
+from django.db.backends.sqlite3 import base
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        options = self.settings_dict['OPTIONS']
+        kwargs = super().get_connection_params()
+        kwargs.pop('pragmas', None)
+        kwargs.pop('transaction_mode', None)
+        self.pragmas = options.get('pragmas', {})
+        self.transaction_mode = options.get('transaction_mode')
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        if self.transaction_mode:
+            self.cursor().execute(f'BEGIN {self.transaction_mode}')
+        else:
+            super()._start_transaction_under_autocommit()
\ No newline at end of file
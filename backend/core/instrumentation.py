@@ -0,0 +1,213 @@
+"""Per-request SQL, serializer and view timings, kept as per-route histograms.
+
+``InstrumentationMiddleware`` (core/middleware.py) puts a ``RequestStats`` in a
+context variable for sampled requests and wraps the database connections with
+``record_query`` for the length of the request only. Serializer time is what
+``ORJSONRenderer`` and ``ValuesSerializer`` spend, both decorated with
+``timed_serialize``; DRF's own ``Serializer.data`` counts as view time.
+
+Each finished request is recorded under its URL name from ``urls.py`` in
+log-bucketed histograms (``Histogram``), so percentiles cost no per-sample
+storage. The SELECTs it ran are grouped by shape (the SQL with parameters and
+``IN`` lists folded), and a shape repeated ``N_PLUS_ONE_THRESHOLD`` times is
+reported as a likely N+1. The numbers are per process.
+"""
+import functools
+import logging
+import math
+import re
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# One mutable RequestStats per sampled request, shared with sync_to_async threads
+_stats = ContextVar('request_stats', default=None)
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+
+class RequestStats:
+    __slots__ = ('queries', 'db', 'serialize', 'serializing', 'view_start', 'view', 'shapes')
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.serialize = 0.0
+        self.serializing = False
+        self.view_start = None
+        self.view = None
+        self.shapes = {}
+
+    def repeated_select(self):
+        """``(count, shape)`` of the most repeated SELECT shape."""
+        counts = {}
+        for sql, count in self.shapes.items():
+            if sql.startswith('SELECT'):
+                shape = _IN_LIST.sub('IN (...)', sql)
+                counts[shape] = counts.get(shape, 0) + count
+        return max(((count, shape) for shape, count in counts.items()), default=(0, None))
+
+def current_stats():
+    return _stats.get()
+
+def start_request():
+    stats = RequestStats()
+    return stats, _stats.set(stats)
+
+def end_request(token):
+    _stats.reset(token)
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper, entered on each connection for a sampled request."""
+    stats = _stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db += time.perf_counter() - start
+        stats.queries += 1
+        stats.shapes[sql] = stats.shapes.get(sql, 0) + 1
+
+def timed_serialize(func):
+    """Count time spent in ``func`` as serializer time, less the queries it runs."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        stats = _stats.get()
+        if stats is None or stats.serializing:
+            return func(*args, **kwargs)
+        stats.serializing = True
+        db = stats.db
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stats.serialize += time.perf_counter() - start - (stats.db - db)
+            stats.serializing = False
+    return wrapper
+
+class Histogram:
+    """Counts in buckets growing by ``FACTOR`` from ``LOWEST`` ms; percentiles within ~5%."""
+    LOWEST = 0.01
+    FACTOR = 1.1
+    BUCKETS = 200
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value):
+        if value <= self.LOWEST:
+            index = 0
+        else:
+            index = min(int(math.log(value / self.LOWEST, self.FACTOR)) + 1, self.BUCKETS - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q):
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                # Geometric middle of the bucket, capped at the largest value seen
+                return min(self.LOWEST * self.FACTOR ** (index - 0.5) if index else self.LOWEST, self.max)
+        return self.max
+
+class RouteMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.n_plus_one = 0
+        self.total = Histogram()
+        self.db = Histogram()
+        self.serialize = Histogram()
+        self.view = Histogram()
+
+    def record(self, stats, total_ms, status):
+        self.requests += 1
+        self.errors += status >= 500
+        self.queries += stats.queries
+        self.max_queries = max(self.max_queries, stats.queries)
+        self.total.record(total_ms)
+        self.db.record(stats.db * 1000)
+        self.serialize.record(stats.serialize * 1000)
+        if stats.view is not None:
+            self.view.record(stats.view * 1000)
+
+    def snapshot(self):
+        def ms(value):
+            return None if value is None else round(value, 3)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'p50_ms': ms(self.total.percentile(0.5)),
+            'p95_ms': ms(self.total.percentile(0.95)),
+            'p99_ms': ms(self.total.percentile(0.99)),
+            'max_ms': ms(self.total.max),
+            'view_p95_ms': ms(self.view.percentile(0.95)),
+            'db_p95_ms': ms(self.db.percentile(0.95)),
+            'serialize_p95_ms': ms(self.serialize.percentile(0.95)),
+            'mean_queries': round(self.queries / self.requests, 2),
+            'max_queries': self.max_queries,
+            'n_plus_one': self.n_plus_one,
+        }
+
+class Registry:
+    def __init__(self):
+        self.routes = {}
+        self.reported = set()
+        self.lock = threading.Lock()
+
+    def record(self, route, stats, total_ms, status):
+        count, shape = stats.repeated_select()
+        suspect = count >= settings.INSTRUMENTATION['N_PLUS_ONE_THRESHOLD']
+        with self.lock:
+            metrics = self.routes.get(route)
+            if metrics is None:
+                metrics = self.routes[route] = RouteMetrics()
+            metrics.record(stats, total_ms, status)
+            if suspect:
+                metrics.n_plus_one += 1
+                first = (route, shape) not in self.reported
+                self.reported.add((route, shape))
+        if suspect and first:
+            logger.warning('Possible N+1 on %s: %d x %s', route, count, shape[:500])
+        return suspect
+
+    def snapshot(self):
+        with self.lock:
+            return {route: metrics.snapshot() for route, metrics in sorted(self.routes.items())}
+
+    def reset(self):
+        with self.lock:
+            self.routes.clear()
+            self.reported.clear()
+
+registry = Registry()
+
+def route_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return '<unresolved>'
+    return match.view_name if match.url_name else match.route
+
+def server_timing(stats, total_ms):
+    parts = [f'db;dur={stats.db * 1000:.2f};desc="{stats.queries} queries"']
+    parts.append(f'serialize;dur={stats.serialize * 1000:.2f}')
+    if stats.view is not None:
+        parts.append(f'view;dur={stats.view * 1000:.2f}')
+    parts.append(f'total;dur={total_ms:.2f}')
+    return ', '.join(parts)
\ No newline at end of file
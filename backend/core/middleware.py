@@ -0,0 +1,94 @@
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from . import instrumentation
+
+def _wrap_queries(stack):
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(instrumentation.record_query))
+
+class InstrumentationMiddleware:
+    """Time sampled requests: SQL (count, time, repeated shapes), serializers, view and total.
+
+    Results go to the per-route histograms in ``core.instrumentation.registry``,
+    to a ``Server-Timing`` header when ``INSTRUMENTATION['SERVER_TIMING']`` is set,
+    and to ``X-Query-Count`` when ``QUERY_COUNT_HEADER`` is set, which also
+    samples every request. Put it first in MIDDLEWARE.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        config = settings.INSTRUMENTATION
+        self.count_header = settings.QUERY_COUNT_HEADER
+        if not config['ENABLED'] and not self.count_header:
+            raise MiddlewareNotUsed
+        self.sample_rate = 1.0 if self.count_header else config['SAMPLE_RATE']
+        self.server_timing = config['SERVER_TIMING']
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Django adapts a sync process_view with a thread hop per request
+            self.process_view = self.aprocess_view
+
+    def sampled(self):
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+        stats, token = instrumentation.start_request()
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                _wrap_queries(stack)
+                response = self.get_response(request)
+        finally:
+            instrumentation.end_request(token)
+        return self.finish(request, response, stats, start)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+        stats, token = instrumentation.start_request()
+        start = time.perf_counter()
+        stack = ExitStack()
+        try:
+            # Connections belong to a thread: wrap the ones of the thread that
+            # runs this request's sync_to_async calls
+            await sync_to_async(_wrap_queries)(stack)
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            instrumentation.end_request(token)
+        return self.finish(request, response, stats, start)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        stats = instrumentation.current_stats()
+        if stats is not None:
+            stats.view_start = time.perf_counter()
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        InstrumentationMiddleware.process_view(self, request, view_func, view_args, view_kwargs)
+
+    def finish(self, request, response, stats, start):
+        end = time.perf_counter()
+        if stats.view_start is not None:
+            stats.view = end - stats.view_start
+        total_ms = (end - start) * 1000
+        instrumentation.registry.record(
+            instrumentation.route_name(request), stats, total_ms, response.status_code
+        )
+        if self.server_timing:
+            response['Server-Timing'] = instrumentation.server_timing(stats, total_ms)
+        if self.count_header:
+            response['X-Query-Count'] = str(stats.queries)
+        return response
\ No newline at end of file
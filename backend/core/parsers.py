@@ -0,0 +1,27 @@
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+class ORJSONParser(BaseParser):
+    """Drop-in for DRF's ``JSONParser`` backed by orjson."""
+    media_type = 'application/json'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % exc)
+
+class YAMLParser(BaseParser):
+    """``application/yaml`` bodies; needs PyYAML."""
+    media_type = 'application/yaml'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            import yaml
+        except ImportError:
+            raise ParseError('YAML bodies need PyYAML (pip install pyyaml).')
+        try:
+            return yaml.safe_load(stream.read())
+        except yaml.YAMLError as exc:
+            raise ParseError('YAML parse error - %s' % exc)
\ No newline at end of file
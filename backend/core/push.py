@@ -0,0 +1,184 @@
+"""Per-user server-sent event streams for live updates over ASGI.
+
+Sync code publishes ``(user_id, kind, data)`` from any thread, typically from
+a signal receiver once the change has committed. Each open stream subscribes
+its user on the event loop. An idle stream is one coroutine waiting on an
+``asyncio.Event`` plus a heartbeat timer, so thousands of them hold no thread.
+
+Bursts are coalesced per stream. Events arriving within ``COALESCE_SECONDS``
+of the first one are merged by kind (see ``register_merge``) and written in
+one chunk, so a stream's backlog is at most one payload per kind however
+fast events come in.
+
+``MemoryBroker`` only reaches streams in its own process. Set
+``PUSH['BACKEND']`` to ``core.push.RedisBroker`` to fan out across workers.
+"""
+import asyncio
+import threading
+import time
+
+import orjson
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.module_loading import import_string
+
+from .renderers import ORJSONRenderer
+
+_mergers = {}
+_broker = None
+_broker_lock = threading.Lock()
+
+def register_merge(kind, merge):
+    """Combine two pending payloads of ``kind`` with ``merge(older, newer)``; the default keeps the newer."""
+    _mergers[kind] = merge
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            config = settings.PUSH
+            _broker = import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+        return _broker
+
+class Subscription:
+    """One stream's pending events, owned by the event loop that created it."""
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.pending = {}
+        self.ready = asyncio.Event()
+
+    def deliver(self, kind, data):
+        merge = _mergers.get(kind)
+        previous = self.pending.get(kind)
+        self.pending[kind] = data if previous is None or merge is None else merge(previous, data)
+        self.ready.set()
+
+    async def get(self, timeout, coalesce):
+        """``{kind: data}`` once something arrives and the coalescing window has passed; ``{}`` on timeout."""
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return {}
+        if coalesce:
+            await asyncio.sleep(coalesce)
+        self.ready.clear()
+        pending, self.pending = self.pending, {}
+        return pending
+
+class MemoryBroker:
+    """Delivers to the streams of this process only.
+
+    Publishers append to a per-loop inbox and wake the loop only when the inbox
+    was empty, so a burst from a sync view costs one wakeup, not one per event.
+    """
+
+    def __init__(self):
+        self.subscribers = {}
+        self.inboxes = {}
+        self.lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        subscription = Subscription(user_id)
+        with self.lock:
+            self.subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscriptions = self.subscribers.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self.subscribers[subscription.user_id]
+
+    def has_subscribers(self, user_id):
+        """Whether publishing for ``user_id`` can reach anyone; lets publishers skip building payloads."""
+        return user_id in self.subscribers
+
+    def publish(self, user_id, kind, data):
+        wake = []
+        with self.lock:
+            for subscription in self.subscribers.get(user_id, ()):
+                inbox = self.inboxes.setdefault(subscription.loop, [])
+                if not inbox:
+                    wake.append(subscription.loop)
+                inbox.append((subscription, kind, data))
+        for loop in wake:
+            try:
+                loop.call_soon_threadsafe(self.drain, loop)
+            except RuntimeError:
+                # The loop has closed, and its streams with it
+                with self.lock:
+                    self.inboxes.pop(loop, None)
+
+    def drain(self, loop):
+        with self.lock:
+            inbox = self.inboxes.pop(loop, [])
+        for subscription, kind, data in inbox:
+            subscription.deliver(kind, data)
+
+    def connections(self):
+        with self.lock:
+            return sum(len(subscriptions) for subscriptions in self.subscribers.values())
+
+class RedisBroker(MemoryBroker):
+    """Publishes through one Redis channel that every worker listens to (``pip install redis``)."""
+
+    def __init__(self, url, channel='push'):
+        super().__init__()
+        import redis
+        self.url = url
+        self.channel = channel
+        self.client = redis.Redis.from_url(url)
+        self.listener = None
+
+    def has_subscribers(self, user_id):
+        return True
+
+    def publish(self, user_id, kind, data):
+        self.client.publish(self.channel, ORJSONRenderer().render([user_id, kind, data]))
+
+    def subscribe(self, user_id):
+        if self.listener is None or self.listener.done():
+            self.listener = asyncio.get_running_loop().create_task(self.listen())
+        return super().subscribe(user_id)
+
+    async def listen(self):
+        import redis.asyncio
+        client = redis.asyncio.Redis.from_url(self.url)
+        async with client.pubsub() as pubsub:
+            await pubsub.subscribe(self.channel)
+            async for message in pubsub.listen():
+                if message['type'] == 'message':
+                    user_id, kind, data = orjson.loads(message['data'])
+                    MemoryBroker.publish(self, user_id, kind, data)
+
+def encode(events):
+    renderer = ORJSONRenderer()
+    return b''.join(
+        b'event: %s\ndata: %s\n\n' % (kind.encode(), renderer.render(data)) for kind, data in events.items()
+    )
+
+async def stream(broker, user_id, until):
+    """SSE chunks for ``user_id`` until the ``until`` timestamp, then the client reconnects."""
+    config = settings.PUSH
+    subscription = broker.subscribe(user_id)
+    try:
+        yield b'retry: 3000\n\n'
+        while True:
+            remaining = until - time.time()
+            if remaining <= 0:
+                return
+            events = await subscription.get(min(config['HEARTBEAT_SECONDS'], remaining), config['COALESCE_SECONDS'])
+            yield encode(events) if events else b': ping\n\n'
+    finally:
+        broker.unsubscribe(subscription)
+
+def stream_response(user_id, until):
+    response = StreamingHttpResponse(stream(get_broker(), user_id, until), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Keep proxies such as nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
\ No newline at end of file
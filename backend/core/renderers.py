@@ -0,0 +1,21 @@
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .instrumentation import timed_serialize
+
+# orjson handles the JSON types natively; DRF's encoder covers the rest (Decimal,
+# lazy translations, querysets, ...) and keeps its datetime format ('Z', milliseconds)
+_default = JSONEncoder().default
+
+class ORJSONRenderer(BaseRenderer):
+    """Drop-in for DRF's ``JSONRenderer`` backed by orjson."""
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    @timed_serialize
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
\ No newline at end of file
@@ -0,0 +1,167 @@
+from django.db import models
+from django.utils import timezone
+
+from .instrumentation import timed_serialize
+
+def parse_field_tree(value):
+    """Turn ``"id,title,modules.lessons.title"`` into a nested ``{name: subtree}`` dict."""
+    tree = {}
+    for item in (value or '').split(','):
+        item = item.strip()
+        if not item:
+            continue
+        node = tree
+        for part in item.split('.'):
+            node = node.setdefault(part, {})
+    return tree
+
+class DynamicFieldsMixin:
+    """Serializer mixin accepting ``fields``/``omit`` trees to trim nested output.
+
+    A name mapped to an empty subtree in ``fields`` keeps the whole nested
+    serializer; in ``omit`` it drops the field entirely.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        omit = kwargs.pop('omit', None)
+        super().__init__(*args, **kwargs)
+        if fields:
+            self.restrict_fields(fields)
+        if omit:
+            self.omit_fields(omit)
+
+    def _nested(self, name):
+        field = self.fields[name]
+        child = getattr(field, 'child', field)
+        return child if isinstance(child, DynamicFieldsMixin) else None
+
+    def restrict_fields(self, tree):
+        for name in list(self.fields):
+            if name not in tree:
+                self.fields.pop(name)
+            elif tree[name] and self._nested(name):
+                self._nested(name).restrict_fields(tree[name])
+
+    def omit_fields(self, tree):
+        for name, subtree in tree.items():
+            if name not in self.fields:
+                continue
+            if not subtree:
+                self.fields.pop(name)
+            elif self._nested(name):
+                self._nested(name).omit_fields(subtree)
+
+def _datetime(value):
+    # Same output as DRF's DateTimeField: current timezone, '+00:00' written as 'Z'
+    value = timezone.localtime(value).isoformat() if timezone.is_aware(value) else value.isoformat()
+    return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+def _isoformat(value):
+    return value.isoformat()
+
+_CONVERTERS = {
+    models.DateTimeField: _datetime,
+    models.DateField: _isoformat,
+    models.TimeField: _isoformat,
+    models.DecimalField: str,
+    models.UUIDField: str,
+}
+
+def _converter(field):
+    for field_class, convert in _CONVERTERS.items():
+        if isinstance(field, field_class):
+            return convert
+    return None
+
+class ValuesSerializer:
+    """Read-only stand-in for a ``fields = '__all__'`` ModelSerializer over ``.values()`` rows.
+
+    Output has the ModelSerializer's keys, order and formatting, but rows go
+    straight from the cursor into dicts. Nested serializers are declared in
+    ``related`` as ``{name: (serializer, fk)}``: with ``fk=None`` the row the
+    foreign key ``name`` points to is nested, otherwise the child rows whose
+    ``fk`` points back here are listed in the child's ``ordering``. Takes the
+    same ``fields``/``omit`` trees as ``DynamicFieldsMixin``; one query per level.
+    ``converters`` maps a field name to a function applied to its non-null values.
+    """
+    model = None
+    related = {}
+    converters = {}
+    ordering = ('id',)
+
+    def __init__(self, queryset, fields=None, omit=None):
+        self.queryset = queryset
+        self.field_tree = fields or {}
+        self.omit_tree = omit or {}
+
+    def get_fields(self):
+        """``[(name, column, converter)]`` in ModelSerializer order; ``column`` is None if nested."""
+        meta = self.model._meta
+        concrete = [field for field in meta.concrete_fields if not field.primary_key]
+        fields = [(meta.pk.name, meta.pk.attname, _converter(meta.pk))]
+        fields += [(name, None, None) for name in self.related]
+        fields += [
+            (field.name, field.attname, self.converters.get(field.name) or _converter(field))
+            for field in concrete if not field.is_relation and field.name not in self.related
+        ]
+        fields += [
+            (field.name, field.attname, None)
+            for field in concrete if field.is_relation and field.name not in self.related
+        ]
+        return [
+            (name, column, convert) for name, column, convert in fields
+            if (not self.field_tree or name in self.field_tree)
+            and not (name in self.omit_tree and not self.omit_tree[name])
+        ]
+
+    def nested(self, name, queryset):
+        serializer, fk = self.related[name]
+        return serializer(queryset, fields=self.field_tree.get(name), omit=self.omit_tree.get(name))
+
+    @timed_serialize
+    def serialize(self, extra_columns=()):
+        """``[(row, item)]``: each raw ``.values()`` row with its output dict."""
+        fields = self.get_fields()
+        columns = {'pk', *extra_columns} | {column for _, column, _ in fields if column}
+        columns |= {
+            self.model._meta.get_field(name).attname
+            for name, (_, fk) in self.related.items() if fk is None
+        }
+        rows = list(self.queryset.values(*columns))
+        nested = {}
+        for name, column, _ in fields:
+            if column is not None:
+                continue
+            serializer, fk = self.related[name]
+            if fk is None:
+                attname = self.model._meta.get_field(name).attname
+                ids = {row[attname] for row in rows} - {None}
+                targets = {
+                    row['pk']: item for row, item in
+                    self.nested(name, serializer.model.objects.filter(pk__in=ids)).serialize()
+                } if ids else {}
+                nested[name] = lambda row, attname=attname, targets=targets: targets.get(row[attname])
+            else:
+                attname = serializer.model._meta.get_field(fk).attname
+                children = {}
+                if rows:
+                    queryset = serializer.model.objects.filter(
+                        **{f'{attname}__in': [row['pk'] for row in rows]}
+                    ).order_by(*serializer.ordering)
+                    for row, item in self.nested(name, queryset).serialize((attname,)):
+                        children.setdefault(row[attname], []).append(item)
+                nested[name] = lambda row, children=children: children.get(row['pk'], [])
+        return [
+            (row, {
+                name: nested[name](row) if column is None
+                else convert(row[column]) if convert is not None and row[column] is not None
+                else row[column]
+                for name, column, convert in fields
+            })
+            for row in rows
+        ]
+
+    @property
+    def data(self):
+        return [item for _, item in self.serialize()]
\ No newline at end of file
@@ -33,10 +33,13 @@ INSTALLED_APPS = [
     'corsheaders',
     'learning',
     'gamification',
+    'analytics',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.db.routers.ReplicaPinMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -66,13 +69,118 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'core.wsgi.application'
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Database profile, chosen by DB_ENGINE: 'sqlite' (default) or 'postgres'
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+
+def _postgres_driver_available():
+    for module in ('psycopg', 'psycopg2'):
+        try:
+            __import__(module)
+            return True
+        except ImportError:
+            continue
+    return False
+
+if DB_ENGINE == 'postgres' and not _postgres_driver_available():
+    logging.getLogger(__name__).warning('DB_ENGINE=postgres but no psycopg driver is installed; using SQLite')
+    DB_ENGINE = 'sqlite'
+
+def _postgres(host, port):
+    database = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.getenv('DB_NAME', 'yungstech'),
+        'USER': os.getenv('DB_USER', 'postgres'),
+        'PASSWORD': os.getenv('DB_PASSWORD', ''),
+        'HOST': host,
+        'PORT': port,
+        # Persistent connections; health checks drop ones the server closed
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {},
+    }
+    if os.getenv('DB_POOL', 'False') == 'True':
+        # Django >= 5.1 with psycopg 3 pools natively; CONN_MAX_AGE must then be 0.
+        # On older stacks, put PgBouncer in front and keep persistent connections.
+        import django
+        if django.VERSION >= (5, 1):
+            database['CONN_MAX_AGE'] = 0
+            database['OPTIONS']['pool'] = {
+                'min_size': int(os.getenv('DB_POOL_MIN', 2)),
+                'max_size': int(os.getenv('DB_POOL_MAX', 20)),
+            }
+        else:
+            logging.getLogger(__name__).warning(
+                'DB_POOL=True needs Django >= 5.1 (this is %s); using persistent connections',
+                django.get_version(),
+            )
+    return database
+
+if DB_ENGINE == 'postgres':
+    DATABASES = {'default': _postgres(os.getenv('DB_HOST', 'localhost'), os.getenv('DB_PORT', '5432'))}
+    for index, host in enumerate(filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(','))):
+        DATABASES[f'replica{index}'] = {
+            **_postgres(host.strip(), os.getenv('DB_PORT', '5432')),
+            'TEST': {'MIRROR': 'default'},
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'core.db.sqlite3',
+            'NAME': os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                'timeout': 20,  # seconds to wait for the write lock
+                # Writers take the lock up front and wait for it instead of failing with
+                # "database is locked"; neither changes the database file
+                'transaction_mode': 'IMMEDIATE',
+                'pragmas': {'busy_timeout': 20000},
+            },
+        }
     }
+    # WAL only by default for a database outside the repo: it would rewrite the
+    # db.sqlite3 checked in here on the first connection and leave -wal/-shm files beside it
+    if os.getenv('SQLITE_TUNING', str('SQLITE_PATH' in os.environ)) == 'True':
+        DATABASES['default']['OPTIONS']['pragmas'].update({
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+        })
+
+DATABASE_ROUTERS = ['core.db.routers.PrimaryReplicaRouter']
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Pre-rendered learning catalog; point CATALOG_CACHE_URL at Redis to share it between workers
+    'catalog': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'catalog',
+        'TIMEOUT': None,
+    } if not os.getenv('CATALOG_CACHE_URL') else {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('CATALOG_CACHE_URL'),
+        'TIMEOUT': None,
+    },
+    # State every worker must agree on (feed completions, achievement rules and counters).
+    # A database table by default (created by migrate), so it is shared out of the box;
+    # point SHARED_CACHE_URL at Redis to take those reads off the database
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'shared_cache',
+        'OPTIONS': {'MAX_ENTRIES': int(os.getenv('SHARED_CACHE_MAX_ENTRIES', 100000))},
+    } if not os.getenv('SHARED_CACHE_URL') else {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('SHARED_CACHE_URL'),
+    },
 }
 
+CATALOG_CACHE_ALIAS = 'catalog'
+SHARED_CACHE_ALIAS = 'shared'
+
+# Worker processes serving the app (gunicorn and uvicorn read WEB_CONCURRENCY too);
+# `manage.py check` rejects per-process caches for shared state when it is above 1
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', 1))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -88,6 +196,27 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# New hashes use PASSWORD_HASHER (argon2 needs argon2-cffi); the others still verify
+# old hashes, which are upgraded to the preferred hasher on the next login
+_PASSWORD_HASHERS = {
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', 'scrypt')
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    hasher for name, hasher in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+
+# Bounded thread pool for password hashing; see users/hashing.py
+PASSWORD_HASHING = {
+    'WORKERS': int(os.getenv('PASSWORD_HASHING_WORKERS', max((os.cpu_count() or 2) // 2, 1))),
+    'MAX_PENDING': int(os.getenv('PASSWORD_HASHING_MAX_PENDING', 32)),
+    'QUEUE_TIMEOUT': float(os.getenv('PASSWORD_HASHING_QUEUE_TIMEOUT', 2)),
+}
+
+AUTHENTICATION_BACKENDS = ['users.backends.HashingModelBackend']
+
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
 USE_I18N = True
@@ -103,14 +232,91 @@ AUTH_USER_MODEL = 'users.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'EXCEPTION_HANDLER': 'rest_framework.views.exception_handler',
 }
 
+# Default ?page_size= for the cursor-paginated list endpoints (core/pagination.py)
+API_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', 100))
+
+# Rows fetched per round trip by the streaming exports (analytics/export.py)
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 2000))
+
+# Seconds to cache each user's /api/dashboard/ body; 0 disables (analytics/dashboard.py)
+DASHBOARD_CACHE_TTL = int(os.getenv('DASHBOARD_CACHE_TTL', 30))
+
+# Days of full-resolution study history before compact_activity folds it (learning/activity.py):
+# raw events are dropped, then day rollups become weeks and week rollups become months
+ACTIVITY_RETENTION = {
+    'EVENTS': int(os.getenv('ACTIVITY_EVENT_RETENTION_DAYS', 30)),
+    'DAYS': int(os.getenv('ACTIVITY_DAY_RETENTION_DAYS', 180)),
+    'WEEKS': int(os.getenv('ACTIVITY_WEEK_RETENTION_DAYS', 730)),
+}
+
+# Per-process LRU of authenticated users keyed by (user_id, token iat)
+AUTH_USER_CACHE = {
+    'MAX_SIZE': int(os.getenv('AUTH_USER_CACHE_SIZE', 10000)),
+    'TTL': int(os.getenv('AUTH_USER_CACHE_TTL', 60)),
+}
+
+# Count SQL queries per request and return them in an X-Query-Count header
+QUERY_COUNT_HEADER = os.getenv('QUERY_COUNT_HEADER', str(DEBUG)) == 'True'
+
+# Per-request timings (core/instrumentation.py) for a SAMPLE_RATE fraction of requests,
+# served per route at /api/analytics/metrics/ and, with SERVER_TIMING, in a Server-Timing
+# header on the sampled responses
+INSTRUMENTATION = {
+    'ENABLED': os.getenv('INSTRUMENTATION', 'True') == 'True',
+    'SAMPLE_RATE': float(os.getenv('INSTRUMENTATION_SAMPLE_RATE', 0.1)),
+    'SERVER_TIMING': os.getenv('SERVER_TIMING', 'False') == 'True',
+    # Log a request whose most repeated SELECT shape ran at least this many times
+    'N_PLUS_ONE_THRESHOLD': int(os.getenv('N_PLUS_ONE_THRESHOLD', 5)),
+}
+
+# Live update streams at /api/gamification/events/ (core/push.py, ASGI only). The memory
+# broker reaches streams in the same process; with PUSH_REDIS_URL (pip install redis)
+# events go through Redis to every worker.
+PUSH = {
+    'BACKEND': 'core.push.RedisBroker' if os.getenv('PUSH_REDIS_URL') else 'core.push.MemoryBroker',
+    'OPTIONS': {'url': os.getenv('PUSH_REDIS_URL')} if os.getenv('PUSH_REDIS_URL') else {},
+    # Events for one stream within this window are merged into one write
+    'COALESCE_SECONDS': float(os.getenv('PUSH_COALESCE_SECONDS', 0.25)),
+    'HEARTBEAT_SECONDS': float(os.getenv('PUSH_HEARTBEAT_SECONDS', 20)),
+}
+
+# Buffer lesson completions and streak check-ins in-process and flush them in batches.
+# DURABILITY 'memory' can lose up to MAX_DELAY seconds of writes on a crash; 'journal'
+# fsyncs each event to JOURNAL_DIR before answering and replays it on restart.
+WRITE_BEHIND = {
+    'ENABLED': os.getenv('WRITE_BEHIND', 'False') == 'True',
+    'MAX_BATCH': int(os.getenv('WRITE_BEHIND_MAX_BATCH', 500)),
+    'MAX_DELAY': float(os.getenv('WRITE_BEHIND_MAX_DELAY', 1.0)),  # seconds
+    'DURABILITY': os.getenv('WRITE_BEHIND_DURABILITY', 'memory'),
+    'JOURNAL_DIR': os.getenv('WRITE_BEHIND_JOURNAL_DIR', str(BASE_DIR / 'write_behind')),
+}
+
+# users.level is recomputed from xp on every award: level = xp // XP_PER_LEVEL + 1
+XP_PER_LEVEL = int(os.getenv('XP_PER_LEVEL', 100))
+
+# How often each worker re-reads recent XP activity into its in-memory leaderboards
+LEADERBOARD_SYNC_SECONDS = int(os.getenv('LEADERBOARD_SYNC_SECONDS', 5))
+
+# Route the hot read endpoints to native async views (core/asgi.py turns this on)
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False') == 'True'
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
@@ -138,6 +344,9 @@ CORS_ALLOW_METHODS = [
     'PUT',
 ]
 
+# The frontend follows the next page of list endpoints from the Link header
+CORS_EXPOSE_HEADERS = ['link']
+
 CORS_ALLOW_HEADERS = [
     'accept',
     'accept-encoding',
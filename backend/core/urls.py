@@ -2,10 +2,13 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from analytics.views import DashboardViewSet
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/users/', include('users.urls')),
     path('api/learning/', include('learning.urls')),
     path('api/gamification/', include('gamification.urls')),
+    path('api/analytics/', include('analytics.urls')),
+    path('api/dashboard/', DashboardViewSet.as_view({'get': 'summary'}), name='dashboard'),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""Optional in-process write-behind buffer for bursty write endpoints.
+
+Views enqueue events under a dedup key and answer from the buffered state;
+a background thread hands each kind's pending events to its registered flush
+function when ``MAX_BATCH`` events are waiting or ``MAX_DELAY`` seconds have
+passed. With ``DURABILITY = 'journal'`` every event is appended (and fsynced)
+to a local journal before the request returns, and journals left behind by a
+crashed worker are replayed on the next start.
+
+A flush can still overlap another one (a replay, another worker) or follow
+one that committed but died before dropping its journal, so flush functions
+must claim their events in the database and skip those already applied.
+"""
+import atexit
+import glob
+import json
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+_flushers = {}
+_buffer = None
+_buffer_lock = threading.Lock()
+
+def register(kind, flush):
+    """Register ``flush(events)`` to persist the buffered events of ``kind``."""
+    _flushers[kind] = flush
+
+def get_buffer():
+    """Return the process-wide buffer, or ``None`` when write-behind is disabled."""
+    global _buffer
+    config = getattr(settings, 'WRITE_BEHIND', {})
+    if not config.get('ENABLED'):
+        return None
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = WriteBehindBuffer(
+                max_batch=config.get('MAX_BATCH', 500),
+                max_delay=config.get('MAX_DELAY', 1.0),
+                journal_dir=config.get('JOURNAL_DIR') if config.get('DURABILITY') == 'journal' else None,
+            )
+            atexit.register(_buffer.drain)
+        return _buffer
+
+class WriteBehindBuffer:
+    def __init__(self, max_batch=500, max_delay=1.0, journal_dir=None):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.journal_dir = journal_dir
+        self.pending = {}
+        self.size = 0
+        self.lock = threading.RLock()
+        self.flush_lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.journal = None
+        if journal_dir:
+            os.makedirs(journal_dir, exist_ok=True)
+            self.journal_path = os.path.join(journal_dir, f'write_behind.{os.getpid()}.journal')
+            self.replay()
+            self.journal = open(self.journal_path, 'a', encoding='utf-8')
+        self.thread = threading.Thread(target=self.run, name='write-behind', daemon=True)
+        self.thread.start()
+
+    def get(self, kind, key):
+        with self.lock:
+            return self.pending.get(kind, {}).get(key)
+
+    def put(self, kind, key, event, replace=True):
+        """Buffer ``event`` under a string ``key``; returns ``False`` if it was pending and ``replace`` is off."""
+        with self.lock:
+            events = self.pending.setdefault(kind, {})
+            if key in events and not replace:
+                return False
+            if key not in events:
+                self.size += 1
+            events[key] = event
+            self.write_journal([(kind, key, event)])
+            if self.size >= self.max_batch:
+                self.wakeup.set()
+            return True
+
+    def write_journal(self, entries):
+        if not self.journal:
+            return
+        for entry in entries:
+            self.journal.write(json.dumps(entry) + '\n')
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+
+    def update(self, kind, key, func, initial):
+        """Atomically replace the pending event with ``func(pending or initial)`` and return it."""
+        with self.lock:
+            event = func(self.get(kind, key) or initial)
+            self.put(kind, key, event)
+            return event
+
+    def run(self):
+        while True:
+            self.wakeup.wait(self.max_delay)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Write-behind flush failed; events stay buffered')
+            finally:
+                close_old_connections()
+
+    def flush(self):
+        with self.flush_lock:
+            with self.lock:
+                if not self.size:
+                    return
+                batch, self.pending, self.size = self.pending, {}, 0
+                flushing = self.rotate_journal()
+            flushed = set()
+            try:
+                for kind, events in batch.items():
+                    _flushers[kind](list(events.values()))
+                    flushed.add(kind)
+            except Exception:
+                with self.lock:
+                    restored = []
+                    for kind, events in batch.items():
+                        # Those kinds are committed; buffering them again would apply them twice
+                        if kind in flushed:
+                            continue
+                        for key, event in events.items():
+                            if key not in self.pending.setdefault(kind, {}):
+                                self.pending[kind][key] = event
+                                restored.append((kind, key, event))
+                    self.size = sum(len(events) for events in self.pending.values())
+                    self.write_journal(restored)
+                if flushing:
+                    os.remove(flushing)
+                raise
+            if flushing:
+                os.remove(flushing)
+
+    def drain(self):
+        """Flush everything still buffered; registered to run at interpreter shutdown."""
+        try:
+            self.flush()
+        finally:
+            close_old_connections()
+
+    def rotate_journal(self):
+        if not self.journal:
+            return None
+        self.journal.close()
+        flushing = self.journal_path + '.flushing'
+        os.replace(self.journal_path, flushing)
+        self.journal = open(self.journal_path, 'a', encoding='utf-8')
+        return flushing
+
+    def replay(self):
+        """Claim journals left by dead workers (atomic rename) and flush their events.
+
+        Must run before this process opens its own journal.
+        """
+        for path in glob.glob(os.path.join(self.journal_dir, 'write_behind.*.journal*')):
+            if _owner_alive(path):
+                continue
+            claimed = f'{path.split(".journal")[0]}.journal.replay.{os.getpid()}'
+            try:
+                os.replace(path, claimed)
+            except FileNotFoundError:
+                continue
+            events = {}
+            with open(claimed, encoding='utf-8') as journal:
+                for line in journal:
+                    if line.strip():
+                        kind, key, event = json.loads(line)
+                        events.setdefault(kind, {})[key] = event
+            for kind, kind_events in events.items():
+                _flushers[kind](list(kind_events.values()))
+            os.remove(claimed)
+
+def _owner_alive(path):
+    # write_behind.<pid>.journal[.flushing] or write_behind.<pid>.journal.replay.<pid>
+    name = os.path.basename(path)
+    pid = name.rsplit('.', 1)[1] if '.replay.' in name else name.split('.')[1]
+    try:
+        pid = int(pid)
+        # Replay runs before this process opens its journal, so a file under our
+        # own pid was left by an earlier process (containers often reuse PID 1)
+        if pid == os.getpid():
+            return False
+        os.kill(pid, 0)
+    except (ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
\ No newline at end of file
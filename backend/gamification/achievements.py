@@ -0,0 +1,235 @@
+"""Achievement rule engine.
+
+``Achievement.criteria`` documents are compiled once into predicates over a
+user's counters. The criteria grammar is::
+
+    {"metric": "lessons_completed", "gte": 10}
+    {"all": [<criteria>, ...]}
+    {"any": [<criteria>, ...]}
+
+with comparisons ``gte``, ``gt``, ``lte``, ``lt`` and ``eq``. Rules are
+indexed by the events that can change their metrics, so a lesson completion
+only evaluates lesson-based rules.
+
+The rules version and the counters live in the shared cache, so every worker
+recompiles after an edit and sees counters as of the last event. Counters are
+cached per event, and each event drops its own before the rules run.
+"""
+import logging
+import operator
+import threading
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Sum
+
+from core.cache import shared_cache
+from users.models import User
+from .ledger import award_xp_batch
+from .models import Achievement, Streak, UserAchievement, XPEvent
+from .signals import achievement_unlocked, send_on_commit
+
+logger = logging.getLogger(__name__)
+
+# metric -> event that can change it
+METRICS = {
+    'lessons_completed': 'lesson_completed',
+    'xp': 'xp_changed',
+    'level': 'xp_changed',
+    'challenges_completed': 'xp_changed',
+    'streak_current': 'streak_updated',
+    'streak_longest': 'streak_updated',
+}
+
+COMPARISONS = {
+    'gte': operator.ge,
+    'gt': operator.gt,
+    'lte': operator.le,
+    'lt': operator.lt,
+    'eq': operator.eq,
+}
+
+RULES_VERSION_KEY = 'achievements:rules_version'
+COUNTERS_TTL = 300
+
+class InvalidCriteria(ValueError):
+    pass
+
+def compile_criteria(criteria):
+    """Return ``(predicate, metrics)`` for a criteria document."""
+    if not isinstance(criteria, dict):
+        raise InvalidCriteria('Criteria must be an object.')
+    for combinator, combine in (('all', all), ('any', any)):
+        if combinator in criteria:
+            if not isinstance(criteria[combinator], list) or not criteria[combinator]:
+                raise InvalidCriteria(f'"{combinator}" must be a non-empty list.')
+            parts = [compile_criteria(part) for part in criteria[combinator]]
+            predicates = [predicate for predicate, _ in parts]
+            metrics = set().union(*(part_metrics for _, part_metrics in parts))
+            return (lambda counters: combine(p(counters) for p in predicates)), metrics
+
+    metric = criteria.get('metric')
+    if metric not in METRICS:
+        raise InvalidCriteria(f'Unknown metric {metric!r}.')
+    comparisons = [name for name in COMPARISONS if name in criteria]
+    target = criteria[comparisons[0]] if len(comparisons) == 1 else None
+    # bool is an int subclass, so {"gte": true} would otherwise pass as 1
+    if not isinstance(target, (int, float)) or isinstance(target, bool):
+        raise InvalidCriteria(f'Give exactly one numeric comparison out of {", ".join(COMPARISONS)}.')
+    compare = COMPARISONS[comparisons[0]]
+    return (lambda counters: compare(counters.get(metric, 0), target)), {metric}
+
+class Rule:
+    def __init__(self, achievement, predicate, metrics):
+        self.achievement_id = achievement.pk
+        self.xp_reward = achievement.xp_reward
+        self.predicate = predicate
+        self.metrics = metrics
+        self.events = {METRICS[metric] for metric in metrics}
+
+class RuleSet:
+    def __init__(self, version):
+        self.version = version
+        self.rules = []
+        self.by_event = {}
+        for achievement in Achievement.objects.only('id', 'criteria', 'xp_reward'):
+            try:
+                rule = Rule(achievement, *compile_criteria(achievement.criteria))
+            except InvalidCriteria as exc:
+                logger.warning('Skipping achievement %s: %s', achievement.pk, exc)
+                continue
+            self.rules.append(rule)
+            for event in rule.events:
+                self.by_event.setdefault(event, []).append(rule)
+
+_rules = None
+_rules_lock = threading.Lock()
+
+def get_rules():
+    """Compiled rules, recompiled whenever an Achievement is saved or deleted."""
+    global _rules
+    version = shared_cache().get_or_set(RULES_VERSION_KEY, 1, timeout=None)
+    with _rules_lock:
+        if _rules is None or _rules.version != version:
+            _rules = RuleSet(version)
+        return _rules
+
+def invalidate_rules(**kwargs):
+    shared = shared_cache()
+    try:
+        shared.incr(RULES_VERSION_KEY)
+    except ValueError:
+        shared.set(RULES_VERSION_KEY, 2, timeout=None)
+
+def load_counters(user_ids, metrics):
+    """``{user_id: {metric: value}}`` for ``metrics``, one query per metric source."""
+    counters = {user_id: {} for user_id in user_ids}
+    if metrics & {'xp', 'level'}:
+        for user_id, xp, level in User.objects.filter(id__in=user_ids).values_list('id', 'xp', 'level'):
+            counters[user_id].update(xp=xp, level=level)
+    if 'lessons_completed' in metrics:
+        from learning.models import PathProgress
+        rows = PathProgress.objects.filter(user_id__in=user_ids).values('user_id').annotate(
+            total=Sum('completed_count')
+        ).values_list('user_id', 'total')
+        for user_id, total in rows:
+            counters[user_id]['lessons_completed'] = total
+    if metrics & {'streak_current', 'streak_longest'}:
+        rows = Streak.objects.filter(user_id__in=user_ids).values_list('user_id', 'current', 'longest')
+        for user_id, current, longest in rows:
+            counters[user_id].update(streak_current=current, streak_longest=longest)
+    if 'challenges_completed' in metrics:
+        rows = XPEvent.objects.filter(user_id__in=user_ids, source='challenge').values('user_id').annotate(
+            total=Count('id')
+        ).values_list('user_id', 'total')
+        for user_id, total in rows:
+            counters[user_id]['challenges_completed'] = total
+    for values in counters.values():
+        for metric in metrics:
+            values.setdefault(metric, 0)
+    return counters
+
+def counters_key(user_id, event):
+    return f'achievements:counters:{user_id}:{event}'
+
+def invalidate_counters(user_id, event):
+    """Drop the user's counters that ``event`` may have changed."""
+    shared_cache().delete(counters_key(user_id, event))
+
+def cached_counters(user_id, metrics):
+    """The user's counters, loading only those missing from the shared cache."""
+    shared = shared_cache()
+    counters = {}
+    for values in shared.get_many([counters_key(user_id, METRICS[metric]) for metric in metrics]).values():
+        counters.update(values)
+    missing = set(metrics) - set(counters)
+    if missing:
+        counters.update(load_counters([user_id], missing)[user_id])
+        by_event = {}
+        for metric, value in counters.items():
+            by_event.setdefault(counters_key(user_id, METRICS[metric]), {})[metric] = value
+        shared.set_many(by_event, COUNTERS_TTL)
+    return counters
+
+def unlock(unlocks, rules):
+    """Insert ``(user_id, rule)`` unlocks and award their XP in one transaction.
+
+    Returns the unlocks this transaction inserted; only those get XP and an
+    ``achievement_unlocked`` signal.
+    """
+    if not unlocks:
+        return []
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                UserAchievement.objects.bulk_create([
+                    UserAchievement(user_id=user_id, achievement_id=rule.achievement_id)
+                    for user_id, rule in unlocks
+                ])
+        except IntegrityError:
+            # A concurrent evaluation unlocked some of them first: insert one
+            # at a time and keep the ones that win
+            inserted = []
+            for user_id, rule in unlocks:
+                try:
+                    with transaction.atomic():
+                        UserAchievement.objects.create(user_id=user_id, achievement_id=rule.achievement_id)
+                except IntegrityError:
+                    continue
+                inserted.append((user_id, rule))
+            unlocks = inserted
+        award_xp_batch([
+            (user_id, rule.xp_reward, 'achievement', f'achievement:{rule.achievement_id}:user:{user_id}')
+            for user_id, rule in unlocks if rule.xp_reward
+        ])
+        by_user = {}
+        for user_id, rule in unlocks:
+            by_user.setdefault(user_id, []).append(rule.achievement_id)
+        for user_id, achievement_ids in by_user.items():
+            send_on_commit(achievement_unlocked, user_id=user_id, achievement_ids=achievement_ids)
+    return unlocks
+
+def evaluate(user_id, event):
+    """Evaluate the rules ``event`` can affect for one user; returns new achievement ids."""
+    invalidate_counters(user_id, event)
+    rules = get_rules()
+    candidates = rules.by_event.get(event, [])
+    if not candidates:
+        return []
+    unlocked = set(UserAchievement.objects.filter(
+        user_id=user_id, achievement_id__in=[rule.achievement_id for rule in candidates]
+    ).values_list('achievement_id', flat=True))
+    candidates = [rule for rule in candidates if rule.achievement_id not in unlocked]
+    if not candidates:
+        return []
+    counters = cached_counters(user_id, set().union(*(rule.metrics for rule in candidates)))
+    unlocks = [(user_id, rule) for rule in candidates if rule.predicate(counters)]
+    return [rule.achievement_id for _, rule in unlock(unlocks, rules)]
+
+def on_lesson_completed(sender, user_id, **kwargs):
+    evaluate(user_id, 'lesson_completed')
+
+def on_xp_changed(sender, user_id, **kwargs):
+    evaluate(user_id, 'xp_changed')
+
+def on_streak_updated(sender, user_id, **kwargs):
+    evaluate(user_id, 'streak_updated')
\ No newline at end of file
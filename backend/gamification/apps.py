@@ -2,4 +2,30 @@ from django.apps import AppConfig
 
 class GamificationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'gamification'
\ No newline at end of file
+    name = 'gamification'
+
+    def ready(self):
+        from django.core import checks
+        from django.db.models.signals import post_delete, post_save
+        from core import writebehind
+        from core.authentication import invalidate_user
+        from core.cache import check_shared_cache
+        from . import achievements, feed, leaderboard, push
+        from .models import Achievement, DailyChallenge
+        from .signals import achievement_unlocked, lesson_completed, streak_updated, xp_changed
+        from .streaks import flush_check_ins
+        writebehind.register('streak_check_in', flush_check_ins)
+        checks.register(check_shared_cache, checks.Tags.caches)
+        xp_changed.connect(leaderboard.on_xp_changed)
+        xp_changed.connect(achievements.on_xp_changed)
+        xp_changed.connect(invalidate_user)
+        lesson_completed.connect(achievements.on_lesson_completed)
+        streak_updated.connect(achievements.on_streak_updated)
+        xp_changed.connect(push.on_xp_changed)
+        streak_updated.connect(push.on_streak_updated)
+        lesson_completed.connect(push.on_lesson_completed)
+        achievement_unlocked.connect(push.on_achievement_unlocked)
+        post_save.connect(achievements.invalidate_rules, sender=Achievement)
+        post_delete.connect(achievements.invalidate_rules, sender=Achievement)
+        post_save.connect(feed.invalidate_feed, sender=DailyChallenge)
+        post_delete.connect(feed.invalidate_feed, sender=DailyChallenge)
\ No newline at end of file
@@ -0,0 +1,37 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from core.async_api import async_api_view, json_response
+from core.pagination import CursorPage, next_link, page_size
+from core.push import stream_response
+from core.serializers import parse_field_tree
+from .feed import arender_feed, project_feed
+from .models import UserAchievement
+from .serializers import UserAchievementValuesSerializer
+
+@async_api_view
+async def daily_challenges(request):
+    fields = parse_field_tree(request.GET.get('fields'))
+    if fields:
+        data, headers = await sync_to_async(project_feed)(request, fields)
+        return json_response(data, headers=headers)
+    size = page_size(request.GET)
+    body, cursor = await arender_feed(request.user.pk, request.GET.get('cursor'), size)
+    response = HttpResponse(body, content_type='application/json')
+    if cursor:
+        response['Link'] = next_link(request, cursor, size)
+    return response
+
+@async_api_view
+async def user_achievements(request):
+    page = CursorPage(request, UserAchievement.objects.filter(user_id=request.user.pk), ('id',))
+    serializer = UserAchievementValuesSerializer(page.queryset, fields=parse_field_tree(request.GET.get('fields')))
+    data = await sync_to_async(page.serialize)(serializer)
+    return json_response(data, headers=page.headers())
+
+@async_api_view
+async def events(request):
+    """Server-sent ``xp``, ``streak``, ``lessons`` and ``achievements`` events for the user.
+
+    The stream ends when the access token expires; the client reconnects with a fresh one.
+    """
+    return stream_response(request.user.pk, request.auth['exp'])
\ No newline at end of file
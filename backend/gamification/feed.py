@@ -0,0 +1,157 @@
+"""Cached active daily-challenge feed.
+
+The active set only changes when a challenge expires or a DailyChallenge is
+written. So it is computed once per minute bucket, or up to the next
+``available_until`` if that comes sooner, and stored as one pre-rendered JSON
+fragment per challenge. Per-user completion state is a bitmap over the feed
+positions, and is spliced into the fragments without re-encoding them.
+
+The feed version and the bitmaps live in the shared cache, so a write in one
+worker is seen by all of them; the fragments are rebuilt per process. A
+completion drops the user's bitmap, which the next read rebuilds from the
+ledger.
+"""
+import bisect
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from core.cache import shared_cache
+from core.pagination import CursorPage, decode_cursor, encode_cursor
+from core.renderers import ORJSONRenderer
+
+from .models import DailyChallenge, XPEvent
+from .serializers import DailyChallengeValuesSerializer
+
+FEED_VERSION_KEY = 'challenges:feed_version'
+BUCKET_SECONDS = 60
+FEED_ORDERING = ('available_until', 'id')
+
+def invalidate_feed(**kwargs):
+    shared = shared_cache()
+    try:
+        shared.incr(FEED_VERSION_KEY)
+    except ValueError:
+        shared.set(FEED_VERSION_KEY, 2, timeout=None)
+
+def active_feed(now=None):
+    """The cached feed entry: ``{'ids', 'keys', 'items', 'expires_at'}`` for the current bucket."""
+    now = now or timezone.now()
+    timestamp = now.timestamp()
+    bucket = int(timestamp) // BUCKET_SECONDS
+    key = f"challenges:feed:{shared_cache().get_or_set(FEED_VERSION_KEY, 1, timeout=None)}:{bucket}"
+    entry = cache.get(key)
+    if entry is None or entry['expires_at'] < timestamp:
+        challenges = DailyChallengeValuesSerializer(
+            DailyChallenge.objects.filter(available_until__gte=now).order_by(*FEED_ORDERING)
+        ).serialize()
+        renderer = ORJSONRenderer()
+        expires_at = (bucket + 1) * BUCKET_SECONDS
+        if challenges:
+            expires_at = min(expires_at, challenges[0][0]['available_until'].timestamp())
+        entry = {
+            'ids': tuple(row['pk'] for row, _ in challenges),
+            'keys': [(row['available_until'], row['pk']) for row, _ in challenges],
+            'items': [renderer.render(item) for _, item in challenges],
+            'expires_at': expires_at,
+        }
+        cache.set(key, entry, timeout=max(int(expires_at - timestamp) + 1, 1))
+    return entry
+
+async def aactive_feed():
+    now = timezone.now()
+    timestamp = now.timestamp()
+    version = await shared_cache().aget(FEED_VERSION_KEY)
+    if version is not None:
+        entry = await cache.aget(f'challenges:feed:{version}:{int(timestamp) // BUCKET_SECONDS}')
+        if entry is not None and entry['expires_at'] >= timestamp:
+            return entry
+    return await sync_to_async(active_feed)(now)
+
+def _completion_key(user_id, challenge_id):
+    return f'challenge:{challenge_id}:user:{user_id}'
+
+def _completion_bits(keys, done):
+    bits = 0
+    for position, completion_key in enumerate(keys):
+        if completion_key in done:
+            bits |= 1 << position
+    return bits
+
+def completed_challenges(user_id, challenge_ids):
+    keys = {_completion_key(user_id, challenge_id): challenge_id for challenge_id in challenge_ids}
+    return {
+        keys[completion_key] for completion_key in
+        XPEvent.objects.filter(idempotency_key__in=keys).values_list('idempotency_key', flat=True)
+    }
+
+def completed_bits(user_id, entry):
+    """Bitmap of feed positions the user has completed, cached alongside the feed ids."""
+    key = f'challenges:done:{user_id}'
+    cached = shared_cache().get(key)
+    if cached is not None and cached[0] == entry['ids']:
+        return cached[1]
+    keys = [_completion_key(user_id, challenge_id) for challenge_id in entry['ids']]
+    done = set(XPEvent.objects.filter(idempotency_key__in=keys).values_list('idempotency_key', flat=True))
+    bits = _completion_bits(keys, done)
+    shared_cache().set(key, (entry['ids'], bits), timeout=BUCKET_SECONDS * 60)
+    return bits
+
+async def acompleted_bits(user_id, entry):
+    key = f'challenges:done:{user_id}'
+    cached = await shared_cache().aget(key)
+    if cached is not None and cached[0] == entry['ids']:
+        return cached[1]
+    keys = [_completion_key(user_id, challenge_id) for challenge_id in entry['ids']]
+    done = {
+        completion_key async for completion_key in
+        XPEvent.objects.filter(idempotency_key__in=keys).values_list('idempotency_key', flat=True)
+    }
+    bits = _completion_bits(keys, done)
+    await shared_cache().aset(key, (entry['ids'], bits), timeout=BUCKET_SECONDS * 60)
+    return bits
+
+def mark_completed(user_id):
+    """Drop the user's bitmap once the completion's XP event is committed."""
+    transaction.on_commit(lambda: shared_cache().delete(f'challenges:done:{user_id}'))
+
+def _page(entry, cursor, size):
+    """Slice bounds for the page after ``cursor``, and the cursor of the page after it."""
+    start = 0
+    if cursor:
+        start = bisect.bisect_right(entry['keys'], tuple(decode_cursor(cursor, DailyChallenge, FEED_ORDERING)))
+    stop = min(start + size, len(entry['items']))
+    next_cursor = encode_cursor(list(entry['keys'][stop - 1])) if stop < len(entry['items']) else None
+    return start, stop, next_cursor
+
+def _splice(entry, bits, start, stop):
+    items = [
+        item[:-1] + (b',"completed":true}' if bits >> position & 1 else b',"completed":false}')
+        for position, item in enumerate(entry['items'][start:stop], start)
+    ]
+    return b'[' + b','.join(items) + b']'
+
+def render_feed(user_id, cursor=None, size=None):
+    """``(body, next_cursor)``: JSON bytes of one feed page with a ``completed`` flag per challenge."""
+    entry = active_feed()
+    start, stop, next_cursor = _page(entry, cursor, size or len(entry['items']))
+    return _splice(entry, completed_bits(user_id, entry), start, stop), next_cursor
+
+async def arender_feed(user_id, cursor=None, size=None):
+    entry = await aactive_feed()
+    start, stop, next_cursor = _page(entry, cursor, size or len(entry['items']))
+    return _splice(entry, await acompleted_bits(user_id, entry), start, stop), next_cursor
+
+def project_feed(request, fields):
+    """``(data, headers)`` for ``?fields=``: a page of the active challenges without the
+    pre-rendered fragments, with ``completed`` added when it is requested."""
+    page = CursorPage(
+        request, DailyChallenge.objects.filter(available_until__gte=timezone.now()), FEED_ORDERING
+    )
+    data = page.serialize(DailyChallengeValuesSerializer(page.queryset, fields=fields))
+    if 'completed' in fields:
+        done = completed_challenges(request.user.pk, [row['pk'] for row in page.rows])
+        for row, item in zip(page.rows, data):
+            item['completed'] = row['pk'] in done
+    return data, page.headers()
\ No newline at end of file
@@ -0,0 +1,138 @@
+"""In-memory global, weekly and per-learning-path leaderboards.
+
+Boards are built from the database on first use in each process. They are
+kept current by the ``xp_changed`` hook for local awards, and by a periodic
+sync that re-reads users with recent ledger activity so changes made by
+other workers show up within ``LEADERBOARD_SYNC_SECONDS``. Every update
+writes absolute values, so re-applying a sync is harmless.
+"""
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Sum
+from django.utils import timezone
+
+from users.models import User
+from .models import XPEvent
+from .ranking import RankIndex
+
+# Overlap between syncs so transactions that commit late are still picked up
+SYNC_OVERLAP = timedelta(seconds=30)
+
+_boards = None
+_boards_lock = threading.Lock()
+
+def get_leaderboards():
+    global _boards
+    with _boards_lock:
+        if _boards is None:
+            _boards = Leaderboards()
+            _boards.rebuild()
+        return _boards
+
+def week_start(now):
+    start = now - timedelta(days=now.weekday())
+    return start.replace(hour=0, minute=0, second=0, microsecond=0)
+
+class Leaderboards:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.global_board = RankIndex()
+        self.weekly = RankIndex()
+        self.paths = {}
+        self.week_start = None
+        self.synced_at = None
+
+    def rebuild(self):
+        from learning.models import PathProgress
+
+        now = timezone.now()
+        global_board, weekly, paths = RankIndex(), RankIndex(), {}
+        global_board.load_scores(
+            User.objects.filter(is_active=True).values_list('id', 'xp').iterator(chunk_size=10000)
+        )
+        weekly.load_scores(self._weekly_totals(week_start(now)))
+        path_scores = {}
+        for path_id, user_id, xp in PathProgress.objects.values_list(
+            'learning_path_id', 'user_id', 'total_xp'
+        ).iterator(chunk_size=10000):
+            path_scores.setdefault(path_id, []).append((user_id, xp))
+        for path_id, scores in path_scores.items():
+            paths[path_id] = RankIndex()
+            paths[path_id].load_scores(scores)
+        with self.lock:
+            self.global_board, self.weekly, self.paths = global_board, weekly, paths
+            self.week_start, self.synced_at = week_start(now), now
+
+    def _weekly_totals(self, since, user_ids=None):
+        events = XPEvent.objects.filter(created_at__gte=since)
+        if user_ids is not None:
+            events = events.filter(user_id__in=user_ids)
+        return events.values('user_id').annotate(total=Sum('amount')).values_list('user_id', 'total')
+
+    def refresh_users(self, user_ids):
+        """Reload the absolute scores of ``user_ids`` on every board."""
+        from learning.models import PathProgress
+
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        xp = dict(User.objects.filter(id__in=user_ids, is_active=True).values_list('id', 'xp'))
+        weekly = dict(self._weekly_totals(self.week_start, user_ids))
+        path_rows = list(PathProgress.objects.filter(user_id__in=user_ids).values_list(
+            'learning_path_id', 'user_id', 'total_xp'
+        ))
+        with self.lock:
+            for user_id in user_ids:
+                if user_id in xp:
+                    self.global_board.set(user_id, xp[user_id])
+                else:
+                    self.global_board.discard(user_id)
+                if user_id in weekly:
+                    self.weekly.set(user_id, weekly[user_id])
+            for path_id, user_id, total_xp in path_rows:
+                self.paths.setdefault(path_id, RankIndex()).set(user_id, total_xp)
+
+    def sync(self):
+        now = timezone.now()
+        if week_start(now) != self.week_start:
+            return self.rebuild()
+        changed = XPEvent.objects.filter(
+            created_at__gte=self.synced_at - SYNC_OVERLAP
+        ).values_list('user_id', flat=True).distinct()
+        self.refresh_users(changed)
+        self.synced_at = now
+
+    def maybe_sync(self):
+        interval = getattr(settings, 'LEADERBOARD_SYNC_SECONDS', 5)
+        if timezone.now() - self.synced_at >= timedelta(seconds=interval):
+            self.sync()
+
+    def board(self, name='global', path_id=None):
+        if path_id is not None:
+            return self.paths.get(path_id) or RankIndex()
+        return self.weekly if name == 'weekly' else self.global_board
+
+    def top(self, board, limit):
+        with self.lock:
+            return self._rows(board.slice(0, limit), 1)
+
+    def around(self, board, member, k):
+        with self.lock:
+            rank = board.rank(member)
+            if rank is None:
+                return None, []
+            start = max(rank - 1 - k, 0)
+            return rank, self._rows(board.slice(start, rank + k), start + 1)
+
+    @staticmethod
+    def _rows(pairs, first_rank):
+        return [
+            {'rank': rank, 'user_id': member, 'xp': score}
+            for rank, (member, score) in enumerate(pairs, first_rank)
+        ]
+
+def on_xp_changed(sender, user_id, **kwargs):
+    if _boards is not None:
+        _boards.refresh_users([user_id])
\ No newline at end of file
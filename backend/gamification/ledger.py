@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from users.models import User
+from .models import XPEvent
+from .signals import send_on_commit, xp_changed
+
+def xp_per_level():
+    return getattr(settings, 'XP_PER_LEVEL', 100)
+
+def award_xp(user, amount, source, idempotency_key):
+    """Append an XP event and apply it to ``users.xp``/``users.level`` atomically.
+
+    Returns ``False`` without changing anything when ``idempotency_key`` was
+    already recorded, so retried requests never award twice.
+    """
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                XPEvent.objects.create(
+                    user=user, amount=amount, source=source, idempotency_key=idempotency_key
+                )
+        except IntegrityError:
+            return False
+        User.objects.filter(pk=user.pk).update(
+            xp=F('xp') + amount,
+            level=(F('xp') + amount) / xp_per_level() + 1,
+        )
+        send_on_commit(xp_changed, user_id=user.pk, amount=amount, source=source)
+    user.refresh_from_db(fields=['xp', 'level'])
+    return True
+
+def award_xp_batch(awards):
+    """Apply many ``(user_id, amount, source, idempotency_key)`` awards in one transaction.
+
+    Keys already in the ledger are skipped; each user's balance gets one UPDATE.
+    Only awards whose event row this transaction inserted are credited.
+    Returns ``{user_id: xp_awarded}``.
+    """
+    with transaction.atomic():
+        keys = [award[3] for award in awards]
+        seen = set(XPEvent.objects.filter(idempotency_key__in=keys).values_list('idempotency_key', flat=True))
+        fresh = {award[3]: award for award in awards if award[3] not in seen}
+        try:
+            with transaction.atomic():
+                XPEvent.objects.bulk_create([
+                    XPEvent(user_id=user_id, amount=amount, source=source, idempotency_key=key)
+                    for user_id, amount, source, key in fresh.values()
+                ])
+        except IntegrityError:
+            # A concurrent transaction recorded some keys after the SELECT: insert
+            # one at a time, like award_xp, and drop the awards that lose
+            for user_id, amount, source, key in list(fresh.values()):
+                try:
+                    with transaction.atomic():
+                        XPEvent.objects.create(
+                            user_id=user_id, amount=amount, source=source, idempotency_key=key
+                        )
+                except IntegrityError:
+                    del fresh[key]
+        totals, sources = {}, {}
+        for user_id, amount, source, key in fresh.values():
+            totals[user_id] = totals.get(user_id, 0) + amount
+            sources[user_id] = source
+        for user_id, amount in totals.items():
+            User.objects.filter(pk=user_id).update(
+                xp=F('xp') + amount,
+                level=(F('xp') + amount) / xp_per_level() + 1,
+            )
+            send_on_commit(
+                xp_changed, user_id=user_id, amount=amount, source=sources[user_id]
+            )
+    return totals
\ No newline at end of file
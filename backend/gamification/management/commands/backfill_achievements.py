@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from gamification.achievements import get_rules, load_counters, unlock
+from gamification.models import UserAchievement
+from users.models import User
+
+class Command(BaseCommand):
+    help = 'Evaluate every achievement rule for every user, streaming users in chunks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        rules = get_rules()
+        if not rules.rules:
+            self.stdout.write('No valid achievement rules to evaluate.')
+            return
+        metrics = set().union(*(rule.metrics for rule in rules.rules))
+        chunk_size = options['chunk_size']
+        totals = {'users': 0, 'unlocked': 0}
+
+        chunk = []
+        for user_id in User.objects.order_by('id').values_list('id', flat=True).iterator(chunk_size=chunk_size):
+            chunk.append(user_id)
+            if len(chunk) >= chunk_size:
+                self.evaluate_chunk(chunk, rules, metrics, totals)
+                chunk = []
+        if chunk:
+            self.evaluate_chunk(chunk, rules, metrics, totals)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Unlocked {totals['unlocked']} achievements across {totals['users']} users"
+        ))
+
+    def evaluate_chunk(self, user_ids, rules, metrics, totals):
+        counters = load_counters(user_ids, metrics)
+        unlocked = set(UserAchievement.objects.filter(user_id__in=user_ids).values_list(
+            'user_id', 'achievement_id'
+        ))
+        unlocks = [
+            (user_id, rule)
+            for user_id in user_ids
+            for rule in rules.rules
+            if (user_id, rule.achievement_id) not in unlocked and rule.predicate(counters[user_id])
+        ]
+        inserted = unlock(unlocks, rules)
+        totals['users'] += len(user_ids)
+        totals['unlocked'] += len(inserted)
\ No newline at end of file
@@ -0,0 +1,25 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from gamification.streaks import rollover
+
+class Command(BaseCommand):
+    help = (
+        'Reset broken streaks and spend streak protection for missed days. '
+        'Idempotent; schedule it hourly so each timezone rolls over after its local midnight.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--now', help='ISO datetime to roll over as of (defaults to now).')
+        parser.add_argument('--dry-run', action='store_true', help='Report counts without updating.')
+
+    def handle(self, *args, **options):
+        now = None
+        if options['now']:
+            now = parse_datetime(options['now'])
+            if now is None or now.tzinfo is None:
+                raise CommandError('--now must be an ISO datetime with a UTC offset.')
+        report = rollover(now=now, dry_run=options['dry_run'])
+        self.stdout.write(json.dumps(report, indent=2))
\ No newline at end of file
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.2 on 2026-10-18 08:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0002_xp_ledger'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='xpevent',
+            index=models.Index(fields=['created_at'], name='xp_events_created_idx'),
+        ),
+    ]
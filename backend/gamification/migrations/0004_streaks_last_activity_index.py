@@ -0,0 +1,19 @@
+# Generated by Django 5.0.2 on 2026-10-18 08:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0003_xp_events_created_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='streak',
+            index=models.Index(fields=['last_activity_date'], name='streaks_last_activity_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.2 on 2026-10-18 08:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0004_streaks_last_activity_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dailychallenge',
+            index=models.Index(fields=['available_until'], name='challenges_available_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.2 on 2026-10-18 09:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0005_challenges_available_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userachievement',
+            index=models.Index(fields=['unlocked_at'], name='user_achievements_unlocked_idx'),
+        ),
+    ]
@@ -19,6 +19,9 @@ class UserAchievement(models.Model):
     class Meta:
         db_table = 'user_achievements'
         unique_together = ['user', 'achievement']
+        indexes = [
+            models.Index(fields=['unlocked_at'], name='user_achievements_unlocked_idx'),
+        ]
 
 class Streak(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
@@ -29,6 +32,9 @@ class Streak(models.Model):
 
     class Meta:
         db_table = 'streaks'
+        indexes = [
+            models.Index(fields=['last_activity_date'], name='streaks_last_activity_idx'),
+        ]
 
 class DailyChallenge(models.Model):
     title = models.CharField(max_length=200)
@@ -51,4 +57,22 @@ class DailyChallenge(models.Model):
     available_until = models.DateTimeField()
 
     class Meta:
-        db_table = 'daily_challenges'
\ No newline at end of file
+        db_table = 'daily_challenges'
+        indexes = [
+            models.Index(fields=['available_until'], name='challenges_available_idx'),
+        ]
+
+class XPEvent(models.Model):
+    """Append-only XP ledger; ``users.xp`` is the running balance of these rows."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    amount = models.IntegerField()
+    source = models.CharField(max_length=50)
+    idempotency_key = models.CharField(max_length=100, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'xp_events'
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='xp_events_user_created_idx'),
+            models.Index(fields=['created_at'], name='xp_events_created_idx'),
+        ]
\ No newline at end of file
@@ -0,0 +1,47 @@
+"""Live XP, level, streak, lesson and achievement updates for ``/api/gamification/events/``.
+
+The receivers run after the triggering transaction commits. Each one only
+queries for the new state when the broker can reach a stream of that user.
+"""
+from core.push import get_broker, register_merge
+from users.models import User
+from .models import Achievement, Streak
+
+def merge_xp(older, newer):
+    return dict(newer, gained=older['gained'] + newer['gained'])
+
+def merge_lists(key):
+    return lambda older, newer: {key: older[key] + newer[key]}
+
+register_merge('xp', merge_xp)
+register_merge('lessons', merge_lists('completed'))
+register_merge('achievements', merge_lists('unlocked'))
+
+def on_xp_changed(sender, user_id, amount, source, **kwargs):
+    broker = get_broker()
+    if broker.has_subscribers(user_id):
+        row = User.objects.filter(pk=user_id).values('xp', 'level').first()
+        if row is not None:
+            broker.publish(user_id, 'xp', dict(row, gained=amount, source=source))
+
+def on_streak_updated(sender, user_id, **kwargs):
+    broker = get_broker()
+    if broker.has_subscribers(user_id):
+        row = Streak.objects.filter(user_id=user_id).values(
+            'current', 'longest', 'last_activity_date', 'protection_available'
+        ).first()
+        if row is not None:
+            broker.publish(user_id, 'streak', row)
+
+def on_lesson_completed(sender, user_id, lesson_id, path_id, **kwargs):
+    broker = get_broker()
+    if broker.has_subscribers(user_id):
+        broker.publish(user_id, 'lessons', {'completed': [{'lesson_id': lesson_id, 'path_id': path_id}]})
+
+def on_achievement_unlocked(sender, user_id, achievement_ids, **kwargs):
+    broker = get_broker()
+    if broker.has_subscribers(user_id):
+        unlocked = list(Achievement.objects.filter(pk__in=achievement_ids).values(
+            'id', 'title', 'description', 'icon', 'xp_reward'
+        ))
+        broker.publish(user_id, 'achievements', {'unlocked': unlocked})
\ No newline at end of file
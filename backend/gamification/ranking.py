@@ -0,0 +1,155 @@
+import bisect
+
+SHIFT = 40
+MEMBER_MASK = (1 << SHIFT) - 1
+
+class RankIndex:
+    """Order-statistic index of members by integer score, highest score first.
+
+    Each member is packed into one int key ``(-score << 40) + member``, so ties
+    break by member id. Keys live in sorted buckets of at most ``2 * load``
+    entries with a Fenwick tree over the bucket sizes. Insert, remove and rank
+    cost O(log n) plus a memmove inside one bucket. Slices only walk the
+    buckets they cover.
+    """
+
+    def __init__(self, load=1000):
+        self.load = load
+        self.keys = {}
+        self.buckets = []
+        self.maxes = []
+        self.tree = []
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, member):
+        return member in self.keys
+
+    @staticmethod
+    def pack(member, score):
+        return (-score << SHIFT) + member
+
+    @staticmethod
+    def unpack(key):
+        return key & MEMBER_MASK, -(key >> SHIFT)
+
+    def load_scores(self, scores):
+        """Replace the contents with ``(member, score)`` pairs in one O(n log n) build."""
+        self.keys = {member: self.pack(member, score) for member, score in scores}
+        ordered = sorted(self.keys.values())
+        self.buckets = [ordered[i:i + self.load] for i in range(0, len(ordered), self.load)]
+        self.maxes = [bucket[-1] for bucket in self.buckets]
+        self._rebuild_tree()
+
+    def score(self, member):
+        key = self.keys.get(member)
+        return None if key is None else self.unpack(key)[1]
+
+    def set(self, member, score):
+        key = self.pack(member, score)
+        old = self.keys.get(member)
+        if old == key:
+            return
+        if old is not None:
+            self._remove(old)
+        self.keys[member] = key
+        self._insert(key)
+
+    def discard(self, member):
+        key = self.keys.pop(member, None)
+        if key is not None:
+            self._remove(key)
+
+    def rank(self, member):
+        """1-based rank of ``member``, or ``None`` if it is not ranked."""
+        key = self.keys.get(member)
+        if key is None:
+            return None
+        i = bisect.bisect_left(self.maxes, key)
+        return self._prefix(i) + bisect.bisect_left(self.buckets[i], key) + 1
+
+    def slice(self, start, stop):
+        """``(member, score)`` pairs for 0-based positions ``start`` to ``stop``."""
+        start = max(start, 0)
+        stop = min(stop, len(self.keys))
+        if start >= stop:
+            return []
+        i, offset = self._locate(start)
+        result = []
+        remaining = stop - start
+        while remaining > 0 and i < len(self.buckets):
+            chunk = self.buckets[i][offset:offset + remaining]
+            result.extend(self.unpack(key) for key in chunk)
+            remaining -= len(chunk)
+            i, offset = i + 1, 0
+        return result
+
+    def _insert(self, key):
+        if not self.buckets:
+            self.buckets.append([key])
+            self.maxes.append(key)
+            self._rebuild_tree()
+            return
+        i = bisect.bisect_left(self.maxes, key)
+        if i == len(self.buckets):
+            i -= 1
+            self.buckets[i].append(key)
+            self.maxes[i] = key
+        else:
+            bisect.insort(self.buckets[i], key)
+        bucket = self.buckets[i]
+        if len(bucket) > 2 * self.load:
+            self.buckets[i:i + 1] = [bucket[:self.load], bucket[self.load:]]
+            self.maxes[i:i + 1] = [bucket[self.load - 1], bucket[-1]]
+            self._rebuild_tree()
+        else:
+            self._add(i, 1)
+
+    def _remove(self, key):
+        i = bisect.bisect_left(self.maxes, key)
+        bucket = self.buckets[i]
+        del bucket[bisect.bisect_left(bucket, key)]
+        if not bucket:
+            del self.buckets[i]
+            del self.maxes[i]
+            self._rebuild_tree()
+        else:
+            self.maxes[i] = bucket[-1]
+            self._add(i, -1)
+
+    # Fenwick tree over bucket sizes (1-based internally)
+
+    def _rebuild_tree(self):
+        tree = [0] * (len(self.buckets) + 1)
+        for i, bucket in enumerate(self.buckets, 1):
+            tree[i] += len(bucket)
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self.tree = tree
+
+    def _add(self, i, delta):
+        i += 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, i):
+        """Number of keys in buckets before bucket ``i``."""
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, position):
+        """Bucket index and offset holding 0-based ``position``."""
+        i, step = 0, 1 << (len(self.tree).bit_length())
+        while step:
+            nxt = i + step
+            if nxt < len(self.tree) and self.tree[nxt] <= position:
+                i = nxt
+                position -= self.tree[nxt]
+            step >>= 1
+        return i, position
\ No newline at end of file
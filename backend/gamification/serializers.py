@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from core.serializers import ValuesSerializer
+from .achievements import InvalidCriteria, compile_criteria
 from .models import Achievement, UserAchievement, Streak, DailyChallenge
 
 class AchievementSerializer(serializers.ModelSerializer):
@@ -6,6 +8,13 @@ class AchievementSerializer(serializers.ModelSerializer):
         model = Achievement
         fields = '__all__'
 
+    def validate_criteria(self, value):
+        try:
+            compile_criteria(value)
+        except InvalidCriteria as exc:
+            raise serializers.ValidationError(str(exc))
+        return value
+
 class UserAchievementSerializer(serializers.ModelSerializer):
     achievement = AchievementSerializer(read_only=True)
     
@@ -21,4 +30,14 @@ class StreakSerializer(serializers.ModelSerializer):
 class DailyChallengeSerializer(serializers.ModelSerializer):
     class Meta:
         model = DailyChallenge
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+class AchievementValuesSerializer(ValuesSerializer):
+    model = Achievement
+
+class UserAchievementValuesSerializer(ValuesSerializer):
+    model = UserAchievement
+    related = {'achievement': (AchievementValuesSerializer, None)}
+
+class DailyChallengeValuesSerializer(ValuesSerializer):
+    model = DailyChallenge
\ No newline at end of file
@@ -0,0 +1,15 @@
+from django.db import transaction
+from django.dispatch import Signal
+
+# Gamification events, all sent after the triggering transaction commits.
+# xp_changed: user_id, amount, source
+xp_changed = Signal()
+# lesson_completed: user_id, lesson_id, path_id
+lesson_completed = Signal()
+# streak_updated: user_id
+streak_updated = Signal()
+# achievement_unlocked: user_id, achievement_ids
+achievement_unlocked = Signal()
+
+def send_on_commit(signal, **kwargs):
+    transaction.on_commit(lambda: signal.send(sender=None, **kwargs))
\ No newline at end of file
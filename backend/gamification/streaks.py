@@ -0,0 +1,124 @@
+import logging
+import zoneinfo
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from users.models import User
+from .models import Streak
+from .signals import send_on_commit, streak_updated
+
+logger = logging.getLogger(__name__)
+
+def local_today(tz_name, now=None):
+    """The date in timezone ``tz_name`` at ``now``; ``None`` if the timezone is unknown."""
+    try:
+        return (now or timezone.now()).astimezone(zoneinfo.ZoneInfo(tz_name)).date()
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        return None
+
+def check_in_date(user, now=None):
+    """The user's local date, the one ``rollover`` settles against; UTC for an unknown timezone."""
+    now = now or timezone.now()
+    return local_today(user.timezone, now) or now.date()
+
+def apply_check_in(streak, today):
+    """Advance an existing streak to ``today``, spending protection on a missed day.
+
+    A streak ``rollover`` has reset to 0 starts again at 1 and keeps its protection.
+    """
+    days_diff = (today - streak.last_activity_date).days
+
+    if streak.current == 0:
+        streak.current = 1
+        streak.longest = max(streak.longest, 1)
+    elif days_diff == 1:
+        streak.current += 1
+        streak.longest = max(streak.longest, streak.current)
+    elif days_diff > 1:
+        if streak.protection_available:
+            streak.protection_available = False
+        else:
+            streak.current = 1
+
+    streak.last_activity_date = today
+    return streak
+
+def streak_to_event(streak):
+    return {
+        'id': streak.pk,
+        'user_id': streak.user_id,
+        'current': streak.current,
+        'longest': streak.longest,
+        'last_activity_date': streak.last_activity_date.isoformat(),
+        'protection_available': streak.protection_available,
+    }
+
+def streak_from_event(event):
+    return Streak(**{**event, 'last_activity_date': parse_date(event['last_activity_date'])})
+
+def flush_check_ins(events):
+    """Persist buffered streak states with one bulk insert and one bulk update."""
+    streaks = [streak_from_event(event) for event in events]
+    with transaction.atomic():
+        existing = dict(
+            Streak.objects.filter(
+                user_id__in=[streak.user_id for streak in streaks if streak.pk is None]
+            ).values_list('user_id', 'id')
+        )
+        for streak in streaks:
+            if streak.pk is None and streak.user_id in existing:
+                streak.pk = existing[streak.user_id]
+        Streak.objects.bulk_create(
+            [streak for streak in streaks if streak.pk is None], ignore_conflicts=True
+        )
+        Streak.objects.bulk_update(
+            [streak for streak in streaks if streak.pk is not None],
+            ['current', 'longest', 'last_activity_date', 'protection_available'],
+        )
+        for streak in streaks:
+            send_on_commit(streak_updated, user_id=streak.user_id)
+
+def rollover(now=None, dry_run=False):
+    """Settle missed days for every streak in set-based UPDATEs, one timezone at a time.
+
+    For each user timezone, with ``today`` the local date:
+
+    * a streak with no activity since before yesterday that still has
+      protection spends it: ``last_activity_date`` moves to yesterday so the
+      streak survives the gap, however many runs were missed, as it would on
+      a check-in;
+    * any other streak with no activity since before yesterday is reset to 0.
+
+    Both statements only match rows they have not already settled, so re-running
+    (e.g. hourly, to catch each timezone's midnight) is a no-op.
+    Returns per-timezone and total counts, including streaks at risk today.
+    """
+    now = now or timezone.now()
+    totals = {'protected': 0, 'reset': 0, 'at_risk': 0}
+    report = {}
+    for tz_name in User.objects.order_by().values_list('timezone', flat=True).distinct():
+        today = local_today(tz_name, now)
+        if today is None:
+            logger.warning('Skipping streak rollover for unknown timezone %r', tz_name)
+            continue
+        yesterday = today - timedelta(days=1)
+        streaks = Streak.objects.filter(user__timezone=tz_name)
+        protectable = streaks.filter(
+            last_activity_date__lt=yesterday, protection_available=True, current__gt=0
+        )
+        broken = streaks.filter(last_activity_date__lt=yesterday, current__gt=0)
+        with transaction.atomic():
+            if dry_run:
+                protected = protectable.count()
+                reset = broken.count() - protected
+            else:
+                protected = protectable.update(protection_available=False, last_activity_date=yesterday)
+                reset = broken.update(current=0)
+            at_risk = streaks.filter(last_activity_date=yesterday, current__gt=0).count()
+        report[tz_name] = {'protected': protected, 'reset': reset, 'at_risk': at_risk}
+        for key, value in report[tz_name].items():
+            totals[key] += value
+    return {'totals': totals, 'timezones': report}
\ No newline at end of file
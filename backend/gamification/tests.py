@@ -0,0 +1,341 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.db import DatabaseCache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.cache import check_shared_cache, shared_cache
+from core.pagination import MAX_PAGE_SIZE
+from core.push import MemoryBroker
+from users.models import User
+from .achievements import (
+    RULES_VERSION_KEY, InvalidCriteria, compile_criteria, counters_key, evaluate, get_rules, unlock,
+)
+from .ledger import award_xp, award_xp_batch
+from .models import Achievement, DailyChallenge, Streak, UserAchievement, XPEvent
+from .signals import achievement_unlocked
+from .streaks import rollover
+
+def at(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+class StreakTests(TestCase):
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.user = User.objects.create_user('tokyo', 'tokyo@example.com', 'password', timezone='Asia/Tokyo')
+        self.headers = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(self.user).access_token}'}
+
+    def check_in(self, now):
+        with mock.patch('django.utils.timezone.now', return_value=now):
+            response = self.client.post('/api/gamification/streak/check-in/', **self.headers)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_check_in_uses_local_date(self):
+        Streak.objects.create(user=self.user, current=5, longest=5, last_activity_date=date(2026, 1, 10),
+                              protection_available=True)
+        # 08:30 on the 11th in Tokyo, still the 10th in UTC
+        data = self.check_in(at(2026, 1, 10, 23, 30))
+        self.assertEqual((data['current'], data['last_activity_date']), (6, '2026-01-11'))
+
+        # Midnight of the 12th in Tokyo: the streak is at risk, not broken
+        result = rollover(now=at(2026, 1, 11, 15, 5))
+        self.assertEqual(result['totals'], {'protected': 0, 'reset': 0, 'at_risk': 1})
+        streak = Streak.objects.get(user=self.user)
+        self.assertEqual((streak.current, streak.protection_available), (6, True))
+
+    def test_check_in_after_reset_starts_a_new_streak(self):
+        Streak.objects.create(user=self.user, current=4, longest=9, last_activity_date=date(2026, 1, 5),
+                              protection_available=False)
+        # Two missed days and no protection left, so the streak is reset
+        result = rollover(now=at(2026, 1, 8, 3, 0))
+        self.assertEqual(result['totals']['reset'], 1)
+        self.assertEqual(Streak.objects.get(user=self.user).current, 0)
+
+        data = self.check_in(at(2026, 1, 8, 4, 0))
+        self.assertEqual(data['current'], 1)
+        self.assertEqual(data['longest'], 9)
+        self.assertEqual(data['last_activity_date'], '2026-01-08')
+
+        data = self.check_in(at(2026, 1, 9, 4, 0))
+        self.assertEqual(data['current'], 2)
+
+    def test_missed_rollover_run_still_spends_protection(self):
+        Streak.objects.create(user=self.user, current=4, longest=9, last_activity_date=date(2026, 1, 5),
+                              protection_available=True)
+        # The run at midnight of the 7th never happened; the next one finds a two-day gap
+        result = rollover(now=at(2026, 1, 8, 3, 0))
+        self.assertEqual(result['totals'], {'protected': 1, 'reset': 0, 'at_risk': 1})
+        streak = Streak.objects.get(user=self.user)
+        self.assertEqual((streak.current, streak.protection_available), (4, False))
+        self.assertEqual(streak.last_activity_date, date(2026, 1, 7))
+
+        self.assertEqual(rollover(now=at(2026, 1, 8, 4, 0))['totals'], {'protected': 0, 'reset': 0, 'at_risk': 1})
+        self.assertEqual(self.check_in(at(2026, 1, 8, 5, 0))['current'], 5)
+
+class ChallengeFeedTests(TestCase):
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.user = User.objects.create_user('feed', 'feed@example.com', 'password')
+        self.headers = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(self.user).access_token}'}
+        self.challenge = DailyChallenge.objects.create(
+            title='Warm-up', description='', difficulty='easy', type='quiz', content={},
+            xp_reward=10, available_until=timezone.now() + timedelta(hours=1),
+        )
+
+    def completed(self):
+        response = self.client.get('/api/gamification/challenges/', **self.headers)
+        self.assertEqual(response.status_code, 200)
+        return [challenge['completed'] for challenge in response.json()]
+
+    def test_completion_is_seen_by_other_workers(self):
+        self.assertEqual(self.completed(), [False])
+        self.assertIsNotNone(shared_cache().get(f'challenges:done:{self.user.pk}'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/gamification/challenges/{self.challenge.pk}/complete/', **self.headers)
+        self.assertEqual(response.json()['status'], 'challenge completed')
+        self.assertIsNone(shared_cache().get(f'challenges:done:{self.user.pk}'))
+
+        # Another worker: its own per-process cache, the same shared cache
+        caches['default'].clear()
+        self.assertEqual(self.completed(), [True])
+
+    def test_completion_in_another_worker_process(self):
+        self.assertEqual(self.completed(), [False])
+        award_xp(self.user, 10, 'challenge', f'challenge:{self.challenge.pk}:user:{self.user.pk}')
+        # The other worker's own connection to the shared cache table
+        DatabaseCache('shared_cache', {}).delete(f'challenges:done:{self.user.pk}')
+        self.assertEqual(self.completed(), [True])
+
+class SharedCacheTests(TestCase):
+    def test_default_is_a_database_table(self):
+        shared_cache().clear()
+        shared_cache().set('probe', 1)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM shared_cache')
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_check_rejects_local_memory_with_several_workers(self):
+        with override_settings(WEB_CONCURRENCY=2):
+            self.assertEqual(check_shared_cache(), [])
+        locmem = {**settings.CACHES, 'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        with override_settings(CACHES=locmem):
+            self.assertEqual(check_shared_cache(), [])
+            with override_settings(WEB_CONCURRENCY=2):
+                self.assertEqual([error.id for error in check_shared_cache()], ['core.E001'])
+
+class AchievementTests(TestCase):
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        # Versions restart with the cleared cache: drop rules compiled by an earlier test
+        patcher = mock.patch('gamification.achievements._rules', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = User.objects.create_user('rules', 'rules@example.com', 'password')
+        Streak.objects.create(user=self.user, current=0, longest=0, last_activity_date=date(2026, 1, 1))
+        self.achievement = Achievement.objects.create(
+            title='Dedicated', description='', icon='flame', xp_reward=0,
+            criteria={'all': [{'metric': 'xp', 'gte': 100}, {'metric': 'streak_current', 'gte': 3}]},
+        )
+
+    def test_rules_follow_the_shared_version(self):
+        rules = get_rules()
+        self.assertEqual(shared_cache().get(RULES_VERSION_KEY), rules.version)
+        Achievement.objects.create(title='Regular', description='', icon='star', xp_reward=0,
+                                   criteria={'metric': 'lessons_completed', 'gte': 1})
+        self.assertEqual(len(get_rules().rules), 2)
+
+    def test_rules_edited_in_another_worker_process(self):
+        rules = get_rules()
+        Achievement.objects.filter(pk=self.achievement.pk).update(criteria={'metric': 'xp', 'gte': 0})
+        # The other worker saved the achievement and bumped the version in the shared table
+        DatabaseCache('shared_cache', {}).incr(RULES_VERSION_KEY)
+        self.assertNotEqual(get_rules().version, rules.version)
+        self.assertEqual(evaluate(self.user.pk, 'xp_changed'), [self.achievement.pk])
+
+    def test_counters_are_dropped_when_events_are_written(self):
+        streak_key = counters_key(self.user.pk, 'streak_updated')
+        self.assertEqual(evaluate(self.user.pk, 'xp_changed'), [])
+        self.assertEqual(shared_cache().get(streak_key)['streak_current'], 0)
+
+        Streak.objects.filter(user=self.user).update(current=3)
+        self.assertEqual(evaluate(self.user.pk, 'streak_updated'), [])
+        self.assertEqual(shared_cache().get(streak_key)['streak_current'], 3)
+
+        User.objects.filter(pk=self.user.pk).update(xp=100)
+        self.assertEqual(evaluate(self.user.pk, 'xp_changed'), [self.achievement.pk])
+
+        # Nothing left to evaluate, but the event still drops its counters
+        Streak.objects.filter(user=self.user).update(current=0)
+        self.assertEqual(evaluate(self.user.pk, 'streak_updated'), [])
+        self.assertIsNone(shared_cache().get(streak_key))
+
+    def test_unlock_signals_only_the_rows_it_inserted(self):
+        regular = Achievement.objects.create(title='Regular', description='', icon='star', xp_reward=20,
+                                             criteria={'metric': 'xp', 'gte': 0})
+        rules = get_rules()
+        # Another evaluation unlocked 'Dedicated' between our SELECT and INSERT
+        UserAchievement.objects.create(user=self.user, achievement=self.achievement)
+        sent = []
+
+        def receiver(sender, achievement_ids, **kwargs):
+            sent.append(achievement_ids)
+        achievement_unlocked.connect(receiver)
+        self.addCleanup(achievement_unlocked.disconnect, receiver)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            inserted = unlock([(self.user.pk, rule) for rule in rules.rules], rules)
+        self.assertEqual([rule.achievement_id for _, rule in inserted], [regular.pk])
+        self.assertEqual(sent, [[regular.pk]])
+        self.assertEqual(User.objects.get(pk=self.user.pk).xp, 20)
+
+    def test_boolean_targets_are_rejected(self):
+        for target in (True, False):
+            with self.assertRaises(InvalidCriteria):
+                compile_criteria({'metric': 'xp', 'gte': target})
+        compile_criteria({'metric': 'xp', 'gte': 1.5})
+
+class PaginationTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user('pages', 'pages@example.com', 'password')
+        self.headers = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(user).access_token}'}
+        Achievement.objects.bulk_create([
+            Achievement(title=f'Achievement {n}', description='', icon='star', criteria={}, xp_reward=0)
+            for n in range(MAX_PAGE_SIZE + 1)
+        ])
+
+    def get(self, url):
+        response = self.client.get(url, **self.headers)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_next_link_when_rows_are_left(self):
+        response = self.get('/api/gamification/achievements/')
+        self.assertEqual(len(response.json()), settings.API_PAGE_SIZE)
+        self.assertIn(f'page_size={settings.API_PAGE_SIZE}', response['Link'])
+        self.assertIn('cursor=', response['Link'])
+
+    def test_next_link_shows_the_page_size_cap(self):
+        response = self.get('/api/gamification/achievements/?page_size=5000')
+        self.assertEqual(len(response.json()), MAX_PAGE_SIZE)
+        self.assertIn(f'page_size={MAX_PAGE_SIZE}', response['Link'])
+
+        url = response['Link'][1:response['Link'].index('>')]
+        response = self.get(url)
+        self.assertEqual(len(response.json()), 1)
+        self.assertNotIn('Link', response)
+
+class KeysetOrderTests(TestCase):
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        user = User.objects.create_user('keyset', 'keyset@example.com', 'password')
+        self.headers = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(user).access_token}'}
+        soon = timezone.now() + timedelta(hours=1)
+        # Most challenges tie on available_until; id breaks the tie
+        self.challenges = DailyChallenge.objects.bulk_create([
+            DailyChallenge(title=f'Challenge {n}', description='', difficulty='easy', type='quiz', content={},
+                           xp_reward=10, available_until=soon + timedelta(hours=(n % 3 == 0) * n))
+            for n in range(9)
+        ])
+
+    def walk(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url, **self.headers)
+            self.assertEqual(response.status_code, 200)
+            ids.extend(item['id'] for item in response.json())
+            url = response['Link'][1:response['Link'].index('>')] if response.has_header('Link') else None
+        return ids
+
+    def expected(self):
+        return list(DailyChallenge.objects.order_by('available_until', 'id').values_list('id', flat=True))
+
+    def test_feed_pages_break_ties_by_id(self):
+        ids = self.walk('/api/gamification/challenges/?page_size=2')
+        self.assertEqual(ids, self.expected())
+        self.assertEqual(len(set(ids)), len(self.challenges))
+
+    def test_projected_feed_pages_break_ties_by_id(self):
+        ids = self.walk('/api/gamification/challenges/?page_size=2&fields=id,title')
+        self.assertEqual(ids, self.expected())
+        self.assertEqual(len(set(ids)), len(self.challenges))
+
+    def test_achievement_pages_neither_repeat_nor_skip(self):
+        Achievement.objects.bulk_create([
+            Achievement(title=f'Achievement {n}', description='', icon='star', criteria={}, xp_reward=0)
+            for n in range(10)
+        ])
+        ids = self.walk('/api/gamification/achievements/?page_size=3')
+        self.assertEqual(ids, list(Achievement.objects.order_by('id').values_list('id', flat=True)))
+
+class LedgerTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('ledger', 'ledger@example.com', 'password')
+
+    def balance(self):
+        self.user.refresh_from_db(fields=['xp', 'level'])
+        return self.user.xp, self.user.level
+
+    def test_retried_awards_count_once(self):
+        self.assertTrue(award_xp(self.user, 60, 'lesson', 'lesson:1'))
+        self.assertFalse(award_xp(self.user, 60, 'lesson', 'lesson:1'))
+        self.assertEqual(award_xp_batch([
+            (self.user.pk, 60, 'lesson', 'lesson:1'),
+            (self.user.pk, 50, 'lesson', 'lesson:2'),
+        ]), {self.user.pk: 50})
+        self.assertEqual(self.balance(), (110, 2))
+        self.assertEqual(XPEvent.objects.filter(user=self.user).count(), 2)
+
+    def test_batch_skips_keys_recorded_after_its_select(self):
+        filter_keys = XPEvent.objects.filter
+
+        def select_then_race(**kwargs):
+            seen = list(filter_keys(**kwargs).values_list('idempotency_key', flat=True))
+            # Another transaction commits the same key before the INSERT
+            XPEvent.objects.create(user=self.user, amount=5, source='challenge', idempotency_key='challenge:1')
+            return mock.Mock(values_list=lambda *args, **kwargs: seen)
+
+        with mock.patch.object(XPEvent.objects, 'filter', select_then_race):
+            totals = award_xp_batch([
+                (self.user.pk, 10, 'lesson', 'lesson:1'),
+                (self.user.pk, 5, 'challenge', 'challenge:1'),
+            ])
+        self.assertEqual(totals, {self.user.pk: 10})
+        self.assertEqual(self.balance(), (10, 1))
+        self.assertEqual(XPEvent.objects.filter(user=self.user).count(), 2)
+
+class PushTests(SimpleTestCase):
+    async def test_burst_is_written_as_one_payload_per_kind(self):
+        broker = MemoryBroker()
+        subscription = broker.subscribe(1)
+        lesson = {'lesson_id': 7, 'path_id': 2}
+        broker.publish(1, 'xp', {'xp': 10, 'level': 1, 'gained': 10, 'source': 'lesson'})
+        broker.publish(1, 'streak', {'current': 1})
+        broker.publish(1, 'lessons', {'completed': [lesson]})
+        broker.publish(2, 'xp', {'xp': 99, 'level': 1, 'gained': 99, 'source': 'lesson'})
+        waiting = asyncio.ensure_future(subscription.get(timeout=1, coalesce=0.05))
+        await asyncio.sleep(0.01)
+        # Still inside the coalescing window: merged into what is pending
+        broker.publish(1, 'xp', {'xp': 30, 'level': 1, 'gained': 20, 'source': 'challenge'})
+        broker.publish(1, 'streak', {'current': 2})
+        broker.publish(1, 'lessons', {'completed': [lesson]})
+
+        self.assertEqual(await waiting, {
+            'xp': {'xp': 30, 'level': 1, 'gained': 30, 'source': 'challenge'},
+            'streak': {'current': 2},
+            'lessons': {'completed': [lesson, lesson]},
+        })
+        self.assertEqual(await subscription.get(timeout=0.01, coalesce=0), {})
+        broker.unsubscribe(subscription)
+        self.assertFalse(broker.has_subscribers(1))
\ No newline at end of file
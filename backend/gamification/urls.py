@@ -1,8 +1,10 @@
+from django.conf import settings
 from django.urls import path
 from .views import (
     AchievementViewSet, StreakViewSet,
-    DailyChallengeViewSet
+    DailyChallengeViewSet, LeaderboardViewSet
 )
+from . import async_views
 
 urlpatterns = [
     path('achievements/', 
@@ -21,8 +23,23 @@ urlpatterns = [
         DailyChallengeViewSet.as_view({'get': 'list'}),
         name='daily_challenges'
     ),
-    path('challenges/<uuid:pk>/complete/',
+    path('challenges/<int:pk>/complete/',
         DailyChallengeViewSet.as_view({'post': 'complete'}),
         name='complete_challenge'
     ),
-]
\ No newline at end of file
+    path('leaderboard/',
+        LeaderboardViewSet.as_view({'get': 'top'}),
+        name='leaderboard'
+    ),
+    path('leaderboard/me/',
+        LeaderboardViewSet.as_view({'get': 'me'}),
+        name='leaderboard_me'
+    ),
+]
+
+if settings.ASYNC_VIEWS:
+    urlpatterns = [
+        path('achievements/user/', async_views.user_achievements, name='user_achievements'),
+        path('challenges/', async_views.daily_challenges, name='daily_challenges'),
+        path('events/', async_views.events, name='events'),
+    ] + urlpatterns
\ No newline at end of file
@@ -1,73 +1,166 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.http import HttpResponse
 from django.utils import timezone
+from core.pagination import CursorPage, next_link, page_size
+from core.serializers import parse_field_tree
+from core.writebehind import get_buffer
+from users.models import User
+from .feed import mark_completed, project_feed, render_feed
+from .leaderboard import get_leaderboards
+from .ledger import award_xp
 from .models import Achievement, UserAchievement, Streak, DailyChallenge
 from .serializers import (
-    AchievementSerializer, UserAchievementSerializer,
+    AchievementSerializer, AchievementValuesSerializer, UserAchievementValuesSerializer,
     StreakSerializer, DailyChallengeSerializer
 )
+from .signals import send_on_commit, streak_updated
+from .streaks import apply_check_in, check_in_date, streak_from_event, streak_to_event
 
 class AchievementViewSet(viewsets.ModelViewSet):
     queryset = Achievement.objects.all()
     serializer_class = AchievementSerializer
+    lazy_user_actions = ('user_achievements',)
+
+    def list(self, request, *args, **kwargs):
+        page = CursorPage(request, self.get_queryset(), ('id',))
+        fields = parse_field_tree(request.query_params.get('fields'))
+        data = page.serialize(AchievementValuesSerializer(page.queryset, fields=fields))
+        return Response(data, headers=page.headers())
 
     @action(detail=False, methods=['get'])
     def user_achievements(self, request):
-        user_achievements = UserAchievement.objects.filter(user=request.user)
-        serializer = UserAchievementSerializer(user_achievements, many=True)
-        return Response(serializer.data)
+        page = CursorPage(request, UserAchievement.objects.filter(user_id=request.user.pk), ('id',))
+        fields = parse_field_tree(request.query_params.get('fields'))
+        data = page.serialize(UserAchievementValuesSerializer(page.queryset, fields=fields))
+        return Response(data, headers=page.headers())
 
 class StreakViewSet(viewsets.ModelViewSet):
     serializer_class = StreakSerializer
 
     def get_queryset(self):
-        return Streak.objects.filter(user=self.request.user)
+        return Streak.objects.filter(user_id=self.request.user.pk)
 
     @action(detail=False, methods=['post'])
     def check_in(self, request):
+        buffer = get_buffer()
+        if buffer is not None:
+            return self.check_in_buffered(buffer, request)
+
+        today = check_in_date(request.user)
         streak, created = Streak.objects.get_or_create(
-            user=request.user,
-            defaults={'last_activity_date': timezone.now().date()}
+            user_id=request.user.pk,
+            defaults={'last_activity_date': today}
         )
         
         if not created:
-            today = timezone.now().date()
-            days_diff = (today - streak.last_activity_date).days
-            
-            if days_diff == 1:
-                streak.current += 1
-                streak.longest = max(streak.longest, streak.current)
-            elif days_diff > 1:
-                if streak.protection_available:
-                    streak.protection_available = False
-                else:
-                    streak.current = 1
-            
-            streak.last_activity_date = today
+            apply_check_in(streak, today)
             streak.save()
+        send_on_commit(streak_updated, user_id=request.user.pk)
         
         return Response(StreakSerializer(streak).data)
 
+    def check_in_buffered(self, buffer, request):
+        today = check_in_date(request.user)
+        key = str(request.user.pk)
+        initial = None
+        if buffer.get('streak_check_in', key) is None:
+            streak = Streak.objects.filter(user_id=request.user.pk).first()
+            initial = streak and streak_to_event(streak)
+
+        def step(event):
+            if event is None:
+                return streak_to_event(Streak(user_id=request.user.pk, last_activity_date=today))
+            return streak_to_event(apply_check_in(streak_from_event(event), today))
+
+        event = buffer.update('streak_check_in', key, step, initial)
+        return Response(StreakSerializer(streak_from_event(event)).data)
+
 class DailyChallengeViewSet(viewsets.ModelViewSet):
     queryset = DailyChallenge.objects.all()
     serializer_class = DailyChallengeSerializer
+    lazy_user_actions = ('list',)
 
     def get_queryset(self):
         return DailyChallenge.objects.filter(
             available_until__gte=timezone.now()
         ).order_by('available_until')
 
+    def list(self, request, *args, **kwargs):
+        params = request.query_params
+        fields = parse_field_tree(params.get('fields'))
+        if fields:
+            data, headers = project_feed(request, fields)
+            return Response(data, headers=headers)
+        size = page_size(params)
+        body, cursor = render_feed(request.user.pk, params.get('cursor'), size)
+        response = HttpResponse(body, content_type='application/json')
+        if cursor:
+            response['Link'] = next_link(request, cursor, size)
+        return response
+
     @action(detail=True, methods=['post'])
     def complete(self, request, pk=None):
         challenge = self.get_object()
-        user = request.user
-        
-        # Add XP reward to user
-        user.xp += challenge.xp_reward
-        user.save()
-        
+        awarded = award_xp(
+            request.user, challenge.xp_reward, 'challenge',
+            f'challenge:{challenge.pk}:user:{request.user.pk}',
+        )
+        if not awarded:
+            return Response({'status': 'challenge already completed'})
+        mark_completed(request.user.pk)
+
         return Response({
             'status': 'challenge completed',
             'xp_gained': challenge.xp_reward
+        })
+
+class LeaderboardViewSet(viewsets.ViewSet):
+    lazy_user_actions = ('me',)
+
+    def get_board(self, request):
+        boards = get_leaderboards()
+        boards.maybe_sync()
+        path_id = request.query_params.get('path')
+        name = request.query_params.get('board', 'global')
+        if path_id is not None:
+            return boards, boards.board(path_id=int(path_id)), f'path:{int(path_id)}'
+        return boards, boards.board(name), 'weekly' if name == 'weekly' else 'global'
+
+    def with_usernames(self, rows):
+        names = dict(User.objects.filter(
+            id__in=[row['user_id'] for row in rows]
+        ).values_list('id', 'username'))
+        for row in rows:
+            row['username'] = names.get(row['user_id'])
+        return rows
+
+    @action(detail=False, methods=['get'])
+    def top(self, request):
+        try:
+            boards, board, name = self.get_board(request)
+            limit = min(int(request.query_params.get('limit', 10)), 100)
+        except ValueError:
+            return Response({'detail': 'Invalid path or limit.'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'board': name,
+            'total': len(board),
+            'results': self.with_usernames(boards.top(board, limit)),
+        })
+
+    @action(detail=False, methods=['get'])
+    def me(self, request):
+        try:
+            boards, board, name = self.get_board(request)
+            k = min(int(request.query_params.get('k', 5)), 50)
+        except ValueError:
+            return Response({'detail': 'Invalid path or k.'}, status=status.HTTP_400_BAD_REQUEST)
+        rank, neighbours = boards.around(board, request.user.pk, k)
+        return Response({
+            'board': name,
+            'total': len(board),
+            'rank': rank,
+            'xp': board.score(request.user.pk),
+            'neighbours': self.with_usernames(neighbours),
         })
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""Study-time history against ``User.daily_goal``.
+
+Every lesson completion appends an ``ActivityEvent`` and adds its time, XP
+and lesson count to the user's ``ActivityRollup`` for that local day, in the
+completing transaction. The history endpoints read rollups only: at most one
+row per bucket, never ``user_progress`` or the events.
+
+``compact`` bounds storage. Events older than ``ACTIVITY_RETENTION['EVENTS']``
+days are deleted (their totals are already in the day rows). Day rows older
+than ``['DAYS']`` are folded into ISO weeks, split at month starts so that no
+week row straddles two months, and week rows older than ``['WEEKS']`` into
+their month. Weekly and monthly history therefore add up the same before and
+after compaction.
+"""
+import zoneinfo
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.db.models.functions import Greatest, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from users.models import User
+from .models import ActivityEvent, ActivityRollup
+
+DAY, WEEK, MONTH = ActivityRollup.DAY, ActivityRollup.WEEK, ActivityRollup.MONTH
+MAX_MONTHS = 120
+COMPACT_BATCH = 1000
+
+def local_date(moment, tz_name):
+    try:
+        return moment.astimezone(zoneinfo.ZoneInfo(tz_name)).date()
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        return moment.astimezone(dt_timezone.utc).date()
+
+def bucket_start(day, period):
+    if period == WEEK:
+        return day - timedelta(days=day.weekday())
+    if period == MONTH:
+        return day.replace(day=1)
+    return day
+
+def week_in_month(field):
+    """SQL bucket for a day: its ISO week's Monday, or the 1st if the month starts mid-week."""
+    return Greatest(TruncWeek(field), TruncMonth(field))
+
+def clean_seconds(value):
+    """Client-reported ``time_spent`` as non-negative whole seconds, capped at a day."""
+    try:
+        return min(max(int(value or 0), 0), 86400)
+    except (TypeError, ValueError):
+        return 0
+
+def add_rollup(user_id, period, start, seconds, lessons, xp):
+    rollups = ActivityRollup.objects.filter(user_id=user_id, period=period, start=start)
+    changes = {'seconds': F('seconds') + seconds, 'lessons': F('lessons') + lessons, 'xp': F('xp') + xp}
+    if rollups.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            ActivityRollup.objects.create(
+                user_id=user_id, period=period, start=start, seconds=seconds, lessons=lessons, xp=xp
+            )
+    except IntegrityError:
+        # A concurrent completion created the row first
+        rollups.update(**changes)
+
+def record_activity(user, lesson, seconds, occurred_at):
+    """Append an event and add it to the user's local day; call inside the completing transaction."""
+    seconds = clean_seconds(seconds)
+    ActivityEvent.objects.create(
+        user_id=user.pk, lesson_id=lesson.pk, seconds=seconds, xp=lesson.xp_reward, occurred_at=occurred_at
+    )
+    add_rollup(user.pk, DAY, local_date(occurred_at, user.timezone), seconds, 1, lesson.xp_reward)
+
+def record_activity_batch(events):
+    """Bulk ``record_activity`` for ``(user_id, lesson_id, seconds, xp, occurred_at)`` tuples."""
+    if not events:
+        return
+    zones = dict(User.objects.filter(pk__in={event[0] for event in events}).values_list('pk', 'timezone'))
+    rows, days = [], {}
+    for user_id, lesson_id, seconds, xp, occurred_at in events:
+        seconds = clean_seconds(seconds)
+        rows.append(ActivityEvent(
+            user_id=user_id, lesson_id=lesson_id, seconds=seconds, xp=xp, occurred_at=occurred_at
+        ))
+        key = (user_id, local_date(occurred_at, zones.get(user_id, 'UTC')))
+        total_seconds, lessons, total_xp = days.get(key, (0, 0, 0))
+        days[key] = (total_seconds + seconds, lessons + 1, total_xp + xp)
+    ActivityEvent.objects.bulk_create(rows)
+    for (user_id, day), (seconds, lessons, xp) in days.items():
+        add_rollup(user_id, DAY, day, seconds, lessons, xp)
+
+def summary(start, seconds, lessons, xp, goal_minutes=None):
+    item = {'start': start, 'minutes': round(seconds / 60, 1), 'seconds': seconds, 'lessons': lessons, 'xp': xp}
+    if goal_minutes is not None:
+        item['goal_met'] = seconds >= goal_minutes * 60
+    return item
+
+def today_totals(user, now=None):
+    """The user's totals for their local today, against ``daily_goal``."""
+    day = local_date(now or timezone.now(), user.timezone)
+    row = ActivityRollup.objects.filter(user_id=user.pk, period=DAY, start=day).values_list(
+        'seconds', 'lessons', 'xp'
+    ).first() or (0, 0, 0)
+    item = summary(day, *row, goal_minutes=user.daily_goal)
+    item['goal_minutes'] = user.daily_goal
+    item['goal_progress'] = min(row[0] / (user.daily_goal * 60), 1.0) if user.daily_goal > 0 else 1.0
+    return item
+
+def max_buckets(period):
+    retention = settings.ACTIVITY_RETENTION
+    if period == DAY:
+        return retention['DAYS']
+    if period == WEEK:
+        return retention['WEEKS'] // 7
+    return MAX_MONTHS
+
+def history_buckets(user, period=DAY, limit=30, now=None):
+    """The last ``limit`` buckets up to today, oldest first, with zeros for idle ones.
+
+    Each bucket sums the rollup rows whose start falls in it, so a week that is
+    partly compacted still adds up; ``limit`` is capped at what that period keeps.
+    """
+    limit = min(max(limit, 1), max_buckets(period))
+    day = local_date(now or timezone.now(), user.timezone)
+    last = bucket_start(day, period)
+    starts = [last]
+    for _ in range(limit - 1):
+        previous = starts[-1] - timedelta(days=1)
+        starts.append(bucket_start(previous, period) if period != DAY else previous)
+    starts.reverse()
+    finer = {DAY: [DAY], WEEK: [DAY, WEEK], MONTH: [DAY, WEEK, MONTH]}[period]
+    totals = {start: [0, 0, 0] for start in starts}
+    rows = ActivityRollup.objects.filter(
+        user_id=user.pk, period__in=finer, start__gte=starts[0], start__lte=day
+    ).values_list('start', 'seconds', 'lessons', 'xp')
+    for start, seconds, lessons, xp in rows:
+        total = totals.get(bucket_start(start, period))
+        if total is not None:
+            total[0] += seconds
+            total[1] += lessons
+            total[2] += xp
+    goal = user.daily_goal if period == DAY else None
+    return [summary(start, *totals[start], goal_minutes=goal) for start in starts]
+
+def fold(source, target, truncate, cutoff, dry_run):
+    """Merge ``source`` rollups starting before ``cutoff`` into ``target`` buckets, a user batch at a time."""
+    old = ActivityRollup.objects.filter(period=source, start__lt=cutoff)
+    user_ids = list(old.order_by('user_id').values_list('user_id', flat=True).distinct())
+    folded = 0
+    for index in range(0, len(user_ids), COMPACT_BATCH):
+        batch = old.filter(user_id__in=user_ids[index:index + COMPACT_BATCH])
+        with transaction.atomic():
+            sums = (
+                batch.annotate(bucket=truncate('start')).values('user_id', 'bucket')
+                .annotate(total_seconds=Sum('seconds'), total_lessons=Sum('lessons'), total_xp=Sum('xp'))
+                .order_by()
+            )
+            sums = {(row['user_id'], row['bucket']): row for row in sums}
+            if dry_run:
+                folded += batch.count()
+                continue
+            existing = {
+                (row.user_id, row.start): row for row in ActivityRollup.objects.select_for_update().filter(
+                    user_id__in={user_id for user_id, _ in sums}, period=target,
+                    start__in={bucket for _, bucket in sums},
+                )
+            }
+            to_create, to_update = [], []
+            for (user_id, bucket), row in sums.items():
+                rollup = existing.get((user_id, bucket))
+                if rollup is None:
+                    rollup = ActivityRollup(user_id=user_id, period=target, start=bucket)
+                    to_create.append(rollup)
+                else:
+                    to_update.append(rollup)
+                rollup.seconds += row['total_seconds']
+                rollup.lessons += row['total_lessons']
+                rollup.xp += row['total_xp']
+            ActivityRollup.objects.bulk_create(to_create)
+            ActivityRollup.objects.bulk_update(to_update, ['seconds', 'lessons', 'xp'])
+            folded += batch.delete()[0]
+    return folded
+
+def delete_events(cutoff, dry_run):
+    events = ActivityEvent.objects.filter(occurred_at__lt=cutoff)
+    if dry_run:
+        return events.count()
+    deleted = 0
+    while True:
+        ids = list(events.order_by('pk').values_list('pk', flat=True)[:COMPACT_BATCH * 10])
+        if not ids:
+            return deleted
+        deleted += ActivityEvent.objects.filter(pk__in=ids).delete()[0]
+
+def compact(now=None, dry_run=False):
+    """Apply ``ACTIVITY_RETENTION``; returns how many events and rollup rows were folded away."""
+    now = now or timezone.now()
+    retention = settings.ACTIVITY_RETENTION
+    # Cut day rows at a week boundary so no week is left half folded
+    day_cutoff = bucket_start(now.date() - timedelta(days=retention['DAYS']), WEEK)
+    return {
+        'events': delete_events(now - timedelta(days=retention['EVENTS']), dry_run),
+        'days': fold(DAY, WEEK, week_in_month, day_cutoff, dry_run),
+        'weeks': fold(WEEK, MONTH, TruncMonth, now.date() - timedelta(days=retention['WEEKS']), dry_run),
+    }
\ No newline at end of file
@@ -2,4 +2,15 @@ from django.apps import AppConfig
 
 class LearningConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'learning'
\ No newline at end of file
+    name = 'learning'
+
+    def ready(self):
+        from django.core import checks
+        from core import writebehind
+        from . import signals  # noqa: F401
+        from .catalog import check_catalog_cache
+        from .grading import flush_attempts
+        from .progress import flush_completions
+        writebehind.register('lesson_completion', flush_completions)
+        writebehind.register('quiz_attempt', flush_attempts)
+        checks.register(check_catalog_cache, checks.Tags.caches)
\ No newline at end of file
@@ -0,0 +1,30 @@
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from core.async_api import async_api_view, json_response
+from .catalog import acached_catalog_response
+from .models import LearningPath, PathProgress
+from .progress import alesson_totals, live_path_progress, summary
+from .views import build_path_list, catalog_variant, page_variant
+
+@async_api_view
+async def path_list(request):
+    params = request.GET
+    return await acached_catalog_response(
+        request, ('list', catalog_variant(params), page_variant(params)),
+        lambda: build_path_list(request)
+    )
+
+@async_api_view
+async def path_progress(request, pk):
+    if request.GET.get('source') == 'live':
+        path = await LearningPath.objects.filter(pk=pk).afirst()
+        if path is None:
+            raise Http404
+        return json_response(await sync_to_async(live_path_progress)(request.user, path))
+    totals = await alesson_totals()
+    if pk not in totals:
+        raise Http404
+    completed = await PathProgress.objects.filter(
+        user=request.user, learning_path_id=pk
+    ).values_list('completed_count', flat=True).afirst()
+    return json_response(summary(totals[pk], completed or 0))
\ No newline at end of file
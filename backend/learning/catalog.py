@@ -0,0 +1,143 @@
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from core.cache import shared_cache
+from core.renderers import ORJSONRenderer
+
+VERSION_KEY = 'catalog:version'
+
+# Set inside deferred_catalog_bump(): a one-item list recording that a bump was asked for
+_pending_bump = ContextVar('pending_catalog_bump', default=None)
+
+def get_cache():
+    return caches[getattr(settings, 'CATALOG_CACHE_ALIAS', 'default')]
+
+def version_cache():
+    """Where the version lives: the catalog cache if it is shared (Redis), else the shared cache.
+
+    Entries in a per-process catalog cache are keyed by this version, so a bump
+    in one worker retires them in every worker.
+    """
+    cache = get_cache()
+    return shared_cache() if isinstance(cache, LocMemCache) else cache
+
+def check_catalog_cache(app_configs=None, **kwargs):
+    """Warn when several workers would each render and hold their own copy of the catalog."""
+    if getattr(settings, 'WEB_CONCURRENCY', 1) > 1 and isinstance(get_cache(), LocMemCache):
+        return [checks.Warning(
+            'The catalog cache is local memory, so every worker process renders the '
+            'catalog itself and keeps its own copy.',
+            hint='Set CATALOG_CACHE_URL to share one copy between workers.',
+            id='learning.W001',
+        )]
+    return []
+
+def get_catalog_version():
+    cache = version_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, timeout=None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+async def aget_catalog_version():
+    cache = version_cache()
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, 1, timeout=None)
+        version = await cache.aget(VERSION_KEY, 1)
+    return version
+
+def bump_catalog_version():
+    """Invalidate every cached catalog entry by moving to a new version."""
+    pending = _pending_bump.get()
+    if pending is not None:
+        pending[0] = True
+        return None
+    cache = version_cache()
+    try:
+        return cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, 2, timeout=None)
+        return cache.get(VERSION_KEY, 2)
+
+def bump_catalog_version_on_commit():
+    """Bump once the current transaction commits.
+
+    Bumping earlier lets a concurrent read rebuild an entry from pre-commit rows
+    and cache it, with no timeout, under the new version.
+    """
+    pending = _pending_bump.get()
+    if pending is not None:
+        pending[0] = True
+    else:
+        transaction.on_commit(bump_catalog_version)
+
+@contextmanager
+def deferred_catalog_bump():
+    """Coalesce the bumps made inside into one, sent when the transaction commits."""
+    pending = [False]
+    token = _pending_bump.set(pending)
+    try:
+        yield
+    finally:
+        _pending_bump.reset(token)
+    if pending[0]:
+        transaction.on_commit(bump_catalog_version)
+
+def catalog_key(version, *parts):
+    return ':'.join(['catalog', str(version)] + [str(part) for part in parts])
+
+def render_entry(data, link=None):
+    # Content hash, so clients keep getting 304s across bumps that didn't change this entry
+    body = ORJSONRenderer().render(data)
+    etag = '"%s"' % hashlib.sha1(body).hexdigest()
+    return body, etag, link
+
+def entry_response(request, body, etag, link=None):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        if '*' in etags or etag in etags:
+            response = HttpResponseNotModified()
+            response['ETag'] = etag
+            return response
+    response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    if link:
+        response['Link'] = link
+    return response
+
+def cached_catalog_response(request, parts, build):
+    """Serve a pre-rendered catalog entry, calling ``build()`` for ``(data, link)`` on a miss.
+
+    Hits touch only the cache: one read for the version, one for the entry.
+    """
+    cache = get_cache()
+    version = get_catalog_version()
+    key = catalog_key(version, *parts)
+    entry = cache.get(key)
+    if entry is None:
+        entry = render_entry(*build())
+        cache.set(key, entry, timeout=None)
+    return entry_response(request, *entry)
+
+async def acached_catalog_response(request, parts, build):
+    """Async ``cached_catalog_response``; only a miss leaves the event loop to run ``build``."""
+    cache = get_cache()
+    version = await aget_catalog_version()
+    key = catalog_key(version, *parts)
+    entry = await cache.aget(key)
+    if entry is None:
+        entry = render_entry(*await sync_to_async(build)())
+        await cache.aset(key, entry, timeout=None)
+    return entry_response(request, *entry)
\ No newline at end of file
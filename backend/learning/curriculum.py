@@ -0,0 +1,191 @@
+"""Bulk import of curriculum trees: paths, their modules and their lessons.
+
+A tree is ``{"paths": [{..., "modules": [{..., "lessons": [{...}]}]}]}`` in JSON
+or YAML, with model field names as keys. ``order`` defaults to the position in
+the list, and fields with a model default may be left out.
+
+Rows are matched by natural key: a path by title, a module by (path, title) and
+a lesson by (module, title). The whole tree is validated before anything is
+written. Changes are then applied with ``bulk_create``/``bulk_update`` in one
+transaction, and the catalog version is bumped once on commit. Paths missing
+from the tree are never touched. With ``prune``, modules and lessons of the
+imported paths that are missing from the tree are deleted, and their
+``user_progress`` goes with them (run ``rebuild_path_progress`` afterwards).
+"""
+import io
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from core.parsers import ORJSONParser, YAMLParser
+
+from .catalog import bump_catalog_version, deferred_catalog_bump
+from .models import LearningPath, Lesson, Module
+
+BATCH_SIZE = 500
+
+PATH_FIELDS = ('title', 'description', 'icon', 'level', 'age_range')
+MODULE_FIELDS = ('title', 'description', 'icon', 'order')
+LESSON_FIELDS = ('title', 'description', 'type', 'content', 'duration', 'xp_reward', 'difficulty', 'order')
+
+def load_tree(raw, format='json'):
+    """Parse curriculum bytes in ``format`` 'json' or 'yaml'."""
+    parser = YAMLParser() if format == 'yaml' else ORJSONParser()
+    return parser.parse(io.BytesIO(raw))
+
+def clean_node(model, names, children, node, where, position, errors):
+    if not isinstance(node, dict):
+        errors.append(f'{where}: Expected an object.')
+        return None
+    for name in sorted(set(node) - set(names) - {children}):
+        errors.append(f'{where}.{name}: Unknown field.')
+    values = {}
+    for name in names:
+        field = model._meta.get_field(name)
+        if name not in node:
+            if name == 'order':
+                values[name] = position
+            elif field.has_default():
+                values[name] = field.get_default()
+            else:
+                errors.append(f'{where}.{name}: This field is required.')
+            continue
+        try:
+            values[name] = field.clean(node[name], None)
+        except DjangoValidationError as exc:
+            errors.extend(f'{where}.{name}: {message}' for message in exc.messages)
+    return values
+
+def clean_list(model, names, children, nodes, where, errors):
+    """Clean sibling nodes into ``{title: (values, child_nodes)}``."""
+    if not isinstance(nodes, list):
+        errors.append(f'{where}: Expected a list.')
+        return {}
+    cleaned = {}
+    for index, node in enumerate(nodes):
+        at = f'{where}[{index}]'
+        values = clean_node(model, names, children, node, at, index + 1, errors)
+        if values is None or 'title' not in values:
+            continue
+        if values['title'] in cleaned:
+            errors.append(f'{at}.title: Duplicate title {values["title"]!r}.')
+            continue
+        cleaned[values['title']] = (values, node.get(children, []) if children else None)
+    return cleaned
+
+def validate_tree(tree):
+    """Check the whole tree in one pass and return it as nested ``{title: (values, children)}``.
+
+    Raises ``ValidationError`` listing every problem found, each prefixed with
+    where it is, e.g. ``paths[0].modules[2].lessons[5].type``.
+    """
+    errors = []
+    if not isinstance(tree, dict) or 'paths' not in tree:
+        raise ValidationError({'errors': ['Expected an object with a "paths" list.']})
+    paths = clean_list(LearningPath, PATH_FIELDS, 'modules', tree['paths'], 'paths', errors)
+    for p, (title, (values, modules)) in enumerate(paths.items()):
+        where = f'paths[{p}].modules'
+        modules = clean_list(Module, MODULE_FIELDS, 'lessons', modules, where, errors)
+        for m, (module_title, (module_values, lessons)) in enumerate(modules.items()):
+            modules[module_title] = (module_values, clean_list(
+                Lesson, LESSON_FIELDS, None, lessons, f'{where}[{m}].lessons', errors
+            ))
+        paths[title] = (values, modules)
+    if errors:
+        raise ValidationError({'errors': errors})
+    return paths
+
+def sync_rows(model, existing, wanted, report, prune, touch=None):
+    """Bring ``existing`` ``{key: row}`` in line with ``wanted`` ``{key: values}``.
+
+    Returns ``{key: row}`` for every wanted key, with primary keys set.
+    """
+    rows, to_create, to_update, changed = {}, [], [], set()
+    for key, values in wanted.items():
+        row = existing.pop(key, None)
+        if row is None:
+            row = model(**values)
+            to_create.append(row)
+        else:
+            names = [name for name, value in values.items() if getattr(row, name) != value]
+            if names:
+                for name in names:
+                    setattr(row, name, values[name])
+                if touch:
+                    setattr(row, touch, timezone.now())
+                    names.append(touch)
+                changed.update(names)
+                to_update.append(row)
+        rows[key] = row
+    model.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+    if to_update:
+        model.objects.bulk_update(to_update, sorted(changed), batch_size=BATCH_SIZE)
+    report['created'] = len(to_create)
+    report['updated'] = len(to_update)
+    report['unchanged'] = len(wanted) - len(to_create) - len(to_update)
+    report['deleted'] = 0
+    if prune and existing:
+        stale = [row.pk for row in existing.values()]
+        for start in range(0, len(stale), BATCH_SIZE):
+            model.objects.filter(pk__in=stale[start:start + BATCH_SIZE]).delete()
+        report['deleted'] = len(stale)
+    return rows
+
+def by_key(rows, key):
+    # Oldest row wins when a natural key is not unique in the database
+    return {key(row): row for row in sorted(rows, key=lambda row: row.pk, reverse=True)}
+
+def import_curriculum(tree, prune=False, dry_run=False):
+    """Validate ``tree`` and apply it; returns created/updated/unchanged/deleted counts per level."""
+    paths = validate_tree(tree)
+    report = {'paths': {}, 'modules': {}, 'lessons': {}, 'dry_run': dry_run}
+    with transaction.atomic(), deferred_catalog_bump():
+        path_rows = sync_rows(
+            LearningPath,
+            by_key(LearningPath.objects.filter(title__in=list(paths)), lambda row: row.title),
+            {title: values for title, (values, _) in paths.items()},
+            report['paths'], prune, touch='updated_at',
+        )
+        path_ids = [row.pk for row in path_rows.values()]
+
+        existing_lessons = by_key(
+            Lesson.objects.filter(module__learning_path_id__in=path_ids),
+            lambda row: (row.module_id, row.title),
+        )
+        module_rows = sync_rows(
+            Module,
+            by_key(Module.objects.filter(learning_path_id__in=path_ids), lambda row: (row.learning_path_id, row.title)),
+            {
+                (path_rows[title].pk, module_title): dict(values, learning_path_id=path_rows[title].pk)
+                for title, (_, modules) in paths.items()
+                for module_title, (values, _) in modules.items()
+            },
+            report['modules'], False,
+        )
+        sync_rows(
+            Lesson, existing_lessons,
+            {
+                (module_rows[path_rows[title].pk, module_title].pk, lesson_title): dict(
+                    values, module_id=module_rows[path_rows[title].pk, module_title].pk
+                )
+                for title, (_, modules) in paths.items()
+                for module_title, (_, lessons) in modules.items()
+                for lesson_title, (values, _) in lessons.items()
+            },
+            report['lessons'], prune,
+        )
+        if prune:
+            # Stale modules go last: their lessons were already deleted and counted above
+            existing_modules = Module.objects.filter(learning_path_id__in=path_ids).exclude(
+                pk__in=[row.pk for row in module_rows.values()]
+            )
+            report['modules']['deleted'] = existing_modules.delete()[1].get(Module._meta.label, 0)
+
+        if any(report[level][count] for level in ('paths', 'modules', 'lessons')
+               for count in ('created', 'updated', 'deleted')):
+            bump_catalog_version()
+        if dry_run:
+            transaction.set_rollback(True)
+    return report
\ No newline at end of file
@@ -0,0 +1,183 @@
+"""Server-side grading of the questions in a lesson's ``content``.
+
+Each lesson's ``questions`` are compiled into an ``AnswerKey`` once per
+catalog version in each process, so a submission is graded in one pass over a
+tuple of ``(id, kind, expected, points)`` without loading or walking the JSON
+content again. A question's ``answer`` is one of:
+
+* an option index, or the text of one of its ``options``: single choice;
+* a list of option indexes or texts: exactly those options;
+* a number, when there are no ``options``, within an optional ``tolerance``;
+* a string, plus any alternatives in ``accept``, ignoring case and spacing;
+* ``true`` or ``false``.
+
+``points`` weights a question (default 1) and questions without an answer are
+not graded. Submissions map question ids (their ``id``, else their position)
+to answers: option indexes for choice questions, otherwise the forms above.
+The API only ever serves ``public_content``, which drops ``ANSWER_FIELDS``.
+"""
+import threading
+
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from .catalog import get_catalog_version
+from .models import Lesson, QuizAttempt
+
+CHOICE, MULTIPLE, NUMBER, TEXT = range(4)
+
+# Question keys that give the answer away; kept out of every API response
+ANSWER_FIELDS = frozenset(('answer', 'accept', 'tolerance'))
+
+def public_content(content):
+    """``content`` as clients may see it: the questions without their answers."""
+    questions = content.get('questions') if isinstance(content, dict) else None
+    if not isinstance(questions, list):
+        return content
+    return {**content, 'questions': [
+        {key: value for key, value in question.items() if key not in ANSWER_FIELDS}
+        if isinstance(question, dict) else question
+        for question in questions
+    ]}
+
+def normalize_text(value):
+    return ' '.join(value.split()).casefold()
+
+def option_index(options, answer):
+    return options.index(answer) if isinstance(answer, str) and answer in options else answer
+
+def compile_question(position, question):
+    """``(id, kind, expected, points)``, or ``None`` if the question cannot be graded."""
+    if not isinstance(question, dict) or question.get('answer') is None:
+        return None
+    answer = question['answer']
+    options = question.get('options') or []
+    points = question.get('points', 1)
+    if not isinstance(points, (int, float)) or isinstance(points, bool) or points <= 0:
+        return None
+    question_id = str(question.get('id', position))
+    if isinstance(answer, list):
+        expected = frozenset(option_index(options, item) for item in answer)
+        return question_id, MULTIPLE, expected, points
+    if isinstance(answer, str) and answer not in options:
+        accept = question.get('accept') or []
+        expected = frozenset(normalize_text(item) for item in [answer, *accept] if isinstance(item, str))
+        return question_id, TEXT, expected, points
+    if isinstance(answer, (int, float)) and not isinstance(answer, bool) and not options:
+        return question_id, NUMBER, (answer, abs(as_number(question.get('tolerance')) or 0)), points
+    return question_id, CHOICE, option_index(options, answer), points
+
+def as_number(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return value if isinstance(value, (int, float)) else None
+
+class AnswerKey:
+    """The gradable questions of one lesson, in content order."""
+    __slots__ = ('questions', 'total')
+
+    def __init__(self, questions):
+        self.questions = tuple(questions)
+        self.total = sum(question[3] for question in self.questions)
+
+    @classmethod
+    def compile(cls, content):
+        questions = content.get('questions') if isinstance(content, dict) else None
+        if not isinstance(questions, list):
+            return cls(())
+        compiled = (compile_question(position, question) for position, question in enumerate(questions))
+        return cls(question for question in compiled if question is not None)
+
+    def grade(self, answers):
+        """``(score, results)``: percent of points earned, and ``{id: correct}`` with ``None`` for unanswered."""
+        get = answers.get
+        earned = 0
+        results = {}
+        for question_id, kind, expected, points in self.questions:
+            given = get(question_id)
+            if given is None:
+                results[question_id] = None
+                continue
+            if kind == CHOICE:
+                # type() keeps True from matching option 1 and 1.0 from matching an index
+                correct = type(given) is type(expected) and given == expected
+            elif kind == TEXT:
+                correct = isinstance(given, str) and normalize_text(given) in expected
+            elif kind == MULTIPLE:
+                try:
+                    correct = isinstance(given, list) and frozenset(given) == expected
+                except TypeError:
+                    correct = False
+            else:
+                value, tolerance = expected
+                given = as_number(given)
+                correct = given is not None and abs(given - value) <= tolerance
+            if correct:
+                earned += points
+            results[question_id] = correct
+        return round(earned / self.total * 100, 1), results
+
+_keys = {}
+_keys_version = None
+_keys_lock = threading.Lock()
+
+def get_answer_key(lesson_id):
+    """The lesson's ``AnswerKey``, or ``None`` if it has nothing to grade.
+
+    Only a miss reads ``content``; keys are dropped when the catalog version moves.
+    """
+    global _keys_version
+    version = get_catalog_version()
+    with _keys_lock:
+        if version != _keys_version:
+            _keys.clear()
+            _keys_version = version
+        key = _keys.get(lesson_id)
+    if key is None:
+        content = Lesson.objects.filter(pk=lesson_id).values_list('content', flat=True).first()
+        key = AnswerKey.compile(content)
+        with _keys_lock:
+            if version == _keys_version:
+                _keys[lesson_id] = key
+    return key if key.questions else None
+
+def repeat_grade(graded):
+    """What a resubmission to a completed lesson gets back: the total score only.
+
+    Per-question results would let a client probe the answer key one question at a time.
+    """
+    return {'score': graded['score']} if graded else {}
+
+def attempt_event(user_id, lesson_id, score, results, submitted_at):
+    return {
+        'user_id': user_id,
+        'lesson_id': lesson_id,
+        'score': score,
+        'correct': sum(1 for correct in results.values() if correct),
+        'answered': sum(1 for correct in results.values() if correct is not None),
+        'results': results,
+        'submitted_at': submitted_at,
+    }
+
+def record_attempt(user_id, lesson_id, score, results, submitted_at):
+    QuizAttempt.objects.create(**attempt_event(user_id, lesson_id, score, results, submitted_at))
+
+def flush_attempts(events):
+    """Persist buffered graded submissions; ``submitted_at`` arrives as an ISO string.
+
+    Submissions already stored by an earlier flush of the same journal are skipped.
+    """
+    attempts = [QuizAttempt(**dict(event, submitted_at=parse_datetime(event['submitted_at']))) for event in events]
+    with transaction.atomic():
+        stored = set(QuizAttempt.objects.filter(
+            submitted_at__in={attempt.submitted_at for attempt in attempts}
+        ).values_list('user_id', 'lesson_id', 'submitted_at'))
+        QuizAttempt.objects.bulk_create([
+            attempt for attempt in attempts
+            if (attempt.user_id, attempt.lesson_id, attempt.submitted_at) not in stored
+        ])
\ No newline at end of file
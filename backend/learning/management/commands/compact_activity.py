@@ -0,0 +1,17 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from learning.activity import compact
+
+class Command(BaseCommand):
+    help = (
+        'Bound study-history storage: drop activity events past ACTIVITY_RETENTION["EVENTS"] days, '
+        'fold older day rollups into weeks and older week rollups into months. Safe to re-run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only count what would be folded.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(json.dumps(compact(dry_run=options['dry_run']), indent=2))
\ No newline at end of file
@@ -0,0 +1,38 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ParseError, ValidationError
+
+from learning.curriculum import import_curriculum, load_tree
+
+class Command(BaseCommand):
+    help = (
+        'Create and update learning paths, modules and lessons from a JSON or YAML curriculum '
+        'tree in one transaction. Rows are matched by title within their parent.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', help='Curriculum file (.json, .yaml or .yml), or - for stdin.')
+        parser.add_argument('--format', choices=['json', 'yaml'], help='Defaults to the file extension.')
+        parser.add_argument(
+            '--prune', action='store_true',
+            help='Delete modules and lessons of the imported paths that are not in the file.',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Report changes without applying them.')
+
+    def handle(self, *args, **options):
+        path = options['file']
+        format = options['format'] or ('yaml' if path.endswith(('.yaml', '.yml')) else 'json')
+        if path == '-':
+            raw = sys.stdin.buffer.read()
+        else:
+            with open(path, 'rb') as file:
+                raw = file.read()
+        try:
+            report = import_curriculum(load_tree(raw, format), prune=options['prune'], dry_run=options['dry_run'])
+        except ParseError as exc:
+            raise CommandError(exc.detail)
+        except ValidationError as exc:
+            raise CommandError('\n'.join(exc.detail['errors']))
+        self.stdout.write(json.dumps(report, indent=2))
\ No newline at end of file
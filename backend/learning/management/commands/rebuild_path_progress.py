@@ -0,0 +1,79 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, Max, Sum
+
+from learning.models import PathProgress, UserProgress
+from users.models import User
+
+class Command(BaseCommand):
+    help = 'Rebuild or reconcile PathProgress counters from user_progress, in user chunks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report counters that differ from user_progress; write nothing.',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        check = options['check']
+        totals = {'created': 0, 'updated': 0, 'deleted': 0, 'users': 0}
+        user_ids = User.objects.order_by('id').values_list('id', flat=True)
+
+        chunk = []
+        for user_id in user_ids.iterator(chunk_size=chunk_size):
+            chunk.append(user_id)
+            if len(chunk) >= chunk_size:
+                self.reconcile(chunk, check, totals)
+                chunk = []
+        if chunk:
+            self.reconcile(chunk, check, totals)
+
+        verb = 'Found' if check else 'Applied'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {totals['created']} missing, {totals['updated']} stale and "
+            f"{totals['deleted']} orphaned counters across {totals['users']} users"
+        ))
+
+    def reconcile(self, user_ids, check, totals):
+        expected = {
+            (row['user_id'], row['path_id']): row
+            for row in UserProgress.objects.filter(user_id__in=user_ids, completed=True)
+            .values('user_id', path_id=F('lesson__module__learning_path_id'))
+            .annotate(count=Count('id'), xp=Sum('lesson__xp_reward'), last=Max('completed_at'))
+            .order_by()
+        }
+        with transaction.atomic():
+            existing = {
+                (row.user_id, row.learning_path_id): row
+                for row in PathProgress.objects.select_for_update().filter(user_id__in=user_ids)
+            }
+            to_create, to_update = [], []
+            for key, row in expected.items():
+                counter = existing.pop(key, None)
+                if counter is None:
+                    to_create.append(PathProgress(
+                        user_id=key[0], learning_path_id=key[1], completed_count=row['count'],
+                        total_xp=row['xp'] or 0, last_activity=row['last'],
+                    ))
+                elif (counter.completed_count, counter.total_xp, counter.last_activity) != (
+                    row['count'], row['xp'] or 0, row['last']
+                ):
+                    counter.completed_count = row['count']
+                    counter.total_xp = row['xp'] or 0
+                    counter.last_activity = row['last']
+                    to_update.append(counter)
+            to_delete = [counter.pk for counter in existing.values()]
+
+            totals['users'] += len(user_ids)
+            totals['created'] += len(to_create)
+            totals['updated'] += len(to_update)
+            totals['deleted'] += len(to_delete)
+            if check:
+                return
+            PathProgress.objects.bulk_create(to_create)
+            PathProgress.objects.bulk_update(
+                to_update, ['completed_count', 'total_xp', 'last_activity']
+            )
+            PathProgress.objects.filter(pk__in=to_delete).delete()
\ No newline at end of file
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.2 on 2026-10-18 09:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0003_path_progress'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userprogress',
+            index=models.Index(fields=['completed_at'], name='progress_completed_at_idx'),
+        ),
+    ]
@@ -1,6 +1,21 @@
 from django.db import models
 from users.models import User
 
+class LearningPathQuerySet(models.QuerySet):
+    def with_curriculum(self, depth=2, lesson_fields=None):
+        """Prefetch modules and lessons in one query per level, ordered by ``order``."""
+        if depth < 1:
+            return self
+        modules = Module.objects.order_by('order', 'id')
+        if depth >= 2:
+            lessons = Lesson.objects.order_by('order', 'id')
+            if lesson_fields is not None:
+                lessons = lessons.only('id', 'module', *lesson_fields)
+            modules = modules.prefetch_related(
+                models.Prefetch('lessons', queryset=lessons)
+            )
+        return self.prefetch_related(models.Prefetch('modules', queryset=modules))
+
 class LearningPath(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
@@ -13,6 +28,8 @@ class LearningPath(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = LearningPathQuerySet.as_manager()
+
     class Meta:
         db_table = 'learning_paths'
 
@@ -49,6 +66,9 @@ class Lesson(models.Model):
     class Meta:
         db_table = 'lessons'
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['module', 'order'], name='lessons_module_order_idx'),
+        ]
 
 class UserProgress(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -60,4 +80,68 @@ class UserProgress(models.Model):
 
     class Meta:
         db_table = 'user_progress'
-        unique_together = ['user', 'lesson']
\ No newline at end of file
+        unique_together = ['user', 'lesson']
+        indexes = [
+            models.Index(fields=['user', 'completed', 'lesson'], name='progress_user_done_lesson_idx'),
+            models.Index(fields=['completed_at'], name='progress_completed_at_idx'),
+        ]
+
+class PathProgress(models.Model):
+    """Per-user, per-path completion counters kept current by ``LessonViewSet.complete``."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    learning_path = models.ForeignKey(LearningPath, on_delete=models.CASCADE)
+    completed_count = models.IntegerField(default=0)
+    total_xp = models.IntegerField(default=0)
+    last_activity = models.DateTimeField(null=True)
+
+    class Meta:
+        db_table = 'path_progress'
+        unique_together = ['user', 'learning_path']
+
+class ActivityEvent(models.Model):
+    """Append-only study time, one row per completion; ``compact_activity`` drops old rows."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    lesson = models.ForeignKey(Lesson, on_delete=models.SET_NULL, null=True)
+    seconds = models.IntegerField()
+    xp = models.IntegerField(default=0)
+    occurred_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'activity_events'
+        indexes = [
+            models.Index(fields=['occurred_at'], name='activity_events_occurred_idx'),
+        ]
+
+class ActivityRollup(models.Model):
+    """Per-user study totals for one local day, or a week or month once compacted."""
+    DAY, WEEK, MONTH = 'day', 'week', 'month'
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    period = models.CharField(max_length=5, choices=[(DAY, 'Day'), (WEEK, 'Week'), (MONTH, 'Month')])
+    start = models.DateField()  # first local date of the bucket
+    seconds = models.IntegerField(default=0)
+    lessons = models.IntegerField(default=0)
+    xp = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'activity_rollups'
+        unique_together = ['user', 'period', 'start']
+        indexes = [
+            models.Index(fields=['period', 'start'], name='activity_rollups_period_idx'),
+        ]
+
+class QuizAttempt(models.Model):
+    """One graded submission; ``results`` maps question id to correct, or null if unanswered."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    lesson = models.ForeignKey(Lesson, on_delete=models.CASCADE)
+    score = models.FloatField()  # percent of points
+    correct = models.IntegerField()
+    answered = models.IntegerField()
+    results = models.JSONField()
+    submitted_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'quiz_attempts'
+        indexes = [
+            models.Index(fields=['submitted_at'], name='quiz_attempts_submitted_idx'),
+        ]
\ No newline at end of file
@@ -0,0 +1,167 @@
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, FilteredRelation, Q
+from django.utils.dateparse import parse_datetime
+
+from gamification.ledger import award_xp_batch
+from gamification.signals import lesson_completed, send_on_commit
+
+from .activity import record_activity_batch
+from .catalog import aget_catalog_version, catalog_key, get_cache, get_catalog_version
+from .models import LearningPath, Lesson, PathProgress, UserProgress
+
+def summary(total, completed):
+    return {
+        'total_lessons': total,
+        'completed_lessons': completed,
+        'completion_percentage': (completed / total * 100) if total > 0 else 0,
+    }
+
+def lesson_totals():
+    """``{path_id: lesson_count}`` for the whole catalog, cached per catalog version."""
+    cache = get_cache()
+    key = catalog_key(get_catalog_version(), 'lesson_totals')
+    totals = cache.get(key)
+    if totals is None:
+        totals = dict(
+            LearningPath.objects.annotate(total=Count('modules__lessons'))
+            .order_by('id').values_list('id', 'total')
+        )
+        cache.set(key, totals, timeout=None)
+    return totals
+
+async def alesson_totals():
+    cache = get_cache()
+    totals = await cache.aget(catalog_key(await aget_catalog_version(), 'lesson_totals'))
+    if totals is None:
+        totals = await sync_to_async(lesson_totals)()
+    return totals
+
+def path_progress(user, path, live=False):
+    """Progress for one path: one counter row lookup, or one aggregate with ``live``."""
+    if live:
+        return live_path_progress(user, path)
+    completed = PathProgress.objects.filter(
+        user_id=user.pk, learning_path=path
+    ).values_list('completed_count', flat=True).first()
+    return summary(lesson_totals().get(path.pk, 0), completed or 0)
+
+def user_path_progress(user, live=False):
+    """Progress for every learning path."""
+    if live:
+        return live_user_path_progress(user)
+    completed = dict(
+        PathProgress.objects.filter(user_id=user.pk).values_list('learning_path_id', 'completed_count')
+    )
+    return [
+        {'learning_path': path_id, **summary(total, completed.get(path_id, 0))}
+        for path_id, total in lesson_totals().items()
+    ]
+
+def live_path_progress(user, path):
+    """Total and completed lessons for one path in a single aggregate query."""
+    counts = Lesson.objects.filter(module__learning_path=path).annotate(
+        done=FilteredRelation(
+            'userprogress',
+            condition=Q(userprogress__user_id=user.pk, userprogress__completed=True),
+        )
+    ).aggregate(total=Count('id'), completed=Count('done__id'))
+    return summary(counts['total'], counts['completed'])
+
+def live_user_path_progress(user):
+    """Progress for every learning path, grouped in a single query."""
+    rows = LearningPath.objects.annotate(
+        done=FilteredRelation(
+            'modules__lessons__userprogress',
+            condition=Q(
+                modules__lessons__userprogress__user_id=user.pk,
+                modules__lessons__userprogress__completed=True,
+            ),
+        )
+    ).values('id').annotate(
+        total=Count('modules__lessons'), completed=Count('done__id')
+    ).order_by('id')
+    return [
+        {'learning_path': row['id'], **summary(row['total'], row['completed'])}
+        for row in rows
+    ]
+
+def record_completion(user, lesson, completed_at):
+    """Bump the user's counters for ``lesson``'s path; call inside the completing transaction."""
+    add_path_progress(user.pk, lesson.module.learning_path_id, 1, lesson.xp_reward, completed_at)
+
+def add_path_progress(user_id, path_id, count, xp, last_activity):
+    counters = PathProgress.objects.filter(user_id=user_id, learning_path_id=path_id)
+    changes = {
+        'completed_count': F('completed_count') + count,
+        'total_xp': F('total_xp') + xp,
+        'last_activity': last_activity,
+    }
+    if counters.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            PathProgress.objects.create(
+                user_id=user_id, learning_path_id=path_id, completed_count=count,
+                total_xp=xp, last_activity=last_activity,
+            )
+    except IntegrityError:
+        # A concurrent completion created the row first
+        counters.update(**changes)
+
+def flush_completions(events):
+    """Persist buffered lesson completions (progress rows, path counters, XP) in one transaction.
+
+    Each completion is claimed by locking its not yet completed progress row,
+    so a flush that overlaps another (or a replay of the same journal) skips
+    the completions already counted instead of adding them to the counters twice.
+    """
+    with transaction.atomic():
+        UserProgress.objects.bulk_create([
+            UserProgress(user_id=event['user_id'], lesson_id=event['lesson_id']) for event in events
+        ], ignore_conflicts=True)
+        rows = {
+            (row.user_id, row.lesson_id): row
+            for row in UserProgress.objects.select_for_update().filter(
+                user_id__in={event['user_id'] for event in events},
+                lesson_id__in={event['lesson_id'] for event in events},
+                completed=False,
+            ).order_by('id')
+        }
+        to_update, done = [], []
+        for event in events:
+            row = rows.pop((event['user_id'], event['lesson_id']), None)
+            if row is None:
+                continue
+            row.completed = True
+            row.score = event['score']
+            row.time_spent = event['time_spent']
+            row.completed_at = parse_datetime(event['completed_at'])
+            to_update.append(row)
+            done.append(event)
+        UserProgress.objects.bulk_update(to_update, ['completed', 'score', 'time_spent', 'completed_at'])
+
+        counters = {}
+        for event in done:
+            key = (event['user_id'], event['path_id'])
+            completed_at = parse_datetime(event['completed_at'])
+            count, xp, last = counters.get(key, (0, 0, completed_at))
+            counters[key] = (count + 1, xp + event['xp_reward'], max(last, completed_at))
+        for (user_id, path_id), (count, xp, last) in counters.items():
+            add_path_progress(user_id, path_id, count, xp, last)
+        record_activity_batch([
+            (event['user_id'], event['lesson_id'], event['time_spent'], event['xp_reward'],
+             parse_datetime(event['completed_at']))
+            for event in done
+        ])
+
+        for event in done:
+            send_on_commit(
+                lesson_completed, user_id=event['user_id'], lesson_id=event['lesson_id'],
+                path_id=event['path_id'],
+            )
+        award_xp_batch([
+            (event['user_id'], event['xp_reward'], 'lesson',
+             f"lesson:{event['lesson_id']}:user:{event['user_id']}")
+            for event in done
+        ])
\ No newline at end of file
@@ -0,0 +1,194 @@
+"""Next-lesson recommendations scored with NumPy over the whole catalog.
+
+``LessonFeatures`` holds one array per lesson attribute, built once per catalog
+version in each process. A recommendation is then a few vector operations over
+every lesson, weighted by ``WEIGHTS``:
+
+* difficulty: a Gaussian around a target difficulty. The target is the mean
+  difficulty of the user's last ``RECENT`` completions, moved up or down by
+  how far their scores are from ``TARGET_SCORE`` and by ``learning_speed``;
+* style: ``STYLE_AFFINITY`` of the lesson type for ``preferred_learning_style``,
+  or ``FALLBACK_AFFINITY`` for a type missing from the model's choices;
+* time: 1 when the lesson fits in what is left of today's ``daily_goal``, and
+  proportionally less when it does not;
+* sequence: favours the first lessons the user has not done in each path,
+  and paths they have already started.
+
+Completed lessons are never recommended.
+"""
+import threading
+import zoneinfo
+from datetime import datetime, time
+
+import numpy as np
+from django.db.models import F
+from django.utils import timezone
+
+from .catalog import get_catalog_version
+from .models import Lesson, UserProgress
+
+TYPES = tuple(value for value, _ in Lesson._meta.get_field('type').choices)
+
+STYLE_AFFINITY = {
+    'visual': {'video': 1.0, 'interactive': 0.8, 'quiz': 0.4, 'project': 0.5},
+    'practical': {'video': 0.3, 'interactive': 0.9, 'quiz': 0.5, 'project': 1.0},
+    'theoretical': {'video': 0.8, 'interactive': 0.5, 'quiz': 0.9, 'project': 0.4},
+}
+FALLBACK_AFFINITY = 0.5
+SPEED_OFFSET = {'slow': -0.25, 'medium': 0.0, 'fast': 0.25}
+WEIGHTS = {'difficulty': 0.4, 'style': 0.25, 'time': 0.2, 'sequence': 0.15}
+
+RECENT = 20
+TARGET_SCORE = 0.7
+DEFAULT_DIFFICULTY = 1.0
+DIFFICULTY_WIDTH = 0.5
+SEQUENCE_DECAY = 3.0  # in lessons past the first incomplete one
+UNSTARTED_PATH = 0.5  # sequence factor for paths with no completions
+MIN_REMAINING = 5  # minutes still worth filling once the daily goal is met
+
+# Column of each type in the affinity arrays; the last column is for unknown types
+_TYPE_COLUMN = {name: index for index, name in enumerate(TYPES)}
+_AFFINITY = {
+    style: np.array([affinities[name] for name in TYPES] + [FALLBACK_AFFINITY])
+    for style, affinities in STYLE_AFFINITY.items()
+}
+
+class LessonFeatures:
+    """Per-lesson arrays sorted by lesson id."""
+
+    def __init__(self, version):
+        self.version = version
+        rows = list(Lesson.objects.order_by(
+            'module__learning_path_id', 'module__order', 'module_id', 'order', 'id'
+        ).values_list('id', 'title', 'type', 'difficulty', 'duration', 'module_id', F('module__learning_path_id')))
+        self.path_ids, path_start, path_index = np.unique(
+            np.array([row[6] for row in rows], dtype=np.int64), return_index=True, return_inverse=True,
+        )
+        # Rows come grouped by path in curriculum order, so this is each lesson's place in its path
+        position = np.arange(len(rows)) - path_start[path_index]
+
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        by_id = np.argsort(ids)
+        self.ids = ids[by_id]
+        self.titles = [rows[index][1] for index in by_id]
+        self.type_names = [rows[index][2] for index in by_id]
+        self.types = np.array([_TYPE_COLUMN.get(row[2], len(TYPES)) for row in rows], dtype=np.intp)[by_id]
+        self.difficulty = np.array([row[3] for row in rows], dtype=np.float64)[by_id]
+        self.duration = np.maximum(np.array([row[4] for row in rows], dtype=np.float64), 1)[by_id]
+        self.module_ids = np.array([row[5] for row in rows], dtype=np.int64)[by_id]
+        self.path_index = path_index[by_id]
+        self.position = position[by_id].astype(np.float64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def rows_of(self, lesson_ids):
+        """Row indexes of ``lesson_ids``, dropping ids no longer in the catalog."""
+        lesson_ids = np.asarray(lesson_ids, dtype=np.int64)
+        rows = np.searchsorted(self.ids, lesson_ids)
+        found = rows < len(self.ids)
+        found[found] = self.ids[rows[found]] == lesson_ids[found]
+        return rows[found]
+
+    def score(self, profile):
+        """Scores for every lesson; completed lessons get ``-inf``."""
+        completed = np.zeros(len(self), dtype=bool)
+        completed[profile['completed']] = True
+
+        difficulty = np.exp(-np.square((self.difficulty - profile['target']) / DIFFICULTY_WIDTH))
+        style = _AFFINITY.get(profile['style'], _AFFINITY['visual'])[self.types]
+        fit = np.minimum(profile['remaining'] / self.duration, 1)
+
+        # First incomplete position per path; lessons before it were done out of order
+        frontier = np.full(len(self.path_ids), np.inf)
+        np.minimum.at(frontier, self.path_index[~completed], self.position[~completed])
+        started = np.full(len(self.path_ids), UNSTARTED_PATH)
+        started[self.path_index[completed]] = 1
+        behind = np.maximum(self.position - frontier[self.path_index], 0)
+        sequence = np.exp(-behind / SEQUENCE_DECAY) * started[self.path_index]
+
+        scores = (
+            WEIGHTS['difficulty'] * difficulty + WEIGHTS['style'] * style
+            + WEIGHTS['time'] * fit + WEIGHTS['sequence'] * sequence
+        )
+        scores[completed] = -np.inf
+        return scores
+
+    def top(self, scores, limit):
+        """Row indexes of the ``limit`` best finite scores, best first."""
+        limit = min(limit, int(np.isfinite(scores).sum()))
+        if limit <= 0:
+            return np.empty(0, dtype=np.intp)
+        best = np.argpartition(-scores, limit - 1)[:limit]
+        return best[np.argsort(-scores[best], kind='stable')]
+
+_features = None
+_features_lock = threading.Lock()
+
+def get_lesson_features():
+    """Lesson arrays for the current catalog version, rebuilt after any catalog change."""
+    global _features
+    version = get_catalog_version()
+    with _features_lock:
+        if _features is None or _features.version != version:
+            _features = LessonFeatures(version)
+        return _features
+
+def build_profile(user, features, progress, now=None):
+    """Scoring inputs from ``user`` and their completed ``(lesson_id, score, time_spent, completed_at)``.
+
+    ``progress`` must be newest first.
+    """
+    now = now or timezone.now()
+    completed = features.rows_of([row[0] for row in progress])
+
+    target = DEFAULT_DIFFICULTY
+    recent = progress[:RECENT]
+    if recent:
+        rows = features.rows_of([row[0] for row in recent])
+        if len(rows):
+            target = float(features.difficulty[rows].mean())
+        scores = np.array([row[1] for row in recent if row[1] is not None], dtype=np.float64)
+        if len(scores):
+            # Scores may be fractions or percentages
+            scores = np.where(scores > 1, scores / 100, scores)
+            target += float(scores.mean()) - TARGET_SCORE
+    target += SPEED_OFFSET.get(user.learning_speed, 0.0)
+
+    try:
+        tz = zoneinfo.ZoneInfo(user.timezone)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        tz = zoneinfo.ZoneInfo('UTC')
+    midnight = datetime.combine(now.astimezone(tz).date(), time.min, tzinfo=tz)
+    spent_today = sum(row[2] or 0 for row in progress if row[3] is not None and row[3] >= midnight) / 60
+    return {
+        'completed': completed,
+        'target': target,
+        'style': user.preferred_learning_style,
+        'remaining': max(user.daily_goal - spent_today, MIN_REMAINING),
+    }
+
+def recommend(user, limit=10, path_id=None):
+    """The ``limit`` best next lessons for ``user``, optionally within one path."""
+    features = get_lesson_features()
+    progress = list(
+        UserProgress.objects.filter(user_id=user.pk, completed=True)
+        .order_by(F('completed_at').desc(nulls_last=True))
+        .values_list('lesson_id', 'score', 'time_spent', 'completed_at')
+    )
+    scores = features.score(build_profile(user, features, progress))
+    if path_id is not None:
+        scores[features.path_ids[features.path_index] != path_id] = -np.inf
+    return [
+        {
+            'id': int(features.ids[row]),
+            'title': features.titles[row],
+            'type': features.type_names[row],
+            'difficulty': float(features.difficulty[row]),
+            'duration': int(features.duration[row]),
+            'module': int(features.module_ids[row]),
+            'learning_path': int(features.path_ids[features.path_index[row]]),
+            'score': round(float(scores[row]), 4),
+        }
+        for row in features.top(scores, limit)
+    ]
\ No newline at end of file
@@ -1,19 +1,27 @@
 from rest_framework import serializers
+from core.serializers import DynamicFieldsMixin, ValuesSerializer
+from .grading import public_content
 from .models import LearningPath, Module, Lesson, UserProgress
 
-class LessonSerializer(serializers.ModelSerializer):
+class LessonSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Lesson
         fields = '__all__'
 
-class ModuleSerializer(serializers.ModelSerializer):
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if 'content' in data:
+            data['content'] = public_content(data['content'])
+        return data
+
+class ModuleSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     lessons = LessonSerializer(many=True, read_only=True)
 
     class Meta:
         model = Module
         fields = '__all__'
 
-class LearningPathSerializer(serializers.ModelSerializer):
+class LearningPathSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     modules = ModuleSerializer(many=True, read_only=True)
 
     class Meta:
@@ -23,4 +31,18 @@ class LearningPathSerializer(serializers.ModelSerializer):
 class UserProgressSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserProgress
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+class LessonValuesSerializer(ValuesSerializer):
+    model = Lesson
+    ordering = ('order', 'id')
+    converters = {'content': public_content}
+
+class ModuleValuesSerializer(ValuesSerializer):
+    model = Module
+    related = {'lessons': (LessonValuesSerializer, 'module')}
+    ordering = ('order', 'id')
+
+class LearningPathValuesSerializer(ValuesSerializer):
+    model = LearningPath
+    related = {'modules': (ModuleValuesSerializer, 'learning_path')}
\ No newline at end of file
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .catalog import bump_catalog_version_on_commit
+from .models import LearningPath, Lesson, Module
+
+@receiver([post_save, post_delete], sender=LearningPath)
+@receiver([post_save, post_delete], sender=Module)
+@receiver([post_save, post_delete], sender=Lesson)
+def invalidate_catalog(sender, **kwargs):
+    bump_catalog_version_on_commit()
\ No newline at end of file
@@ -0,0 +1,365 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.cache.backends.db import DatabaseCache
+from django.utils import timezone
+from django.db import transaction
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core import writebehind
+from gamification.models import XPEvent
+from users.models import User
+
+from .activity import compact, history_buckets
+from .catalog import VERSION_KEY, check_catalog_cache, get_cache, get_catalog_version
+from .grading import flush_attempts, get_answer_key
+from .models import (
+    ActivityEvent, ActivityRollup, LearningPath, Lesson, Module, PathProgress, QuizAttempt, UserProgress,
+)
+from .progress import flush_completions
+from .recommendations import recommend
+
+class CatalogVersionTests(TestCase):
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        path = LearningPath.objects.create(title='P', description='', icon='', level='beginner', age_range='8-12')
+        module = Module.objects.create(learning_path=path, title='M', description='', icon='', order=0)
+        self.lesson = Lesson.objects.create(module=module, title='L', description='', type='video', content={},
+                                            duration=5, xp_reward=10, order=0)
+
+    def test_bump_waits_for_commit(self):
+        version = get_catalog_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.lesson.title = 'Renamed'
+                self.lesson.save()
+                self.assertEqual(get_catalog_version(), version)
+            self.assertEqual(get_catalog_version(), version)
+        self.assertGreater(get_catalog_version(), version)
+
+    def test_rolled_back_change_keeps_version(self):
+        version = get_catalog_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.lesson.delete()
+                transaction.set_rollback(True)
+        self.assertEqual(get_catalog_version(), version)
+
+    def test_bump_in_another_worker_process(self):
+        self.lesson.content = {'questions': [{'id': 'a', 'options': ['x', 'y'], 'answer': 0}]}
+        self.lesson.save()
+        self.assertEqual(get_answer_key(self.lesson.pk).grade({'a': 0})[0], 100)
+        # The other worker edits the answer and bumps the version in the shared table
+        Lesson.objects.filter(pk=self.lesson.pk).update(
+            content={'questions': [{'id': 'a', 'options': ['x', 'y'], 'answer': 1}]}
+        )
+        DatabaseCache('shared_cache', {}).incr(VERSION_KEY)
+        self.assertEqual(get_answer_key(self.lesson.pk).grade({'a': 0})[0], 0)
+
+    def test_check_warns_about_a_per_process_catalog_with_several_workers(self):
+        self.assertEqual(check_catalog_cache(), [])
+        with override_settings(WEB_CONCURRENCY=2):
+            self.assertEqual([warning.id for warning in check_catalog_cache()], ['learning.W001'])
+
+class CatalogQueryCountTests(TestCase):
+    """The curriculum endpoints must not issue queries per path, module or lesson."""
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.user = User.objects.create_user('reader', 'reader@example.com', 'password')
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {RefreshToken.for_user(self.user).access_token}'
+        # Loads the user into the authentication cache and stores the catalog version
+        self.client.get('/api/users/me/')
+        get_catalog_version()
+
+    def add_paths(self, count, modules=3, lessons=4):
+        for p in range(count):
+            path = LearningPath.objects.create(title=f'P{p}', description='', icon='', level='beginner', age_range='8-12')
+            for m in range(modules):
+                module = Module.objects.create(learning_path=path, title=f'M{m}', description='', icon='', order=m)
+                Lesson.objects.bulk_create(
+                    Lesson(module=module, title=f'L{l}', description='', type='video', content={},
+                           duration=5, xp_reward=10, order=l)
+                    for l in range(lessons)
+                )
+        return path
+
+    def get(self, url, queries):
+        # A catalog cache miss, which builds the entry from the database
+        get_cache().clear()
+        with self.assertNumQueries(queries):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_list(self):
+        for paths in (2, 6):
+            self.add_paths(paths)
+            # The shared catalog version, then paths, modules and lessons;
+            # the user comes from the authentication cache
+            data = self.get('/api/learning/paths/', 4).json()
+            self.assertEqual(len(data[0]['modules'][0]['lessons']), 4)
+            self.get('/api/learning/paths/?depth=1', 3)
+            self.get('/api/learning/paths/?depth=0', 2)
+            self.get('/api/learning/paths/?fields=id,modules.lessons.title', 4)
+
+    def test_detail(self):
+        for modules in (2, 6):
+            path = self.add_paths(1, modules=modules)
+            data = self.get(f'/api/learning/paths/{path.pk}/', 4).json()
+            self.assertEqual(len(data['modules']), modules)
+            self.get(f'/api/learning/paths/{path.pk}/?depth=1', 3)
+            self.get(f'/api/learning/paths/{path.pk}/?fields=title,modules.title', 3)
+
+    def test_cached_list(self):
+        self.add_paths(3)
+        self.client.get('/api/learning/paths/')
+        # The rendered body comes from the catalog cache; only the version is read
+        with self.assertNumQueries(1):
+            self.client.get('/api/learning/paths/')
+
+class GradingTests(TestCase):
+    content = {'questions': [
+        {'id': 'a', 'prompt': 'Pick one', 'options': ['x', 'y', 'z'], 'answer': 1},
+        {'id': 'b', 'prompt': 'Spell it', 'answer': 'Python', 'accept': ['python3']},
+        {'id': 'c', 'prompt': 'Pi', 'answer': 3.14, 'tolerance': 0.01},
+    ]}
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.user = User.objects.create_user('student', 'student@example.com', 'password')
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {RefreshToken.for_user(self.user).access_token}'
+        self.path = LearningPath.objects.create(title='P', description='', icon='', level='beginner', age_range='8-12')
+        module = Module.objects.create(learning_path=self.path, title='M', description='', icon='', order=0)
+        self.lesson = Lesson.objects.create(module=module, title='Quiz', description='', type='quiz',
+                                            content=self.content, duration=5, xp_reward=10, order=0)
+
+    def test_catalog_hides_answers(self):
+        for url in ('/api/learning/paths/', f'/api/learning/paths/{self.path.pk}/'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            path = data[0] if isinstance(data, list) else data
+            questions = path['modules'][0]['lessons'][0]['content']['questions']
+            self.assertEqual([question['prompt'] for question in questions], ['Pick one', 'Spell it', 'Pi'])
+            self.assertEqual(questions[0]['options'], ['x', 'y', 'z'])
+            for question in questions:
+                self.assertFalse({'answer', 'accept', 'tolerance'} & set(question), url)
+
+    def test_complete_grades_answers(self):
+        response = self.client.post(
+            f'/api/learning/lessons/{self.lesson.pk}/complete/',
+            {'score': 100, 'answers': {'a': 1, 'b': ' PYTHON3 ', 'c': 3}}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['results'], {'a': True, 'b': True, 'c': False})
+        self.assertEqual(data['score'], 66.7)
+        self.assertEqual(UserProgress.objects.get(user=self.user, lesson=self.lesson).score, 66.7)
+
+    def test_resubmission_gets_only_the_score(self):
+        url = f'/api/learning/lessons/{self.lesson.pk}/complete/'
+        self.client.post(url, {'answers': {'a': 1}}, content_type='application/json')
+        response = self.client.post(url, {'answers': {'a': 1, 'b': 'python'}}, content_type='application/json')
+        self.assertEqual(response.json(), {'status': 'lesson already completed', 'score': 66.7})
+        self.assertEqual(QuizAttempt.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(UserProgress.objects.get(user=self.user, lesson=self.lesson).score, 33.3)
+
+class WriteBehindTests(TestCase):
+    """Each buffered event is applied once, however often its batch is flushed."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('buffered', 'buffered@example.com', 'password')
+        path = LearningPath.objects.create(title='P', description='', icon='', level='beginner', age_range='8-12')
+        module = Module.objects.create(learning_path=path, title='M', description='', icon='', order=0)
+        self.lesson = Lesson.objects.create(module=module, title='L', description='', type='video', content={},
+                                            duration=5, xp_reward=10, order=0)
+        self.now = timezone.now().isoformat()
+
+    def test_completions_flushed_twice_count_once(self):
+        event = {'user_id': self.user.pk, 'lesson_id': self.lesson.pk, 'path_id': self.lesson.module.learning_path_id,
+                 'xp_reward': 10, 'score': 80, 'time_spent': 60, 'completed_at': self.now}
+        flush_completions([event])
+        flush_completions([event])
+        progress = PathProgress.objects.get(user=self.user)
+        self.assertEqual((progress.completed_count, progress.total_xp), (1, 10))
+        self.assertTrue(UserProgress.objects.get(user=self.user, lesson=self.lesson).completed)
+        self.assertEqual(XPEvent.objects.filter(user=self.user).count(), 1)
+
+    def test_attempts_flushed_twice_are_stored_once(self):
+        event = {'user_id': self.user.pk, 'lesson_id': self.lesson.pk, 'score': 50.0, 'correct': 1,
+                 'answered': 2, 'results': {'0': True, '1': False}, 'submitted_at': self.now}
+        flush_attempts([event])
+        flush_attempts([event])
+        self.assertEqual(QuizAttempt.objects.count(), 1)
+
+    def test_failed_flush_keeps_only_the_uncommitted_kinds(self):
+        applied = []
+        def fail(events):
+            raise RuntimeError('database unavailable')
+        writebehind.register('test_applied', applied.extend)
+        writebehind.register('test_failing', fail)
+        self.addCleanup(writebehind._flushers.pop, 'test_applied')
+        self.addCleanup(writebehind._flushers.pop, 'test_failing')
+
+        buffer = writebehind.WriteBehindBuffer(max_delay=3600)
+        buffer.put('test_applied', 'a', 1)
+        buffer.put('test_failing', 'b', 2)
+        with self.assertRaises(RuntimeError):
+            buffer.flush()
+        self.assertEqual(applied, [1])
+        self.assertEqual(buffer.pending, {'test_failing': {'b': 2}})
+
+        writebehind.register('test_failing', applied.extend)
+        buffer.flush()
+        self.assertEqual(applied, [1, 2])
+
+    def test_replay_applies_a_journal_left_under_our_own_pid(self):
+        applied = []
+        writebehind.register('test_applied', applied.extend)
+        self.addCleanup(writebehind._flushers.pop, 'test_applied')
+        journal_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, journal_dir)
+        path = os.path.join(journal_dir, f'write_behind.{os.getpid()}.journal')
+        with open(path, 'w', encoding='utf-8') as journal:
+            journal.write(json.dumps(['test_applied', 'a', 1]) + '\n')
+
+        buffer = writebehind.WriteBehindBuffer(max_delay=3600, journal_dir=journal_dir)
+        self.addCleanup(buffer.journal.close)
+        self.assertEqual(applied, [1])
+        self.assertEqual(os.listdir(journal_dir), [os.path.basename(path)])
+        self.assertEqual(os.path.getsize(path), 0)
+
+@override_settings(ACTIVITY_RETENTION={'EVENTS': 7, 'DAYS': 30, 'WEEKS': 90})
+class ActivityCompactionTests(TestCase):
+    now = datetime(2026, 10, 18, 12, 0, tzinfo=dt_timezone.utc)
+
+    def setUp(self):
+        self.user = User.objects.create_user('steady', 'steady@example.com', 'password')
+        path = LearningPath.objects.create(title='P', description='', icon='', level='beginner', age_range='8-12')
+        module = Module.objects.create(learning_path=path, title='M', description='', icon='', order=0)
+        lesson = Lesson.objects.create(module=module, title='L', description='', type='video', content={},
+                                       duration=5, xp_reward=10, order=0)
+        today = self.now.date()
+        # Seven months of days, crossing month starts that fall mid-week
+        ActivityRollup.objects.bulk_create(
+            ActivityRollup(user=self.user, period=ActivityRollup.DAY, start=today - timedelta(days=days),
+                           seconds=60 * (days % 7 + 1), lessons=1, xp=days % 5)
+            for days in range(210)
+        )
+        for days in (1, 10):
+            ActivityEvent.objects.create(user=self.user, lesson=lesson, seconds=60, xp=10,
+                                         occurred_at=self.now - timedelta(days=days))
+
+    def history(self):
+        return (
+            history_buckets(self.user, ActivityRollup.WEEK, limit=52, now=self.now),
+            history_buckets(self.user, ActivityRollup.MONTH, limit=12, now=self.now),
+        )
+
+    def rows(self):
+        return set(ActivityRollup.objects.values_list('period', 'start', 'seconds', 'lessons', 'xp'))
+
+    def test_folded_rows_add_up_to_the_same_history(self):
+        before = self.history()
+        folded = compact(now=self.now)
+        self.assertEqual(folded['events'], 1)
+        self.assertGreater(folded['days'], 0)
+        self.assertGreater(folded['weeks'], 0)
+        self.assertEqual(self.history(), before)
+        for period, start, *_ in self.rows():
+            if period == ActivityRollup.WEEK:
+                # A week row starts on a Monday, or on the 1st when the month starts mid-week
+                self.assertTrue(start.weekday() == 0 or start.day == 1, start)
+
+    def test_compacting_twice_changes_nothing(self):
+        compact(now=self.now)
+        rows = self.rows()
+        self.assertEqual(compact(now=self.now), {'events': 0, 'days': 0, 'weeks': 0})
+        self.assertEqual(self.rows(), rows)
+
+class CurriculumImportTests(TestCase):
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        admin = User.objects.create_user('editor', 'editor@example.com', 'password', is_staff=True)
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {RefreshToken.for_user(admin).access_token}'
+        self.learner = User.objects.create_user('learner', 'learner@example.com', 'password')
+
+    def tree(self, modules):
+        return {'paths': [{
+            'title': 'Python', 'description': 'Start here', 'icon': 'snake', 'level': 'beginner', 'age_range': '8-12',
+            'modules': [
+                {'title': title, 'description': title, 'icon': 'book', 'lessons': [
+                    {'title': lesson, 'description': lesson, 'type': 'video', 'content': {'url': lesson},
+                     'duration': 5, 'xp_reward': 10}
+                    for lesson in lessons
+                ]}
+                for title, lessons in modules.items()
+            ],
+        }]}
+
+    def post(self, tree, query=''):
+        return self.client.post(f'/api/learning/import/{query}', json.dumps(tree), content_type='application/json')
+
+    def test_invalid_tree_reports_every_error_and_writes_nothing(self):
+        tree = self.tree({'Basics': ['Variables', 'Loops'], 'More': ['Functions']})
+        lessons = tree['paths'][0]['modules'][0]['lessons']
+        lessons[1]['type'] = 'podcast'
+        lessons.append(dict(lessons[0], colour='red'))
+        response = self.post(tree)
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()['errors']
+        self.assertTrue(any(error.startswith('paths[0].modules[0].lessons[1].type:') for error in errors), errors)
+        self.assertIn('paths[0].modules[0].lessons[2].colour: Unknown field.', errors)
+        self.assertIn("paths[0].modules[0].lessons[2].title: Duplicate title 'Variables'.", errors)
+        self.assertFalse(LearningPath.objects.exists())
+
+    def test_reimport_matches_by_title_and_prune_deletes_the_rest(self):
+        response = self.post(self.tree({'Basics': ['Variables', 'Loops'], 'More': ['Functions']}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['lessons']['created'], 3)
+        functions = Lesson.objects.get(title='Functions')
+        UserProgress.objects.create(user=self.learner, lesson=functions, completed=True)
+        loops = Lesson.objects.get(title='Loops')
+
+        tree = self.tree({'Basics': ['Variables', 'Loops']})
+        tree['paths'][0]['modules'][0]['lessons'][1]['duration'] = 15
+        report = self.post(tree).json()
+        self.assertEqual((report['lessons']['updated'], report['lessons']['deleted']), (1, 0))
+        self.assertTrue(Lesson.objects.filter(pk=functions.pk).exists())
+
+        report = self.post(tree, '?prune=true').json()
+        self.assertEqual(report['lessons'], {'created': 0, 'updated': 0, 'unchanged': 2, 'deleted': 1})
+        self.assertEqual(report['modules']['deleted'], 1)
+        self.assertFalse(UserProgress.objects.filter(lesson_id=functions.pk).exists())
+        self.assertEqual(Lesson.objects.get(title='Loops').pk, loops.pk)
+
+class RecommendationTests(TestCase):
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.user = User.objects.create_user('picker', 'picker@example.com', 'password')
+        path = LearningPath.objects.create(title='P', description='', icon='', level='beginner', age_range='8-12')
+        module = Module.objects.create(learning_path=path, title='M', description='', icon='', order=0)
+        # 'podcast' is not one of Lesson.type's choices; rows like it can still be in the table
+        for order, type in enumerate(('video', 'podcast')):
+            Lesson.objects.create(module=module, title=type, description='', type=type, content={},
+                                  duration=5, xp_reward=10, order=order)
+        patcher = mock.patch('learning.recommendations._features', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_unknown_lesson_type_gets_the_fallback_affinity(self):
+        lessons = {lesson['type']: lesson for lesson in recommend(self.user)}
+        self.assertEqual(set(lessons), {'video', 'podcast'})
+        self.assertLess(lessons['podcast']['score'], lessons['video']['score'])
\ No newline at end of file
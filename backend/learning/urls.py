@@ -1,17 +1,47 @@
+from django.conf import settings
 from django.urls import path
-from .views import LearningPathViewSet, ModuleViewSet, LessonViewSet
+from .views import (
+    ActivityViewSet, CurriculumImportViewSet, LearningPathViewSet, ModuleViewSet, LessonViewSet
+)
+from . import async_views
 
 urlpatterns = [
     path('paths/', LearningPathViewSet.as_view({'get': 'list'}), name='learning_paths'),
-    path('paths/<uuid:pk>/', LearningPathViewSet.as_view({
+    path('paths/progress/',
+        LearningPathViewSet.as_view({'get': 'all_progress'}),
+        name='learning_paths_progress'
+    ),
+    path('paths/<int:pk>/', LearningPathViewSet.as_view({
         'get': 'retrieve',
     }), name='learning_path_detail'),
-    path('paths/<uuid:pk>/progress/', 
+    path('paths/<int:pk>/progress/', 
         LearningPathViewSet.as_view({'get': 'user_progress'}),
         name='learning_path_progress'
     ),
-    path('lessons/<uuid:pk>/complete/',
+    path('import/',
+        CurriculumImportViewSet.as_view({'post': 'create'}),
+        name='curriculum_import'
+    ),
+    path('lessons/next/',
+        LessonViewSet.as_view({'get': 'next'}),
+        name='next_lessons'
+    ),
+    path('lessons/<int:pk>/complete/',
         LessonViewSet.as_view({'post': 'complete'}),
         name='complete_lesson'
     ),
-]
\ No newline at end of file
+    path('activity/today/',
+        ActivityViewSet.as_view({'get': 'today'}),
+        name='activity_today'
+    ),
+    path('activity/history/',
+        ActivityViewSet.as_view({'get': 'history'}),
+        name='activity_history'
+    ),
+]
+
+if settings.ASYNC_VIEWS:
+    urlpatterns = [
+        path('paths/', async_views.path_list, name='learning_paths'),
+        path('paths/<int:pk>/progress/', async_views.path_progress, name='learning_path_progress'),
+    ] + urlpatterns
\ No newline at end of file
@@ -1,61 +1,240 @@
-from rest_framework import viewsets, status
+from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db import transaction
+from django.utils import timezone
+from core.pagination import CursorPage, page_size
+from core.parsers import ORJSONParser, YAMLParser
+from core.serializers import parse_field_tree
+from core.writebehind import get_buffer
+from gamification.ledger import award_xp
+from gamification.signals import lesson_completed, send_on_commit
+from .activity import DAY, MONTH, WEEK, clean_seconds, history_buckets, record_activity, today_totals
+from .catalog import cached_catalog_response
+from .curriculum import import_curriculum
+from .grading import attempt_event, get_answer_key, record_attempt, repeat_grade
+from .progress import path_progress, record_completion, user_path_progress
+from .recommendations import recommend
 from .models import LearningPath, Module, Lesson, UserProgress
 from .serializers import (
-    LearningPathSerializer, ModuleSerializer,
+    LearningPathSerializer, LearningPathValuesSerializer, ModuleSerializer,
     LessonSerializer, UserProgressSerializer
 )
 
+# Serializer ``omit`` trees for ?depth=0 and ?depth=1
+OMIT_BY_DEPTH = {0: {'modules': {}}, 1: {'modules': {'lessons': {}}}}
+
+def curriculum_options(params):
+    """Read ``?depth=`` (0 paths, 1 modules, 2 lessons) and ``?fields=``.
+
+    A ``?fields=`` tree that leaves out ``modules`` or ``modules.lessons``
+    lowers the depth so those levels are not prefetched at all.
+    """
+    try:
+        depth = min(max(int(params.get('depth', 2)), 0), 2)
+    except ValueError:
+        depth = 2
+    fields = parse_field_tree(params.get('fields'))
+    if fields and 'modules' not in fields:
+        depth = 0
+    elif fields.get('modules') and 'lessons' not in fields['modules']:
+        depth = min(depth, 1)
+    return depth, fields
+
+def curriculum_lesson_fields(fields):
+    lesson_fields = fields.get('modules', {}).get('lessons')
+    if lesson_fields:
+        concrete = {field.name for field in Lesson._meta.concrete_fields}
+        lesson_fields = [name for name in lesson_fields if name in concrete]
+    return lesson_fields or None
+
+def catalog_variant(params):
+    depth, fields = curriculum_options(params)
+    return 'd%s:%s' % (depth, params.get('fields', ''))
+
+def page_variant(params):
+    return '%s:%s' % (page_size(params), params.get('cursor', ''))
+
+def build_path_list(request):
+    depth, fields = curriculum_options(request.GET)
+    page = CursorPage(request, LearningPath.objects.all(), ('id',))
+    data = page.serialize(LearningPathValuesSerializer(
+        page.queryset, fields=fields, omit=OMIT_BY_DEPTH.get(depth)
+    ))
+    return data, page.link
+
 class LearningPathViewSet(viewsets.ModelViewSet):
     queryset = LearningPath.objects.all()
     serializer_class = LearningPathSerializer
+    lazy_user_actions = ('user_progress', 'all_progress')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action not in ('list', 'retrieve'):
+            return queryset
+        depth, fields = curriculum_options(self.request.query_params)
+        return queryset.with_curriculum(depth, curriculum_lesson_fields(fields))
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action in ('list', 'retrieve'):
+            depth, fields = curriculum_options(self.request.query_params)
+            kwargs.setdefault('fields', fields)
+            kwargs.setdefault('omit', OMIT_BY_DEPTH.get(depth))
+        return super().get_serializer(*args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        params = request.query_params
+        return cached_catalog_response(
+            request, ('list', catalog_variant(params), page_variant(params)),
+            lambda: build_path_list(request)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        def build():
+            return self.get_serializer(self.get_object()).data, None
+        return cached_catalog_response(
+            request, ('path', kwargs[self.lookup_field], catalog_variant(request.query_params)), build
+        )
 
     @action(detail=True, methods=['get'])
     def user_progress(self, request, pk=None):
         path = self.get_object()
-        lessons = Lesson.objects.filter(module__learning_path=path)
-        progress = UserProgress.objects.filter(
-            user=request.user,
-            lesson__in=lessons
-        )
-        
-        total_lessons = lessons.count()
-        completed_lessons = progress.filter(completed=True).count()
-        completion_percentage = (completed_lessons / total_lessons * 100) if total_lessons > 0 else 0
-        
-        return Response({
-            'total_lessons': total_lessons,
-            'completed_lessons': completed_lessons,
-            'completion_percentage': completion_percentage
-        })
+        live = request.query_params.get('source') == 'live'
+        return Response(path_progress(request.user, path, live=live))
+
+    @action(detail=False, methods=['get'])
+    def all_progress(self, request):
+        live = request.query_params.get('source') == 'live'
+        return Response(user_path_progress(request.user, live=live))
+
+class CurriculumImportViewSet(viewsets.ViewSet):
+    permission_classes = [permissions.IsAdminUser]
+    parser_classes = [ORJSONParser, YAMLParser]
+
+    def create(self, request):
+        params = request.query_params
+        return Response(import_curriculum(
+            request.data,
+            prune=params.get('prune') == 'true',
+            dry_run=params.get('dry_run') == 'true',
+        ))
 
 class ModuleViewSet(viewsets.ModelViewSet):
     queryset = Module.objects.all()
     serializer_class = ModuleSerializer
 
 class LessonViewSet(viewsets.ModelViewSet):
-    queryset = Lesson.objects.all()
+    queryset = Lesson.objects.select_related('module')
     serializer_class = LessonSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'complete':
+            # Graded from the compiled answer key, so the JSON content is never needed
+            return queryset.defer('content')
+        return queryset
+
+    @action(detail=False, methods=['get'])
+    def next(self, request):
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+            path_id = request.query_params.get('path')
+            path_id = int(path_id) if path_id is not None else None
+        except ValueError:
+            return Response({'detail': 'Invalid path or limit.'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(recommend(request.user, limit, path_id))
+
     @action(detail=True, methods=['post'])
     def complete(self, request, pk=None):
         lesson = self.get_object()
-        progress, created = UserProgress.objects.get_or_create(
-            user=request.user,
-            lesson=lesson
-        )
-        
-        if not progress.completed:
-            progress.completed = True
-            progress.score = request.data.get('score')
-            progress.time_spent = request.data.get('time_spent', 0)
-            progress.save()
-            
-            # Update user XP
-            user = request.user
-            user.xp += lesson.xp_reward
-            user.save()
-            
-            return Response({'status': 'lesson completed', 'xp_gained': lesson.xp_reward})
-        return Response({'status': 'lesson already completed'})
\ No newline at end of file
+        now = timezone.now()
+        answer_key = get_answer_key(lesson.pk)
+        graded = {}
+        if answer_key is not None:
+            answers = request.data.get('answers')
+            if not isinstance(answers, dict):
+                return Response(
+                    {'detail': 'answers must map question ids to answers.'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            graded['score'], graded['results'] = answer_key.grade(answers)
+        score = graded.get('score', request.data.get('score'))
+        buffer = get_buffer()
+        if buffer is not None:
+            return self.complete_buffered(buffer, request, lesson, now, score, graded)
+        time_spent = clean_seconds(request.data.get('time_spent', 0))
+        with transaction.atomic():
+            progress, created = UserProgress.objects.get_or_create(
+                user=request.user,
+                lesson=lesson
+            )
+
+            # Conditional update so only one concurrent request counts the completion
+            completed = UserProgress.objects.filter(pk=progress.pk, completed=False).update(
+                completed=True,
+                score=score,
+                time_spent=time_spent,
+                completed_at=now,
+            )
+            if completed:
+                record_completion(request.user, lesson, now)
+                record_activity(request.user, lesson, time_spent, now)
+                send_on_commit(
+                    lesson_completed, user_id=request.user.pk, lesson_id=lesson.pk,
+                    path_id=lesson.module.learning_path_id,
+                )
+                award_xp(
+                    request.user, lesson.xp_reward, 'lesson',
+                    f'lesson:{lesson.pk}:user:{request.user.pk}',
+                )
+                if graded:
+                    record_attempt(request.user.pk, lesson.pk, graded['score'], graded['results'], now)
+
+        if completed:
+            return Response({'status': 'lesson completed', 'xp_gained': lesson.xp_reward, **graded})
+        return Response({'status': 'lesson already completed', **repeat_grade(graded)})
+
+    def complete_buffered(self, buffer, request, lesson, now, score, graded):
+        already = UserProgress.objects.filter(
+            user=request.user, lesson=lesson, completed=True
+        ).exists()
+        if not already and buffer.put('lesson_completion', f'{request.user.pk}:{lesson.pk}', {
+            'user_id': request.user.pk,
+            'lesson_id': lesson.pk,
+            'path_id': lesson.module.learning_path_id,
+            'xp_reward': lesson.xp_reward,
+            'score': score,
+            'time_spent': clean_seconds(request.data.get('time_spent', 0)),
+            'completed_at': now.isoformat(),
+        }, replace=False):
+            if graded:
+                buffer.put('quiz_attempt', f'{request.user.pk}:{lesson.pk}:{now.isoformat()}', attempt_event(
+                    request.user.pk, lesson.pk, graded['score'], graded['results'], now.isoformat(),
+                ))
+            return Response({'status': 'lesson completed', 'xp_gained': lesson.xp_reward, **graded})
+        return Response({'status': 'lesson already completed', **repeat_grade(graded)})
+
+class ActivityViewSet(viewsets.ViewSet):
+    """Study time from the daily rollups: today against ``daily_goal``, and history."""
+
+    @action(detail=False, methods=['get'])
+    def today(self, request):
+        return Response(today_totals(request.user))
+
+    @action(detail=False, methods=['get'])
+    def history(self, request):
+        period = request.query_params.get('period', DAY)
+        try:
+            limit = int(request.query_params.get('limit', 30))
+        except ValueError:
+            limit = 0
+        if period not in (DAY, WEEK, MONTH) or limit < 1:
+            return Response(
+                {'detail': 'period must be day, week or month and limit a positive integer.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response({
+            'period': period,
+            'goal_minutes': request.user.daily_goal,
+            'results': history_buckets(request.user, period, limit),
+        })
\ No newline at end of file
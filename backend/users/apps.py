@@ -2,4 +2,11 @@ from django.apps import AppConfig
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'users'
\ No newline at end of file
+    name = 'users'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from core.authentication import invalidate_user
+        from .models import User
+        post_save.connect(invalidate_user, sender=User)
+        post_delete.connect(invalidate_user, sender=User)
\ No newline at end of file
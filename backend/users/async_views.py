@@ -0,0 +1,7 @@
+from core.async_api import async_api_view, json_response
+from .serializers import UserSerializer
+from .views import UserViewSet
+
+@async_api_view(fallback=UserViewSet.as_view({'patch': 'update_preferences'}))
+async def me(request):
+    return json_response(UserSerializer(request.user, context={'request': request}).data)
\ No newline at end of file
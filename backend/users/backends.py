@@ -0,0 +1,28 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from .hashing import make_password, verify_password
+
+UserModel = get_user_model()
+
+class HashingModelBackend(ModelBackend):
+    """``ModelBackend`` that verifies on the hashing pool and rehashes to the preferred hasher."""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash once anyway so unknown usernames take as long as wrong passwords
+            make_password(password)
+            return
+        is_correct, must_update = verify_password(password, user.password)
+        if not is_correct or not self.user_can_authenticate(user):
+            return
+        if must_update:
+            user.password = make_password(password)
+            user.save(update_fields=['password'])
+        return user
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""Password hashing on a bounded pool instead of the request thread.
+
+Hashing is deliberately slow, so a burst of sign-ups or logins can otherwise
+take every worker's CPU at once. Hashes run on ``PASSWORD_HASHING['WORKERS']``
+threads (the hashlib KDFs release the GIL); up to ``MAX_PENDING`` more calls
+may queue, and beyond that the request is throttled with a Retry-After.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework.exceptions import Throttled
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+def _get_executor():
+    global _executor, _slots
+    with _lock:
+        if _executor is None:
+            config = settings.PASSWORD_HASHING
+            _executor = ThreadPoolExecutor(config['WORKERS'], thread_name_prefix='password-hash')
+            _slots = threading.BoundedSemaphore(config['WORKERS'] + config['MAX_PENDING'])
+    return _executor
+
+def run_hashing(func, *args):
+    executor = _get_executor()
+    if not _slots.acquire(timeout=settings.PASSWORD_HASHING['QUEUE_TIMEOUT']):
+        raise Throttled(wait=1)
+    try:
+        future = executor.submit(func, *args)
+    except BaseException:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda future: _slots.release())
+    return future.result()
+
+def make_password(password):
+    return run_hashing(hashers.make_password, password)
+
+def verify_password(password, encoded):
+    """``(is_correct, must_update)``; ``must_update`` means the preferred hasher changed."""
+    return run_hashing(hashers.verify_password, password, encoded)
\ No newline at end of file
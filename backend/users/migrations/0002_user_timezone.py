@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-18 08:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='timezone',
+            field=models.CharField(db_index=True, default='UTC', max_length=64),
+        ),
+    ]
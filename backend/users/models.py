@@ -16,6 +16,12 @@ class User(AbstractUser):
         default='visual'
     )
     daily_goal = models.IntegerField(default=30)  # minutes
+    timezone = models.CharField(max_length=64, default='UTC', db_index=True)  # IANA name
     
     class Meta:
-        db_table = 'users'
\ No newline at end of file
+        db_table = 'users'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['email'], condition=~models.Q(email=''), name='users_email_unique'
+            ),
+        ]
\ No newline at end of file
@@ -1,6 +1,10 @@
+import zoneinfo
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from .hashing import make_password
 
 User = get_user_model()
 
@@ -8,9 +12,16 @@ class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('id', 'username', 'email', 'avatar', 'level', 'xp', 
-                 'learning_speed', 'preferred_learning_style', 'daily_goal')
+                 'learning_speed', 'preferred_learning_style', 'daily_goal', 'timezone')
         read_only_fields = ('id', 'level', 'xp')
 
+    def validate_timezone(self, value):
+        try:
+            zoneinfo.ZoneInfo(value)
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+            raise serializers.ValidationError("Unknown timezone.")
+        return value
+
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     def validate(self, attrs):
         data = super().validate(attrs)
@@ -33,15 +44,24 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             'daily_goal': {'required': False},
         }
 
-    def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("A user with this email already exists.")
-        return value
+    def validate(self, attrs):
+        attrs['username'] = User.normalize_username(attrs['username'])
+        attrs['email'] = User.objects.normalize_email(attrs['email'])
+        errors = self.conflicts(attrs['username'], attrs['email'])
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
 
-    def validate_username(self, value):
-        if User.objects.filter(username=value).exists():
-            raise serializers.ValidationError("A user with this username already exists.")
-        return value
+    def conflicts(self, username, email):
+        """Errors for a taken username and/or email, from a single query."""
+        errors = {}
+        taken = User.objects.filter(Q(username=username) | Q(email=email)).values_list('username', 'email')
+        for taken_username, taken_email in taken:
+            if taken_username == username:
+                errors['username'] = ["A user with this username already exists."]
+            if taken_email == email:
+                errors['email'] = ["A user with this email already exists."]
+        return errors
 
     def create(self, validated_data):
         # Set default values if not provided
@@ -52,5 +72,15 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         if 'daily_goal' not in validated_data:
             validated_data['daily_goal'] = 30
             
-        user = User.objects.create_user(**validated_data)
+        password = validated_data.pop('password')
+        user = User(**validated_data)
+        user.password = make_password(password)
+        try:
+            # The unique indexes catch a concurrent sign-up that passed validate()
+            with transaction.atomic():
+                user.save()
+        except IntegrityError:
+            raise serializers.ValidationError(
+                self.conflicts(user.username, user.email) or "A user with these details already exists."
+            )
         return user
\ No newline at end of file
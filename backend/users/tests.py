@@ -0,0 +1,57 @@
+from django.test import AsyncClient, Client, TestCase, override_settings
+from django.urls import path
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.authentication import get_user_cache
+from . import async_views
+from .models import User
+
+# The routes users/urls.py uses under ASYNC_VIEWS, which is read once at import
+urlpatterns = [
+    path('api/users/me/', async_views.me, name='me'),
+]
+
+@override_settings(ROOT_URLCONF='users.tests')
+class AsyncMeTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('async', 'async@example.com', 'password', daily_goal=15)
+        self.client = AsyncClient(enforce_csrf_checks=True)
+        # Django 5.0's AsyncClient ignores client-level headers, so pass them per request
+        self.headers = {'Authorization': f'Bearer {RefreshToken.for_user(self.user).access_token}'}
+
+    async def test_get(self):
+        response = await self.client.get('/api/users/me/', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['daily_goal'], 15)
+
+    async def test_patch_is_not_rejected_by_csrf(self):
+        response = await self.client.patch(
+            '/api/users/me/', {'daily_goal': 45}, content_type='application/json', headers=self.headers
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['daily_goal'], 45)
+        await self.user.arefresh_from_db()
+        self.assertEqual(self.user.daily_goal, 45)
+
+    async def test_requires_token(self):
+        response = await AsyncClient().get('/api/users/me/')
+        self.assertEqual(response.status_code, 401)
+
+class LazyUserTests(TestCase):
+    """Endpoints that only need the user id still refuse inactive and deleted accounts."""
+    url = '/api/learning/paths/progress/'
+
+    def setUp(self):
+        get_user_cache().clear()
+        self.user = User.objects.create_user('lazy', 'lazy@example.com', 'password')
+        self.client = Client(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_deactivated(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_deleted(self):
+        self.user.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
\ No newline at end of file
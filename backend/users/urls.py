@@ -1,10 +1,17 @@
+from django.conf import settings
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
 from .views import CustomTokenObtainPairView, UserViewSet
+from . import async_views
 
 urlpatterns = [
     path('token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('register/', UserViewSet.as_view({'post': 'create'}), name='register'),
     path('me/', UserViewSet.as_view({'get': 'me', 'patch': 'update_preferences'}), name='me'),
-]
\ No newline at end of file
+]
+
+if settings.ASYNC_VIEWS:
+    urlpatterns = [
+        path('me/', async_views.me, name='me'),
+    ] + urlpatterns
\ No newline at end of file
@@ -3,7 +3,7 @@ import { LearningPath } from '../../lib/api';
 import { ArrowRight, BookOpen, Code, Zap } from 'lucide-react';
 
 interface PersonalizedPathCardProps {
-  path: LearningPath;
+  path: Omit<LearningPath, 'modules'>;
   onClick: () => void;
 }
 
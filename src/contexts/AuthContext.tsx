@@ -52,6 +52,17 @@ export const AuthProvider: React.FC<{ children: React.ReactNode }> = ({ children
     loadUser();
   }, []);
 
+  // Keep XP and level current from pushed events instead of refetching the user
+  const userId = user?.id;
+  useEffect(() => {
+    if (!userId) return;
+    return api.events.subscribe((event) => {
+      if (event.kind === 'xp') {
+        setUser((current) => current && { ...current, xp: event.data.xp, level: event.data.level });
+      }
+    });
+  }, [userId]);
+
   const signOut = async () => {
     api.auth.logout();
     setUser(null);
@@ -92,6 +92,36 @@ export interface DailyChallenge {
   available_until: string;
 }
 
+export interface PathProgress {
+  learning_path: number;
+  total_lessons: number;
+  completed_lessons: number;
+  completion_percentage: number;
+}
+
+export interface Dashboard {
+  user: User;
+  streak: Streak | null;
+  achievements: UserAchievement[];
+  progress: PathProgress[];
+  paths: Omit<LearningPath, 'modules'>[];
+  challenges: (DailyChallenge & { completed: boolean })[];
+}
+
+export interface LessonCompletion {
+  status: string;
+  xp_gained?: number;
+  score?: number;
+  results?: Record<string, boolean | null>;  // per question; null if unanswered
+}
+
+// Events pushed on /gamification/events/ as they happen
+export type LiveEvent =
+  | { kind: 'xp'; data: { xp: number; level: number; gained: number; source: string } }
+  | { kind: 'streak'; data: Omit<Streak, 'id' | 'user'> }
+  | { kind: 'lessons'; data: { completed: { lesson_id: number; path_id: number }[] } }
+  | { kind: 'achievements'; data: { unlocked: Omit<Achievement, 'criteria'>[] } };
+
 // Helper function to handle API responses
 async function handleResponse<T>(response: Response): Promise<T> {
   const contentType = response.headers.get('content-type');
@@ -113,6 +143,26 @@ async function handleResponse<T>(response: Response): Promise<T> {
   return {} as T;
 }
 
+// List endpoints send one page at a time and link the next one from the Link header
+function nextPageUrl(link: string | null): string | null {
+  const match = link?.match(/<([^>]+)>;\s*rel="next"/);
+  return match ? match[1] : null;
+}
+
+// Fetch every page of a list endpoint
+async function fetchAllPages<T>(url: string): Promise<T[]> {
+  const items: T[] = [];
+  let next: string | null = url;
+  while (next) {
+    const response: Response = await fetch(next, {
+      headers: createHeaders(),
+    });
+    items.push(...await handleResponse<T[]>(response));
+    next = nextPageUrl(response.headers.get('Link'));
+  }
+  return items;
+}
+
 // Get the stored auth token
 function getAuthToken(): string | null {
   return localStorage.getItem('auth_token');
@@ -222,14 +272,77 @@ export const api = {
     },
   },
   
-  // Learning
-  learning: {
-    getPaths: async (): Promise<LearningPath[]> => {
-      const response = await fetch(`${API_URL}/learning/paths/`, {
+  // Everything the home screen needs, in one request
+  dashboard: {
+    get: async (): Promise<Dashboard> => {
+      const response = await fetch(`${API_URL}/dashboard/`, {
         headers: createHeaders(),
       });
       
-      return handleResponse<LearningPath[]>(response);
+      return handleResponse<Dashboard>(response);
+    },
+  },
+
+  // Live updates as server-sent events, read with fetch so the auth header can be sent.
+  // Reconnects until the returned function is called; the endpoint only exists under ASGI.
+  events: {
+    subscribe: (onEvent: (event: LiveEvent) => void): (() => void) => {
+      const controller = new AbortController();
+
+      const listen = async () => {
+        while (!controller.signal.aborted) {
+          try {
+            const response = await fetch(`${API_URL}/gamification/events/`, {
+              headers: createHeaders(),
+              signal: controller.signal,
+            });
+            if (response.status === 404) return;
+            if (response.status === 401 && localStorage.getItem('refresh_token')) {
+              await api.auth.refreshToken();
+              continue;
+            }
+            if (!response.ok || !response.body) {
+              throw new Error(`HTTP error! status: ${response.status}`);
+            }
+
+            const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+            let buffer = '';
+            for (;;) {
+              const { value, done } = await reader.read();
+              if (done) break;
+              buffer += value;
+              let end;
+              while ((end = buffer.indexOf('\n\n')) >= 0) {
+                const message = buffer.slice(0, end);
+                buffer = buffer.slice(end + 2);
+                let kind = '';
+                let data = '';
+                for (const line of message.split('\n')) {
+                  if (line.startsWith('event: ')) kind = line.slice(7);
+                  else if (line.startsWith('data: ')) data = line.slice(6);
+                }
+                if (kind && data) {
+                  onEvent({ kind, data: JSON.parse(data) } as LiveEvent);
+                }
+              }
+            }
+          } catch (error) {
+            if (controller.signal.aborted) return;
+            console.error('Live updates disconnected:', error);
+          }
+          await new Promise((resolve) => setTimeout(resolve, 3000));
+        }
+      };
+
+      listen();
+      return () => controller.abort();
+    },
+  },
+  
+  // Learning
+  learning: {
+    getPaths: async (): Promise<LearningPath[]> => {
+      return fetchAllPages<LearningPath>(`${API_URL}/learning/paths/`);
     },
     
     getPathById: async (id: string): Promise<LearningPath> => {
@@ -256,36 +369,29 @@ export const api = {
       }>(response);
     },
     
+    // Quiz lessons are graded from `answers` ({question id: answer}); `score` is ignored for them
     completeLesson: async (
       lessonId: string, 
-      data: { score?: number; time_spent?: number }
-    ): Promise<{ status: string; xp_gained?: number }> => {
+      data: { score?: number; time_spent?: number; answers?: Record<string, unknown> }
+    ): Promise<LessonCompletion> => {
       const response = await fetch(`${API_URL}/learning/lessons/${lessonId}/complete/`, {
         method: 'POST',
         headers: createHeaders(),
         body: JSON.stringify(data),
       });
       
-      return handleResponse<{ status: string; xp_gained?: number }>(response);
+      return handleResponse<LessonCompletion>(response);
     },
   },
   
   // Gamification
   gamification: {
     getAchievements: async (): Promise<Achievement[]> => {
-      const response = await fetch(`${API_URL}/gamification/achievements/`, {
-        headers: createHeaders(),
-      });
-      
-      return handleResponse<Achievement[]>(response);
+      return fetchAllPages<Achievement>(`${API_URL}/gamification/achievements/`);
     },
     
     getUserAchievements: async (): Promise<UserAchievement[]> => {
-      const response = await fetch(`${API_URL}/gamification/achievements/user/`, {
-        headers: createHeaders(),
-      });
-      
-      return handleResponse<UserAchievement[]>(response);
+      return fetchAllPages<UserAchievement>(`${API_URL}/gamification/achievements/user/`);
     },
     
     checkInStreak: async (): Promise<Streak> => {
@@ -298,11 +404,7 @@ export const api = {
     },
     
     getDailyChallenges: async (): Promise<DailyChallenge[]> => {
-      const response = await fetch(`${API_URL}/gamification/challenges/`, {
-        headers: createHeaders(),
-      });
-      
-      return handleResponse<DailyChallenge[]>(response);
+      return fetchAllPages<DailyChallenge>(`${API_URL}/gamification/challenges/`);
     },
     
     completeChallenge: async (
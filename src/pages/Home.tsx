@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useAuth } from '../contexts/AuthContext';
-import { api, apiRequest, LearningPath, DailyChallenge } from '../lib/api';
+import { api, apiRequest, Dashboard, DailyChallenge } from '../lib/api';
 import UserProfile from '../components/dashboard/UserProfile';
 import StreakTracker from '../components/gamification/StreakTracker';
 import DailyChallenges from '../components/gamification/DailyChallenges';
@@ -14,22 +14,19 @@ interface HomeProps {
 
 const Home: React.FC<HomeProps> = ({ onNavigateToPath }) => {
   const { user } = useAuth();
-  const [recommendedPaths, setRecommendedPaths] = useState<LearningPath[]>([]);
+  const [recommendedPaths, setRecommendedPaths] = useState<Dashboard['paths']>([]);
   const [dailyChallenges, setDailyChallenges] = useState<DailyChallenge[]>([]);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
     const fetchDashboardData = async () => {
       try {
-        const [pathsData, challengesData] = await Promise.all([
-          apiRequest(() => api.learning.getPaths()),
-          apiRequest(() => api.gamification.getDailyChallenges())
-        ]);
+        const dashboard = await apiRequest(() => api.dashboard.get());
         
         // For now, just use all paths as recommended
         // In a real app, you'd have a recommendation algorithm
-        setRecommendedPaths(pathsData.slice(0, 3));
-        setDailyChallenges(challengesData);
+        setRecommendedPaths(dashboard.paths.slice(0, 3));
+        setDailyChallenges(dashboard.challenges);
       } catch (error) {
         console.error('Failed to load dashboard data:', error);
       } finally {